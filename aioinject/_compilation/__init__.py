@@ -1,4 +1,8 @@
-from aioinject._compilation.compile import CompilationParams, compile_fn
+from aioinject._compilation.compile import (
+    CompilationParams,
+    CompilationResult,
+    compile_fn,
+)
 
 
-__all__ = ["CompilationParams", "compile_fn"]
+__all__ = ["CompilationParams", "CompilationResult", "compile_fn"]
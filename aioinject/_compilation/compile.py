@@ -2,13 +2,17 @@ from __future__ import annotations
 
 import contextlib
 import dataclasses
-import linecache
+import functools
+import textwrap
+import time
+import types
 import typing
 from collections.abc import Sequence
 from typing import TYPE_CHECKING, Any, TypeVar
 
 from aioinject._compilation.naming import (
     create_var_name,
+    generate_call_kwargs,
     generate_factory_kwargs,
 )
 from aioinject._compilation.resolve import (
@@ -16,9 +20,12 @@ from aioinject._compilation.resolve import (
     FromContextNode,
     IterableNode,
     ProviderNode,
+    SubgraphNode,
+    group_by_level,
 )
-from aioinject._compilation.util import Indent
+from aioinject._compilation.util import Indent, gather
 from aioinject._types import CompiledFn
+from aioinject.context import EMPTY_SLOT, FLIGHT_ABORTED
 from aioinject.errors import ScopeNotFoundError
 from aioinject.extensions.providers import (
     CacheDirective,
@@ -27,27 +34,48 @@ from aioinject.extensions.providers import (
     ProviderInfo,
     ResolveDirective,
 )
-from aioinject.scope import BaseScope, CurrentScope
+from aioinject.scope import BaseScope, CurrentScope, next_scope
 
 
 if TYPE_CHECKING:
     from aioinject.container import Extensions, Registry
+    from aioinject.context import ProviderRecord
 
 
-__all__ = ["CompilationParams", "compile_fn"]
+__all__ = ["CompilationParams", "CompilationResult", "compile_fn"]
 
 
 @dataclasses.dataclass
 class CompilationParams:
-    root: AnyNode
+    root: AnyNode | tuple[AnyNode, ...]
     nodes: Sequence[AnyNode]
     scopes: type[BaseScope]
+    slots: dict[str, int] = dataclasses.field(default_factory=dict)
+
+    @functools.cached_property
+    def nodes_by_name(self) -> dict[str, AnyNode]:
+        return {node.name: node for node in self.nodes}
+
+    @functools.cached_property
+    def root_scope(self) -> BaseScope:
+        return next_scope(self.scopes, None)
+
+
+@dataclasses.dataclass(slots=True, kw_only=True)
+class CompilationResult:
+    fn: CompiledFn[Any]
+    source: str
+    nodes: Sequence[AnyNode]
+    code: types.CodeType
+    name: str
 
 
 BODY = """
-{async}def factory(scopes: "Mapping[BaseScope, Context]", current_scope: "BaseScope") -> "T":
+def create_factory({constants}):
+    {async}def factory(scopes: "Mapping[BaseScope, Context]", current_scope: "BaseScope") -> "T":
 {body}
-    return {return_var_name}"""
+        return {return_value}
+    return factory"""
 PREPARE_SCOPE_CACHE = (
     "try:\n"
     "    {scope_name}_cache = scopes[{scope_name}].cache\n"
@@ -56,30 +84,88 @@ PREPARE_SCOPE_CACHE = (
     "    raise ScopeNotFoundError(err_msg)\n"
 )
 
-PREPARE_SCOPE_EXIT_STACK = (
-    "{scope_name}_exit_stack = scopes[{scope_name}].exit_stack\n"
+PREPARE_SCOPE_SLOTS = (
+    "try:\n"
+    "    {scope_name}_slots = scopes[{scope_name}].slots\n"
+    "except KeyError as err:\n"
+    '    err_msg = f"Requested scope {scope} not found, current scope is {{current_scope}}"\n'
+    "    raise ScopeNotFoundError(err_msg)\n"
 )
+GROW_SCOPE_SLOTS = (
+    "if len({scope_name}_slots) < {size}:\n"
+    "    {scope_name}_slots.extend([EmptySlot] * ({size} - len({scope_name}_slots)))\n"
+)
+
 CHECK_CACHE = "if ({dependency}_instance := {scope_name}_cache.get({dependency}_type, NotInCache)) is NotInCache:\n"
 CHECK_CACHE_STRICT = (
     "{dependency}_instance = {scope_name}_cache[{dependency}_type]\n"
 )
-CREATE_REGULAR_INSTANCE = (
-    "{dependency}_instance = {await}{dependency}_provider.provide({kwargs})\n"
+CHECK_SLOT = (
+    "if ({dependency}_instance := {scope_name}_slots[{slot}]) is EmptySlot:\n"
+)
+CHECK_SLOT_STRICT = "{dependency}_instance = {scope_name}_slots[{slot}]\n"
+CHECK_CACHE_FOUND = "if ({dependency}_instance := {scope_name}_cache.get({dependency}_type, NotInCache)) is not NotInCache:\n"
+CHECK_SLOT_FOUND = "if ({dependency}_instance := {scope_name}_slots[{slot}]) is not EmptySlot:\n"
+CREATE_REGULAR_INSTANCE = "{dependency}_instance = {await}{provide}\n"
+ACQUIRE_LOCK = (
+    "{async}with scopes[{scope_name}].type_lock({dependency}_type):\n"
+)
+START_FLIGHT = (
+    "while ({dependency}_flight := scopes[{scope_name}].start_flight({dependency}_type)) is not None:\n"
+    "    if ({dependency}_instance := await {dependency}_flight.wait()) is not FlightAborted:\n"
+    "        break\n"
+)
+FAIL_FLIGHT = (
+    "except BaseException as {dependency}_error:\n"
+    "    scopes[{scope_name}].finish_flight({dependency}_type, error={dependency}_error)\n"
+    "    raise\n"
 )
-ACQUIRE_LOCK = "{async}with scopes[{scope_name}].lock:\n"
-ACQUIRE_DOUBLE_CHECK_LOCK = (
-    "{async}with scopes[{scope_name}].lock:\n"
-    "    if ({dependency}_instance := {scope_name}_cache.get({dependency}_type, NotInCache)) is NotInCache:\n"
+FINISH_FLIGHT = "scopes[{scope_name}].finish_flight({dependency}_type, {dependency}_instance)\n"
+START_DETECTOR = "{dependency}_sampled_at = blocking_detector.start()\n"
+STOP_DETECTOR = (
+    "if {dependency}_sampled_at is not None:\n"
+    "    blocking_detector.stop({dependency}_record, {dependency}_sampled_at, factory)\n"
 )
-CREATE_CONTEXT_MANAGER_INSTANCE = "{dependency}_instance = {await}{scope_name}_exit_stack.{context_manager_method}({dependency}_provider.provide({kwargs}))\n"
+COUNT_MISS = "{dependency}_metrics.misses += 1\n"
+COUNT_HIT = "else:\n    {dependency}_metrics.hits += 1\n"
+START_CREATION = "{dependency}_created_at = perf_counter()\n"
+OBSERVE_CREATION = (
+    "{dependency}_metrics.observe(perf_counter() - {dependency}_created_at)\n"
+)
+CREATE_CONTEXT_MANAGER_INSTANCE = "{dependency}_instance = {await}scopes[{scope_name}].exit_stack.{context_manager_method}({provide})\n"
+CREATE_RESOURCE_INSTANCE = "{dependency}_instance = {await}scopes[{scope_name}].resources.{context_manager_method}({dependency}_type, {provide}, {resource_dependencies})\n"
+PROVIDE = "{dependency}_provider.provide({kwargs})"
+PROVIDE_DIRECT_CALL = "{dependency}_implementation({call_kwargs})"
+RUN_BLOCKING_REGULAR_INSTANCE = (
+    "{dependency}_instance = await blocking_factories.run({blocking_call})\n"
+)
+RUN_BLOCKING_CONTEXT_MANAGER_INSTANCE = "{dependency}_instance = await blocking_factories.run(scopes[{scope_name}].exit_stack.enter_context, {provide})\n"
+RUN_BLOCKING_RESOURCE_INSTANCE = "{dependency}_instance = await blocking_factories.run(scopes[{scope_name}].resources.enter_context, {dependency}_type, {provide}, {resource_dependencies})\n"
+BLOCKING_PROVIDE = "{dependency}_provider.provide, {kwargs}"
+BLOCKING_DIRECT_CALL = "{dependency}_implementation, {call_kwargs}"
+START_TIMER = "{dependency}_start = perf_counter()\n"
+FLAG_BLOCKING = (
+    "if ({dependency}_elapsed := perf_counter() - {dependency}_start) > blocking_factories.threshold:\n"
+    "    blocking_factories.flag({dependency}_record, {dependency}_elapsed)\n"
+)
+CHECK_PROVIDER_CELL = (
+    "if {dependency}_cell.active and ({dependency}_override := {dependency}_cell.get()) is not None:\n"
+    "    if ({dependency}_instance := {dependency}_override.instances.get({dependency}_type, NotInCache)) is NotInCache:\n"
+    "        if {dependency}_override.record is not None:\n"
+    "            {dependency}_instance = {dependency}_override.record.provider.provide({{}})\n"
+    "        else:\n"
+)
+STORE_CELL_INSTANCE = "{dependency}_override.instances[{dependency}_type] = {dependency}_instance\n"
+CALL_SUBGRAPH_FACTORY = "{dependency}_instance = {await}{dependency}_subgraph(scopes, current_scope)\n"
 STORE_CACHE = "{scope_name}_cache[{dependency}_type] = {dependency}_instance\n"
+STORE_SLOT = "{scope_name}_slots[{slot}] = {dependency}_instance\n"
 CALL_ON_RESOLVE_EXTENSION = (
     "for extension in registry.extensions.on_resolve:\n"
-    "    await extension.on_resolve(context=scopes[{scope_name}], provider={dependency}_record, instance={dependency}_instance)\n"
+    "    await extension.on_resolve(context=scopes[{scope_name}], provider={record}, instance={dependency}_instance)\n"
 )
 CALL_SYNC_ON_RESOLVE_EXTENSION = (
     "for extension in registry.extensions.on_resolve_sync:\n"
-    "     extension.on_resolve_sync(context=scopes[{scope_name}], provider={dependency}_record, instance={dependency}_instance)\n"
+    "     extension.on_resolve_sync(context=scopes[{scope_name}], provider={record}, instance={dependency}_instance)\n"
 )
 CALL_ON_RESOLVE_CONTEXT_EXTENSION = (
     "async with contextlib.AsyncExitStack() as cm:\n"
@@ -87,6 +173,35 @@ CALL_ON_RESOLVE_CONTEXT_EXTENSION = (
     "        await cm.enter_async_context(extension.on_resolve_context({dependency}_record))\n"
 )
 
+CONCURRENT_FACTORY = (
+    "async def {dependency}_factory():\n"
+    "{body}"
+    "    return {dependency}_instance\n"
+)
+GATHER = "{instances}, = await gather({factories})\n"
+
+
+@dataclasses.dataclass(slots=True, kw_only=True, frozen=True)
+class _CacheTemplates:
+    check: str
+    check_strict: str
+    check_found: str
+    store: str
+
+
+CACHE_TEMPLATES = _CacheTemplates(
+    check=CHECK_CACHE,
+    check_strict=CHECK_CACHE_STRICT,
+    check_found=CHECK_CACHE_FOUND,
+    store=STORE_CACHE,
+)
+SLOT_TEMPLATES = _CacheTemplates(
+    check=CHECK_SLOT,
+    check_strict=CHECK_SLOT_STRICT,
+    check_found=CHECK_SLOT_FOUND,
+    store=STORE_SLOT,
+)
+
 
 TCompilationDirective = TypeVar(
     "TCompilationDirective", bound=CompilationDirective
@@ -106,15 +221,248 @@ def get_directive(
     )
 
 
-def _compile_provider_node(  # noqa: C901
+def _provide_expression(
+    node: ProviderNode, resolve_directive: ResolveDirective
+) -> str:
+    if resolve_directive.direct_call:
+        return PROVIDE_DIRECT_CALL.format(
+            dependency=node.name,
+            call_kwargs=generate_call_kwargs(node.dependencies),
+        )
+    return PROVIDE.format(
+        dependency=node.name,
+        kwargs=generate_factory_kwargs(node.dependencies),
+    )
+
+
+def _is_resource(
+    node: AnyNode,
+    params: CompilationParams,
+    extensions: Extensions,
+    *,
+    is_async: bool,
+) -> bool:
+    return (
+        is_async
+        and extensions.concurrent_shutdown is not None
+        and isinstance(node, ProviderNode)
+        and node.provider.info.scope == params.root_scope
+        and bool(
+            (directive := get_directive(node.provider.info, ResolveDirective))
+            and directive.is_context_manager
+        )
+    )
+
+
+def _resource_dependencies(
+    node: ProviderNode,
+    params: CompilationParams,
+    extensions: Extensions,
+) -> str:
+    # Context managers this node depends on, directly or through
+    # other dependencies, have to be closed after it
+    seen: set[str] = set()
+    stack: list[AnyNode] = [node]
+    types: list[str] = []
+    while stack:
+        for dependency in stack.pop().dependencies:
+            dependency_node = params.nodes_by_name.get(
+                dependency.variable_name
+            )
+            if dependency_node is None or dependency_node.name in seen:
+                continue
+            seen.add(dependency_node.name)
+            stack.append(dependency_node)
+            if _is_resource(
+                dependency_node, params, extensions, is_async=True
+            ):
+                types.append(f"{dependency_node.name}_type, ")
+    return f"({''.join(types)})"
+
+
+def _blocking_call(
+    node: ProviderNode, resolve_directive: ResolveDirective
+) -> str:
+    if resolve_directive.direct_call:
+        return BLOCKING_DIRECT_CALL.format(
+            dependency=node.name,
+            call_kwargs=generate_call_kwargs(node.dependencies),
+        )
+    return BLOCKING_PROVIDE.format(
+        dependency=node.name,
+        kwargs=generate_factory_kwargs(node.dependencies),
+    )
+
+
+def _is_blocking(
+    resolve_directive: ResolveDirective,
+    extensions: Extensions,
+    *,
+    is_async: bool,
+) -> bool:
+    return (
+        is_async
+        and not resolve_directive.is_async
+        and extensions.blocking_factories is not None
+        and (
+            resolve_directive.blocking
+            if resolve_directive.blocking is not None
+            else extensions.blocking_factories.offload == "all"
+        )
+    )
+
+
+def _create_instance(  # noqa: PLR0913
+    node: ProviderNode,
+    resolve_directive: ResolveDirective,
+    params: CompilationParams,
+    extensions: Extensions,
+    *,
+    is_async: bool,
+    local: bool,
+) -> tuple[str, dict[str, str]]:
+    blocking = _is_blocking(resolve_directive, extensions, is_async=is_async)
+    if not resolve_directive.is_context_manager:
+        if blocking:
+            return RUN_BLOCKING_REGULAR_INSTANCE, {
+                "blocking_call": _blocking_call(node, resolve_directive)
+            }
+        return CREATE_REGULAR_INSTANCE, {}
+    # Instances created for a cell override are closed with the current
+    # context rather than with the scope they're usually cached in
+    if local or not _is_resource(node, params, extensions, is_async=is_async):
+        if blocking:
+            return RUN_BLOCKING_CONTEXT_MANAGER_INSTANCE, {}
+        return CREATE_CONTEXT_MANAGER_INSTANCE, {}
+    return (
+        RUN_BLOCKING_RESOURCE_INSTANCE
+        if blocking
+        else CREATE_RESOURCE_INSTANCE
+    ), {
+        "resource_dependencies": _resource_dependencies(
+            node, params, extensions
+        )
+    }
+
+
+def _compile_resolve(  # noqa: PLR0913
     node: ProviderNode,
+    resolve_directive: ResolveDirective,
+    params: CompilationParams,
+    extensions: Extensions,
+    *,
+    context: dict[str, Any],
+    indent: Indent,
+    is_async: bool,
+    local: bool = False,
+) -> list[str]:
+    parts: list[str] = []
+    context = context | {
+        "context_manager_method": "enter_async_context"
+        if resolve_directive.is_async
+        else "enter_context",
+        "await": "await " if resolve_directive.is_async else "",
+        "provide": _provide_expression(node, resolve_directive),
+    }
+
+    if extensions.on_resolve_context and is_async:
+        parts.append(
+            indent.format(CALL_ON_RESOLVE_CONTEXT_EXTENSION).format_map(
+                context
+            )
+        )
+        indent = Indent(indent=indent.indent + 1)
+
+    # Sync factories which aren't offloaded run on the event loop
+    runs_on_loop = (
+        is_async
+        and not resolve_directive.is_async
+        and not _is_blocking(resolve_directive, extensions, is_async=is_async)
+    )
+    measure = (
+        runs_on_loop
+        and extensions.blocking_factories is not None
+        and extensions.blocking_factories.threshold is not None
+    )
+    detect = runs_on_loop and extensions.blocking_detector is not None
+    if measure:
+        parts.append(indent.format(START_TIMER).format_map(context))
+    if detect:
+        parts.append(indent.format(START_DETECTOR).format_map(context))
+
+    template, instance_context = _create_instance(
+        node,
+        resolve_directive,
+        params,
+        extensions,
+        is_async=is_async,
+        local=local,
+    )
+    parts.append(
+        indent.format(template).format_map(context | instance_context)
+    )
+    if measure:
+        parts.append(indent.format(FLAG_BLOCKING).format_map(context))
+    if detect:
+        parts.append(indent.format(STOP_DETECTOR).format_map(context))
+    return parts
+
+
+def _compile_provider_cell(  # noqa: PLR0913
+    node: ProviderNode,
+    resolve_directive: ResolveDirective | None,
+    params: CompilationParams,
+    extensions: Extensions,
+    *,
+    context: dict[str, Any],
+    is_async: bool,
+) -> list[str]:
+    # Dependants of context-local overrides are created again, once per
+    # override, without using the shared cache
+    context = context | {
+        "scope_name": "current_scope",
+        "record": f"({node.name}_override.record or {node.name}_record)",
+    }
+    indent = Indent(indent=1)
+    parts = [indent.format(CHECK_PROVIDER_CELL.format_map(context))]
+    if not resolve_directive:  # pragma: no cover
+        parts.append(Indent(indent=4).format("pass\n"))
+        return parts
+
+    parts.extend(
+        _compile_resolve(
+            node,
+            resolve_directive,
+            params,
+            extensions,
+            context=context,
+            indent=Indent(indent=4),
+            is_async=is_async,
+            local=True,
+        )
+    )
+    indent.indent = 3
+    parts.append(indent.format(STORE_CELL_INSTANCE.format_map(context)))
+    if is_async and extensions.on_resolve:
+        parts.append(
+            indent.format(CALL_ON_RESOLVE_EXTENSION.format_map(context))
+        )
+    if not is_async and extensions.on_resolve_sync:
+        parts.append(
+            indent.format(CALL_SYNC_ON_RESOLVE_EXTENSION.format_map(context))
+        )
+    return parts
+
+
+def _compile_provider_node(  # noqa: C901, PLR0912, PLR0915
+    node: ProviderNode,
+    params: CompilationParams,
     extensions: Extensions,
     *,
     is_async: bool,
 ) -> list[str]:
     parts: list[str] = []
 
-    kwargs = generate_factory_kwargs(node.dependencies)
     indent = Indent(indent=1)
 
     provider = node.provider
@@ -123,55 +471,116 @@ def _compile_provider_node(  # noqa: C901
     resolve_directive = get_directive(provider.info, ResolveDirective)
     lock_directive = get_directive(provider.info, LockDirective)
 
+    slot = params.slots.get(node.name)
+    templates = CACHE_TEMPLATES if slot is None else SLOT_TEMPLATES
     common_context = {
         "dependency": node.name,
-        "kwargs": kwargs,
         "scope_name": f"{provider.info.scope.name}_scope",
+        "slot": slot,
+        "record": f"{node.name}_record",
     }
 
+    if extensions.provider_cells:
+        parts.extend(
+            _compile_provider_cell(
+                node,
+                resolve_directive,
+                params,
+                extensions,
+                context=common_context,
+                is_async=is_async,
+            )
+        )
+        parts.append(indent.format("else:\n"))
+        indent.indent += 1
+
+    metrics = extensions.resolution_metrics is not None
+    check_indent = Indent(indent=indent.indent)
     if cache_directive:
         if cache_directive.optional:
-            parts.append(indent.format(CHECK_CACHE.format_map(common_context)))
+            parts.append(
+                indent.format(templates.check.format_map(common_context))
+            )
             indent.indent += 1
+            if metrics:
+                parts.append(
+                    indent.format(COUNT_MISS.format_map(common_context))
+                )
         else:  # pragma: no cover
             parts.append(
-                indent.format(CHECK_CACHE_STRICT.format_map(common_context))
+                indent.format(
+                    templates.check_strict.format_map(common_context)
+                )
             )
 
     if lock_directive:
         part = (
-            ACQUIRE_LOCK if not cache_directive else ACQUIRE_DOUBLE_CHECK_LOCK
+            ACQUIRE_LOCK
+            if not cache_directive
+            else ACQUIRE_LOCK + textwrap.indent(templates.check, "    ")
         )
         context = common_context | {"async": "async " if is_async else ""}
         parts.append(indent.format(part).format_map(context))
         indent.indent += 1 if not cache_directive else 2
 
-    if resolve_directive:
-        context = common_context | {
-            "context_manager_method": "enter_async_context"
-            if resolve_directive.is_async
-            else "enter_context",
-            "await": "await " if resolve_directive.is_async else "",
-        }
-
-        if extensions.on_resolve_context and is_async:
-            parts.append(
-                indent.format(CALL_ON_RESOLVE_CONTEXT_EXTENSION).format_map(
-                    context
-                )
+    # Concurrent resolvers of the same cached async (or offloaded) provider
+    # share a single construction, singletons are locked instead
+    single_flight = bool(
+        is_async
+        and not lock_directive
+        and cache_directive
+        and cache_directive.optional
+        and resolve_directive
+        and (
+            resolve_directive.is_async
+            or _is_blocking(resolve_directive, extensions, is_async=is_async)
+        )
+    )
+    if single_flight:
+        parts.append(indent.format(START_FLIGHT.format_map(common_context)))
+        # Cancelled construction could be completed by another waiter
+        # before this one is woken up
+        parts.append(
+            Indent(indent=indent.indent + 1).format(
+                templates.check_found.format_map(common_context)
             )
-            indent.indent += 1
+        )
+        parts.append(Indent(indent=indent.indent + 2).format("break\n"))
+        parts.append(indent.format("else:\n"))
+        indent.indent += 1
+    if metrics and resolve_directive:
+        parts.append(indent.format(START_CREATION.format_map(common_context)))
+    if single_flight:
+        parts.append(indent.format("try:\n"))
 
-        parts.append(
-            indent.format(
-                CREATE_REGULAR_INSTANCE
-                if not resolve_directive.is_context_manager
-                else CREATE_CONTEXT_MANAGER_INSTANCE
-            ).format_map(context)
+    if resolve_directive:
+        parts.extend(
+            _compile_resolve(
+                node,
+                resolve_directive,
+                params,
+                extensions,
+                context=common_context,
+                indent=Indent(indent=indent.indent + 1)
+                if single_flight
+                else indent,
+                is_async=is_async,
+            )
         )
+        if single_flight:
+            parts.append(indent.format(FAIL_FLIGHT.format_map(common_context)))
+        elif extensions.on_resolve_context and is_async:
+            indent.indent += 1
+        if metrics:
+            parts.append(
+                indent.format(OBSERVE_CREATION.format_map(common_context))
+            )
 
     if cache_directive and cache_directive.optional:
-        parts.append(indent.format(STORE_CACHE.format_map(common_context)))
+        parts.append(indent.format(templates.store.format_map(common_context)))
+
+    if single_flight:
+        parts.append(indent.format(FINISH_FLIGHT.format_map(common_context)))
 
     if resolve_directive:
         if is_async and extensions.on_resolve:
@@ -188,6 +597,8 @@ def _compile_provider_node(  # noqa: C901
                 )
             )
 
+    if metrics and cache_directive and cache_directive.optional:
+        parts.append(check_indent.format(COUNT_HIT.format_map(common_context)))
     return parts
 
 
@@ -209,52 +620,247 @@ def _compile_from_context_node(node: FromContextNode) -> list[str]:
     return [f"    {name}_instance = scopes[{scope}].cache[{name}_type]\n"]
 
 
+def _compile_subgraph_node(node: SubgraphNode, *, is_async: bool) -> list[str]:
+    return [
+        Indent(indent=1).format(
+            CALL_SUBGRAPH_FACTORY.format_map(
+                {
+                    "dependency": create_var_name(node),
+                    "await": "await " if is_async else "",
+                }
+            )
+        )
+    ]
+
+
 def _compile_node(
     node: AnyNode,
+    params: CompilationParams,
     extensions: Extensions,
     *,
     is_async: bool,
 ) -> list[str]:
     match node:
         case ProviderNode():
-            return _compile_provider_node(node, extensions, is_async=is_async)
+            return _compile_provider_node(
+                node, params, extensions, is_async=is_async
+            )
         case IterableNode():
             return _compile_iterable_node(node)
         case FromContextNode():
             return _compile_from_context_node(node)
+        case SubgraphNode():
+            return _compile_subgraph_node(node, is_async=is_async)
         case _:  # pragma: no cover
             typing.assert_never(node)  # type: ignore[unreachable]
 
 
-def compile_fn(  # noqa: C901
+def _is_async_provider_node(node: AnyNode) -> bool:
+    return isinstance(node, ProviderNode) and bool(
+        (directive := get_directive(node.provider.info, ResolveDirective))
+        and directive.is_async
+    )
+
+
+def _split_concurrent(
+    group: Sequence[AnyNode],
+) -> tuple[Sequence[AnyNode], Sequence[AnyNode]]:
+    # Nodes of the same type are resolved sequentially so that
+    # the second one would hit the cache
+    concurrent: dict[object, AnyNode] = {}
+    sequential: list[AnyNode] = []
+    for node in group:
+        if _is_async_provider_node(node) and node.type_ not in concurrent:
+            concurrent[node.type_] = node
+        else:
+            sequential.append(node)
+
+    if len(concurrent) < 2:  # noqa: PLR2004
+        return group, ()
+    return sequential, tuple(concurrent.values())
+
+
+def _compile_concurrent_nodes(
+    nodes: Sequence[AnyNode],
+    params: CompilationParams,
+    extensions: Extensions,
+) -> list[str]:
+    indent = Indent(indent=1)
+    parts = [
+        indent.format(
+            CONCURRENT_FACTORY.format_map(
+                {
+                    "dependency": node.name,
+                    "body": "".join(
+                        _compile_node(node, params, extensions, is_async=True)
+                    ),
+                }
+            )
+        )
+        for node in nodes
+    ]
+    parts.append(
+        indent.format(
+            GATHER.format_map(
+                {
+                    "instances": ", ".join(
+                        f"{node.name}_instance" for node in nodes
+                    ),
+                    "factories": ", ".join(
+                        f"{node.name}_factory()" for node in nodes
+                    ),
+                }
+            )
+        )
+    )
+    return parts
+
+
+def _compile_nodes(
     params: CompilationParams,
-    registry: Registry,
     extensions: Extensions,
     *,
     is_async: bool,
-) -> CompiledFn[Any]:
+) -> list[str]:
+    if not (is_async and extensions.concurrent_resolution):
+        return [
+            part
+            for node in params.nodes
+            for part in _compile_node(
+                node, params, extensions, is_async=is_async
+            )
+        ]
+
+    parts: list[str] = []
+    for group in group_by_level(params.nodes):
+        sequential, concurrent = _split_concurrent(group)
+        for node in sequential:
+            parts.extend(
+                _compile_node(node, params, extensions, is_async=True)
+            )
+        if concurrent:
+            parts.extend(
+                _compile_concurrent_nodes(concurrent, params, extensions)
+            )
+    return parts
+
+
+def _return_value(root: AnyNode | tuple[AnyNode, ...]) -> tuple[str, str]:
+    if not isinstance(root, tuple):
+        name = create_var_name(root)
+        return name, f"{name}_instance"
+
+    names = [create_var_name(node) for node in root]
+    instances = "".join(f"{name}_instance, " for name in names)
+    return "_".join(names), f"({instances})"
+
+
+def base_namespace(registry: Registry) -> dict[str, Any]:
+    """
+    Globals shared by every factory compiled for a registry.
+
+    Constants specific to a factory are bound as closure variables
+    of `create_factory` instead, so this namespace is never changed.
+    """
     namespace = {
         "NotInCache": object(),
         "ScopeNotFoundError": ScopeNotFoundError,
         "registry": registry,
         "contextlib": contextlib,
-        **registry.type_context,
+        "gather": gather,
+        "EmptySlot": EMPTY_SLOT,
+        "FlightAborted": FLIGHT_ABORTED,
+        "perf_counter": time.perf_counter,
+        "blocking_factories": registry.extensions.blocking_factories,
+        "blocking_detector": registry.extensions.blocking_detector,
     }
     namespace.update(
         {f"{scope.name}_scope": scope for scope in registry.scopes}
     )
+    return namespace
+
+
+def provider_namespace(
+    name: str,
+    type_: object,
+    record: ProviderRecord[Any],
+    registry: Registry,
+) -> dict[str, Any]:
+    namespace = {
+        f"{name}_provider": record.provider,
+        f"{name}_implementation": record.provider.implementation,
+        f"{name}_record": record,
+        f"{name}_type": type_,
+    }
+    if registry.extensions.provider_cells:
+        namespace[f"{name}_cell"] = registry.provider_cell(
+            record.info.interface
+        )
+    if registry.extensions.resolution_metrics:
+        namespace[f"{name}_metrics"] = registry.metrics(record)
+    return namespace
+
+
+def exec_factory(
+    registry: Registry, code: types.CodeType, constants: dict[str, Any]
+) -> CompiledFn[Any]:
+    local_namespace: dict[str, Any] = {}
+    exec(code, registry.namespace, local_namespace)  # noqa: S102
+    create_factory = local_namespace["create_factory"]
+    # Binding thousands of keyword arguments is quadratic,
+    # so constants are passed positionally
+    names = create_factory.__code__.co_varnames[
+        : create_factory.__code__.co_argcount
+    ]
+    return create_factory(*(constants[name] for name in names))
+
+
+def _prepare_scope(scope: BaseScope, params: CompilationParams) -> str:
+    context = {"scope_name": f"{scope.name}_scope", "scope": scope}
+    if not params.slots:
+        return PREPARE_SCOPE_CACHE.format_map(context)
+
+    size = max(
+        (
+            params.slots[node.name] + 1
+            for node in params.nodes
+            if node.name in params.slots
+            and isinstance(node, ProviderNode)
+            and node.provider.info.scope == scope
+        ),
+        default=0,
+    )
+    prepare = PREPARE_SCOPE_SLOTS.format_map(context)
+    if size:
+        prepare += GROW_SCOPE_SLOTS.format_map(context | {"size": size})
+    return prepare
+
 
+def compile_fn(  # noqa: C901
+    params: CompilationParams,
+    registry: Registry,
+    extensions: Extensions,
+    *,
+    is_async: bool,
+) -> CompilationResult:
+    constants: dict[str, Any] = {}
     for node in params.nodes:
         match node:
             case ProviderNode():
-                provider = node.provider
-                namespace[f"{create_var_name(node)}_provider"] = (
-                    provider.provider
+                constants.update(
+                    provider_namespace(
+                        create_var_name(node),
+                        node.type_,
+                        node.provider,
+                        registry,
+                    )
                 )
-                namespace[f"{create_var_name(node)}_record"] = provider
-                namespace[f"{create_var_name(node)}_type"] = node.type_
             case FromContextNode():
-                namespace[f"{create_var_name(node)}_type"] = node.type_
+                constants[f"{create_var_name(node)}_type"] = node.type_
+            case SubgraphNode():
+                constants[f"{create_var_name(node)}_subgraph"] = (
+                    registry.compile_subgraph(node.node, is_async=is_async)
+                )
             case IterableNode():
                 pass
             case _:  # pragma: no cover
@@ -267,59 +873,44 @@ def compile_fn(  # noqa: C901
         match node:
             case ProviderNode():
                 used_scopes.add(node.provider.info.scope)
-            case IterableNode() | FromContextNode():
+            case IterableNode() | FromContextNode() | SubgraphNode():
                 pass
             case _:  # pragma: no cover
                 typing.assert_never(node)  # type: ignore[unreachable]
 
-    for scope in used_scopes:
-        indent = Indent(indent=1)
-        parts.append(
-            indent.format(
-                PREPARE_SCOPE_CACHE.format_map(
-                    {"scope_name": f"{scope.name}_scope", "scope": scope}
-                )
+    if extensions.slot_cache:
+        params.slots = {
+            node.name: registry.cache_slot(
+                node.provider.info.scope, node.type_
             )
-        )
-        if any(
-            directive.is_context_manager
             for node in params.nodes
             if isinstance(node, ProviderNode)
-            and (
-                directive := get_directive(
-                    node.provider.info, ResolveDirective
-                )
-            )
-        ):
-            parts.append(
-                indent.format(
-                    PREPARE_SCOPE_EXIT_STACK.format_map(
-                        {"scope_name": f"{scope.name}_scope"}
-                    )
-                )
-            )
+            and get_directive(node.provider.info, CacheDirective)
+        }
 
-    for node in params.nodes:
-        parts.extend(_compile_node(node, extensions, is_async=is_async))
+    for scope in used_scopes:
+        indent = Indent(indent=1)
+        parts.append(indent.format(_prepare_scope(scope, params)))
+
+    parts.extend(_compile_nodes(params, extensions, is_async=is_async))
 
-    body = "".join(parts)
-    return_var_name = create_var_name(params.root)
+    body = textwrap.indent("".join(parts), "    ")
+    return_var_name, return_value = _return_value(params.root)
     module_src = BODY.format_map(
         {
+            "constants": ", ".join(constants),
             "body": body,
-            "return_var_name": f"{create_var_name(params.root)}_instance",
+            "return_value": return_value,
             "async": "async " if is_async else "",
         }
     )
-    source_filename = f"aioinject_{return_var_name}"
-    linecache.cache[source_filename] = (
-        len(module_src),
-        None,
-        module_src.splitlines(keepends=True),
-        f"aioinject_{return_var_name}",
-    )
+    source_filename = registry.sources.register(return_var_name, module_src)
 
     compiled = compile(module_src, source_filename, "exec")
-    local_namespace: dict[str, Any] = {}
-    exec(compiled, namespace, local_namespace)  # noqa: S102
-    return local_namespace["factory"]
+    return CompilationResult(
+        fn=exec_factory(registry, compiled, constants),
+        source=module_src,
+        nodes=params.nodes,
+        code=compiled,
+        name=return_var_name,
+    )
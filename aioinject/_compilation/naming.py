@@ -35,3 +35,12 @@ def generate_factory_kwargs(
         for dependency in dependencies
     )
     return "{" + joined + "}"
+
+
+def generate_call_kwargs(
+    dependencies: Sequence[BoundDependency[object]],
+) -> str:
+    return ", ".join(
+        f"{dependency.name}={dependency.variable_name}_instance"
+        for dependency in dependencies
+    )
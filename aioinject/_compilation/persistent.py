@@ -0,0 +1,329 @@
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import importlib.util
+import marshal
+import os
+import stat
+import tempfile
+import typing
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from aioinject._compilation.compile import (
+    CompilationResult,
+    exec_factory,
+    provider_namespace,
+)
+from aioinject._compilation.resolve import (
+    AnyNode,
+    FromContextNode,
+    IterableNode,
+    ProviderNode,
+    SubgraphNode,
+)
+from aioinject.extensions import CompilationFingerprintExtension
+
+
+if TYPE_CHECKING:
+    from aioinject._types import CompiledFn
+    from aioinject.container import Registry, RegistryCacheKey
+    from aioinject.context import ProviderRecord
+
+
+__all__ = ["PersistentCache"]
+
+_FORMAT_VERSION = 5
+_AMBIGUOUS = object()
+
+_Entry = tuple[str, ...]
+
+
+def _path(obj: object) -> str:
+    if typing.get_origin(obj) is not None:
+        return repr(obj)
+    if (qualname := getattr(obj, "__qualname__", None)) is None:
+        # Instances (e.g. values of `Object` providers) only
+        # contribute their type
+        return _path(type(obj))
+    return f"{getattr(obj, '__module__', '')}.{qualname}"
+
+
+_Types = dict[str, object]
+
+
+def _add_type(types: _Types, type_: object) -> str:
+    path = _path(type_)
+    if types.setdefault(path, type_) != type_:
+        types[path] = _AMBIGUOUS
+    return path
+
+
+def _type_path(types: _Types, type_: object) -> str | None:
+    path = _path(type_)
+    if types.get(path, _AMBIGUOUS) != type_:
+        return None
+    return path
+
+
+def _resolve(types: _Types, path: str) -> object:
+    # Ambiguous types aren't stored, guards against mismatched files
+    if (type_ := types[path]) is _AMBIGUOUS:  # pragma: no cover
+        raise LookupError(path)
+    return type_
+
+
+@dataclasses.dataclass(slots=True, kw_only=True)
+class _Snapshot:
+    fingerprint: str
+    interfaces: _Types
+
+
+def _snapshot(registry: Registry) -> _Snapshot:
+    # Only registrations are included, so that pending providers of
+    # `LazyRegistrationExtension` aren't extracted. Providers used by
+    # a factory are checked when it's loaded instead.
+    interfaces: _Types = {}
+    registrations = [
+        (
+            _add_type(interfaces, interface),
+            _path(type(provider)),
+            _path(provider.implementation),
+        )
+        for interface, provider in registry.registrations()
+    ]
+    # Extracted and pending providers are iterated separately
+    registrations.sort(key=lambda registration: registration[0])
+    parts: list[object] = [
+        _FORMAT_VERSION,
+        importlib.util.MAGIC_NUMBER,
+        [scope.name for scope in registry.scopes],
+        [
+            (
+                _path(type(extension)),
+                getattr(extension, "enabled", True),
+                extension.fingerprint()
+                if isinstance(extension, CompilationFingerprintExtension)
+                else None,
+            )
+            for extension in registry.extensions._extensions  # noqa: SLF001
+        ],
+        registrations,
+    ]
+    return _Snapshot(
+        fingerprint=hashlib.sha256(repr(parts).encode()).hexdigest(),
+        interfaces=interfaces,
+    )
+
+
+def _describe(types: _Types, record: ProviderRecord[Any]) -> _Entry:
+    info = record.info
+    return (
+        _add_type(types, info.type_),
+        _path(type(record.ext)),
+        getattr(info.scope, "name", _path(type(info.scope))),
+        repr([(d.name, _add_type(types, d.type_)) for d in info.dependencies]),
+        repr([repr(d) for d in info.compilation_directives]),
+    )
+
+
+def _is_trusted(path: Path) -> bool:
+    """
+    Whether `path` is owned by the current user and isn't writable
+    by anyone else.
+    """
+    if not hasattr(os, "getuid"):  # pragma: no cover
+        return True
+    try:
+        st = path.stat()
+    except OSError:
+        return False
+    return st.st_uid == os.getuid() and not (
+        st.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+    )
+
+
+class PersistentCache:
+    """
+    Stores code of compiled factories on disk, keyed by a fingerprint of
+    the registered providers, so that it can be reused between processes.
+
+    Files are loaded with `marshal` and executed, so anyone able to write
+    to the directory can run code in the process. The directory and its
+    files are only used when they are owned by the current user and
+    aren't writable by group or others.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+        self._snapshot: _Snapshot | None = None
+
+    def reset(self) -> None:
+        self._snapshot = None
+
+    def load(
+        self, registry: Registry, key: RegistryCacheKey
+    ) -> CompiledFn[Any] | None:
+        snapshot = self._get_snapshot(registry)
+        types, roots = _key_types(snapshot, key)
+        if (path := self._file(snapshot, registry, key, roots)) is None:
+            return None
+        if not (_is_trusted(self.directory) and _is_trusted(path)):
+            return None
+        try:
+            name, source, code, providers, entries = marshal.loads(  # noqa: S302
+                path.read_bytes()
+            )
+            constants = _load_entries(
+                snapshot, types, registry, providers, entries
+            )
+        except (OSError, EOFError, ValueError, TypeError, LookupError):
+            return None
+        if constants is None:
+            return None
+
+        registry.sources.register(name, source)
+        return exec_factory(registry, code, constants)
+
+    def store(
+        self,
+        registry: Registry,
+        key: RegistryCacheKey,
+        result: CompilationResult,
+    ) -> None:
+        snapshot = self._get_snapshot(registry)
+        types, roots = _key_types(snapshot, key)
+        if (path := self._file(snapshot, registry, key, roots)) is None:
+            return
+
+        # Types used by providers have to be known before entries
+        # are dumped, they're checked for ambiguity
+        providers = [
+            _describe(types, node.provider)
+            for node in result.nodes
+            if isinstance(node, ProviderNode)
+        ]
+        entries = []
+        for node in result.nodes:
+            if (entry := _dump_entry(types, registry, node)) is None:
+                return
+            if entry:
+                entries.append(entry)
+
+        data = marshal.dumps(
+            (result.name, result.source, result.code, providers, entries)
+        )
+        self.directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+        if not _is_trusted(self.directory):
+            return
+        # Write atomically, other processes might be reading the same file
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory)
+        with os.fdopen(fd, "wb") as file:
+            file.write(data)
+        Path(tmp_path).replace(path)
+
+    def _get_snapshot(self, registry: Registry) -> _Snapshot:
+        if self._snapshot is None:
+            self._snapshot = _snapshot(registry)
+        return self._snapshot
+
+    def _file(
+        self,
+        snapshot: _Snapshot,
+        registry: Registry,
+        key: RegistryCacheKey,
+        roots: list[str | None],
+    ) -> Path | None:
+        # Slots are assigned in the order types are compiled,
+        # so they can't be shared between processes
+        if registry.extensions.slot_cache:
+            return None
+        if None in roots:
+            return None
+
+        digest = hashlib.sha256(
+            repr((snapshot.fingerprint, roots, key[1])).encode()
+        ).hexdigest()
+        return self.directory / f"{digest}.bin"
+
+
+def _key_types(
+    snapshot: _Snapshot, key: RegistryCacheKey
+) -> tuple[_Types, list[str | None]]:
+    root, _ = key
+    root_types = root if isinstance(root, tuple) else (root,)
+    types = dict(snapshot.interfaces)
+    for type_ in root_types:
+        _add_type(types, type_)
+    return types, [_type_path(types, type_) for type_ in root_types]
+
+
+def _dump_entry(  # noqa: C901
+    types: _Types,
+    registry: Registry,
+    node: AnyNode,
+) -> _Entry | None:
+    match node:
+        case ProviderNode():
+            interface = node.provider.info.interface
+            type_path = _type_path(types, node.type_)
+            interface_path = _type_path(types, interface)
+            if type_path is None or interface_path is None:
+                return None
+            records = registry.interface_providers(interface) or []
+            return (
+                "provider",
+                node.name,
+                type_path,
+                interface_path,
+                str(records.index(node.provider)),
+            )
+        case FromContextNode():
+            if (type_path := _type_path(types, node.type_)) is None:
+                return None
+            return ("context", node.name, type_path)
+        case IterableNode():
+            return ()
+        case SubgraphNode():
+            # Factories of shared subgraphs are compiled separately
+            return None
+        case _:  # pragma: no cover
+            typing.assert_never(node)  # type: ignore[unreachable]
+
+
+def _load_record(
+    snapshot: _Snapshot, registry: Registry, entry: _Entry
+) -> ProviderRecord[Any]:
+    *_, interface_path, index = entry
+    interface = _resolve(snapshot.interfaces, interface_path)
+    return (registry.interface_providers(interface) or [])[int(index)]
+
+
+def _load_entries(
+    snapshot: _Snapshot,
+    types: _Types,
+    registry: Registry,
+    providers: list[_Entry],
+    entries: list[_Entry],
+) -> dict[str, Any] | None:
+    records = [
+        _load_record(snapshot, registry, entry)
+        for entry in entries
+        if entry[0] == "provider"
+    ]
+    # Annotations of used providers could've changed
+    if [_describe(types, record) for record in records] != providers:
+        return None
+
+    constants: dict[str, Any] = {}
+    remaining = iter(records)
+    for kind, name, type_path, *_ in entries:
+        type_ = _resolve(types, type_path)
+        if kind == "context":
+            constants[f"{name}_type"] = type_
+        else:
+            constants.update(
+                provider_namespace(name, type_, next(remaining), registry)
+            )
+    return constants
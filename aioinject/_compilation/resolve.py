@@ -3,9 +3,9 @@ from __future__ import annotations
 import collections
 import dataclasses
 import typing
-from collections.abc import Iterator, Sequence
+from collections.abc import Container, Iterator, Mapping, Sequence
 from types import GenericAlias
-from typing import TYPE_CHECKING, Any, Generic
+from typing import TYPE_CHECKING, Any, Generic, TypeAlias
 
 from aioinject._compilation.naming import make_dependency_name
 from aioinject._types import (
@@ -66,7 +66,21 @@ class FromContextNode:
         return hash((self.name, self.type_, self.scope))
 
 
-AnyNode = ProviderNode | IterableNode | FromContextNode
+@dataclasses.dataclass(slots=True, kw_only=True)
+class SubgraphNode:
+    """Node whose subgraph is resolved by a separately compiled factory"""
+
+    name: str
+    type_: GenericAlias | type[Any]
+    node: ProviderNode
+    dependencies: tuple[BoundDependency[object], ...] = ()
+
+    def __hash__(self) -> int:
+        return hash((self.name, SubgraphNode))
+
+
+AnyNode = ProviderNode | IterableNode | FromContextNode | SubgraphNode
+NodeKey: TypeAlias = tuple[object, str, BaseScope | None]
 
 
 def _get_orig_bases(
@@ -136,16 +150,33 @@ def get_generic_parameter_map(
     return result
 
 
+class _GenericMaps:
+    """Memoises generic parameter maps of providers during a single resolution"""
+
+    def __init__(self) -> None:
+        self._maps: dict[tuple[object, int], dict[str, type[object]]] = {}
+
+    def get(
+        self,
+        provided_type: GenericAlias | type[Any],
+        provider: ProviderRecord[Any],
+    ) -> dict[str, type[object]]:
+        key = (provided_type, id(provider))
+        if (args_map := self._maps.get(key)) is None:
+            args_map = self._maps[key] = get_generic_parameter_map(
+                provided_type, provider.info.dependencies
+            )
+        return args_map
+
+
 def _resolve_provider_node_dependencies(
     type_: GenericAlias | type[Any],
     node_name: str,
     provider: ProviderRecord[object],
     registry: Registry,
+    generic_maps: _GenericMaps,
 ) -> tuple[BoundDependency[Any], ...]:
-    generic_args_map = get_generic_parameter_map(
-        provided_type=type_,
-        dependencies=provider.info.dependencies,
-    )
+    generic_args_map = generic_maps.get(type_, provider)
 
     dependencies = []
     for provider_dependency in provider.info.dependencies:
@@ -163,8 +194,8 @@ def _resolve_provider_node_dependencies(
             if is_iterable
             else dependency_type
         )
-        dependency_args_map = get_generic_parameter_map(
-            bound_dependency_type, dependency_provider.info.dependencies
+        dependency_args_map = generic_maps.get(
+            bound_dependency_type, dependency_provider
         )
         resolved_type = (
             dependency_args_map.get(
@@ -205,6 +236,7 @@ def _resolve_node(
     type_: type[Any],
     name: str,
     registry: Registry,
+    generic_maps: _GenericMaps,
     dependant: ProviderNode | None = None,
 ) -> AnyNode:
     try:
@@ -255,20 +287,69 @@ def _resolve_node(
             node_name=name,
             provider=provider,
             registry=registry,
+            generic_maps=generic_maps,
         ),
     )
 
 
-def resolve_dependencies(  # noqa: C901
+def _resolve_cached(
+    type_: type[Any],
+    name: str,
+    registry: Registry,
+    generic_maps: _GenericMaps,
+    dependant: ProviderNode | None = None,
+) -> AnyNode:
+    key = (type_, name, dependant.provider.info.scope if dependant else None)
+    if (node := registry.node_cache.get(key)) is None:
+        node = registry.node_cache[key] = _resolve_node(
+            type_=type_,
+            name=name,
+            registry=registry,
+            generic_maps=generic_maps,
+            dependant=dependant,
+        )
+    return node
+
+
+def resolve_dependencies(
     root_type: type[Any],
     registry: Registry,
+    root_name: str | None = None,
+    shared: Container[AnyNode] = (),
 ) -> Iterator[AnyNode]:
-    stack = [
-        _resolve_node(
-            root_type, name=make_dependency_name(root_type), registry=registry
-        )
-    ]
+    generic_maps = _GenericMaps()
+    root = _resolve_cached(
+        root_type,
+        name=root_name or make_dependency_name(root_type),
+        registry=registry,
+        generic_maps=generic_maps,
+    )
+    return _walk(root, registry, generic_maps, shared)
+
+
+def resolve_subgraph(
+    root: AnyNode,
+    registry: Registry,
+    shared: Container[AnyNode] = (),
+) -> Iterator[AnyNode]:
+    return _walk(root, registry, _GenericMaps(), shared)
+
+
+def _walk(  # noqa: C901
+    root: AnyNode,
+    registry: Registry,
+    generic_maps: _GenericMaps,
+    shared: Container[AnyNode],
+) -> Iterator[AnyNode]:
+    """
+    Yields root and all of its dependencies, `shared` nodes are yielded
+    as `SubgraphNode` and their dependencies aren't visited.
+    """
+    stack = [root]
     seen = set()
+    # Dependencies already pushed onto the stack, so that nodes shared by
+    # multiple dependants are only resolved once
+    resolved: set[NodeKey] = set()
     while stack:
         node = stack.pop()
         if node in seen:
@@ -276,27 +357,39 @@ def resolve_dependencies(  # noqa: C901
 
         seen.add(node)
 
+        if (
+            node is not root
+            and isinstance(node, ProviderNode)
+            and node in shared
+        ):
+            yield SubgraphNode(name=node.name, type_=node.type_, node=node)
+            continue
+
         yield node
 
         match node:
             case ProviderNode():
-                generic_args_map = get_generic_parameter_map(
-                    node.type_, node.provider.info.dependencies
-                )
-                for dependency in node.dependencies:
-                    orig_dependency = next(
-                        dep
-                        for dep in node.provider.info.dependencies
-                        if dep.name == dependency.name
-                    )
+                generic_args_map = generic_maps.get(node.type_, node.provider)
+                scope = node.provider.info.scope
+                # Bound dependencies are in the same order as provider ones
+                for dependency, orig_dependency in zip(
+                    node.dependencies,
+                    node.provider.info.dependencies,
+                    strict=True,
+                ):
                     dependency_type = generic_args_map.get(
                         dependency.name, orig_dependency.type_
                     )
+                    key = (dependency_type, dependency.variable_name, scope)
+                    if key in resolved:
+                        continue
+                    resolved.add(key)
                     stack.append(
-                        _resolve_node(
+                        _resolve_cached(
                             type_=dependency_type,
                             name=dependency.variable_name,
                             registry=registry,
+                            generic_maps=generic_maps,
                             dependant=node,
                         )
                     )
@@ -313,40 +406,129 @@ def resolve_dependencies(  # noqa: C901
                             node_name=node.name,
                             provider=provider,
                             registry=registry,
+                            generic_maps=generic_maps,
                         ),
                     )
                     stack.append(new_node)
-            case FromContextNode():
+            case FromContextNode() | SubgraphNode():
                 pass
             case _:  # pragma: no cover
                 typing.assert_never(node)  # type: ignore[unreachable]
 
 
-def sort_nodes(nodes: Sequence[AnyNode]) -> Iterator[AnyNode]:
-    postponed_nodes: dict[AnyNode, int] = collections.defaultdict(int)
-    max_attempts = len(nodes)
+def sort_nodes(nodes: Sequence[AnyNode]) -> Iterator[AnyNode]:  # noqa: C901
+    """
+    Sorts nodes so that each one comes after nodes providing its dependencies
+    (Kahn's algorithm), a dependency is satisfied by any node of its type.
+    """
+    dependants: dict[object, list[int]] = collections.defaultdict(list)
+    missing: list[int] = []
+    ready: collections.deque[int] = collections.deque()
+    for index, node in enumerate(nodes):
+        dependency_types = {dep.type_ for dep in node.dependencies}
+        for type_ in dependency_types:
+            dependants[type_].append(index)
+        missing.append(len(dependency_types))
+        if not dependency_types:
+            ready.append(index)
 
     seen_types = set()
-    queue: collections.deque[AnyNode] = collections.deque()
-    for node in nodes:
-        queue.appendleft(node)
-
-    while queue:
-        node = queue.pop()
+    while ready:
+        node = nodes[ready.popleft()]
+        yield node
 
-        dependencies_satisfied = all(
-            dep.type_ in seen_types for dep in node.dependencies
+        if node.type_ in seen_types:
+            continue
+        seen_types.add(node.type_)
+        for index in dependants.pop(node.type_, ()):
+            missing[index] -= 1
+            if not missing[index]:
+                ready.append(index)
+
+    if unresolved := [
+        node for index, node in enumerate(nodes) if missing[index]
+    ]:
+        node = unresolved[0]
+        msg = (
+            f"Could not resolve dependencies for type {node.type_}\n"
+            f"  unresolved dependencies: {[dep.type_ for dep in node.dependencies if dep.type_ not in seen_types]}"
         )
-        if not dependencies_satisfied:
-            if postponed_nodes[node] >= max_attempts:
-                msg = (
-                    f"Could not resolve dependencies for type {node.type_}\n"
-                    f"  unresolved dependencies: {[dep.type_ for dep in node.dependencies if dep.type_ not in seen_types]}"
-                )
-                raise ValueError(msg)
-            postponed_nodes[node] += 1
-            queue.insert(max(0, len(queue) - postponed_nodes[node]), node)
+        raise ValueError(msg)
+
+
+def _inlined_size(
+    node: AnyNode,
+    nodes_by_name: Mapping[str, AnyNode],
+    limit: int,
+) -> int:
+    """Number of nodes inlined into factory of `node`, counted up to `limit`"""
+    seen = {node.name}
+    stack = [node]
+    while stack and len(seen) <= limit:
+        # Shared nodes are `SubgraphNode` without dependencies
+        for dependency in stack.pop().dependencies:
+            if dependency.variable_name not in seen:
+                seen.add(dependency.variable_name)
+                stack.append(nodes_by_name[dependency.variable_name])
+    return len(seen)
+
+
+def share_subgraphs(
+    nodes: Sequence[AnyNode],
+    roots: Sequence[AnyNode],
+    shared: set[AnyNode],
+    uses: Mapping[AnyNode, int],
+    threshold: int,
+) -> tuple[AnyNode, ...]:
+    """
+    Replaces provider nodes that are used by more compiled factories than
+    the roots and have more than `threshold` nodes in their subgraph
+    by `SubgraphNode`, which is compiled into a separate factory.
+    Such nodes are added into `shared`, so that their subgraphs don't have
+    to be resolved again.
+    """
+    nodes_by_name = {node.name: node for node in nodes}
+    root_uses = max((uses.get(root, 0) for root in roots), default=0)
+    reachable = {root.name for root in roots}
+    # Dependants come before their dependencies
+    for node in reversed(nodes):
+        if node.name not in reachable:
+            continue
+        if (
+            isinstance(node, ProviderNode)
+            and node not in roots
+            and uses.get(node, 0) > root_uses
+            and _inlined_size(node, nodes_by_name, threshold) > threshold
+        ):
+            shared.add(node)
             continue
+        reachable.update(dep.variable_name for dep in node.dependencies)
+
+    return tuple(
+        SubgraphNode(name=node.name, type_=node.type_, node=node)
+        if isinstance(node, ProviderNode)
+        and node not in roots
+        and node in shared
+        else node
+        for node in nodes
+        if node.name in reachable
+    )
 
-        yield node
-        seen_types.add(node.type_)
+
+def group_by_level(nodes: Sequence[AnyNode]) -> list[list[AnyNode]]:
+    """Split sorted nodes into groups, nodes within a group are independent of each other"""
+    levels: dict[str, int] = {}
+    groups: list[list[AnyNode]] = []
+    for node in nodes:
+        level = max(
+            (
+                levels.get(dep.variable_name, len(groups) - 1) + 1
+                for dep in node.dependencies
+            ),
+            default=0,
+        )
+        if level == len(groups):
+            groups.append([])
+        groups[level].append(node)
+        levels[node.name] = level
+    return groups
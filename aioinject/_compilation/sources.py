@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import collections
+import linecache
+import threading
+import types
+import typing
+import weakref
+import zlib
+from collections.abc import Callable
+from typing import Any, Literal
+
+
+__all__ = ["SourceCache", "SourceRegistrationMode"]
+
+SourceRegistrationMode = Literal["eager", "lazy", "off"]
+
+# Number of source caches holding each registered file,
+# `linecache` is global so the same source can be shared by several registries.
+# Factories can be compiled concurrently by sync containers, so it's guarded.
+# Reentrant, since finalizers of garbage collected caches can run at any point
+_references: collections.Counter[str] = collections.Counter()
+_references_lock = threading.RLock()
+
+
+def _lazy_loader(source: str) -> Callable[[], str]:
+    # Generated code is repetitive, so keeping it compressed until
+    # it's needed in a traceback saves most of its memory
+    compressed = zlib.compress(source.encode())
+    return lambda: zlib.decompress(compressed).decode()
+
+
+class SourceCache:
+    """
+    Registers sources of compiled factories in `linecache`,
+    so that they're shown in tracebacks.
+    """
+
+    def __init__(
+        self,
+        mode: SourceRegistrationMode = "eager",
+        maxsize: int | None = None,
+    ) -> None:
+        self.mode = mode
+        self.maxsize = maxsize
+        # Registered files, least recently registered first
+        self._files: collections.OrderedDict[str, None] = (
+            collections.OrderedDict()
+        )
+        weakref.finalize(self, _release_all, self._files)
+
+    def register(self, name: str, source: str) -> str:
+        # Sync and async factories of the same type, or ones compiled
+        # after an override, have different sources under the same name
+        filename = f"aioinject_{name}_{zlib.crc32(source.encode()):08x}"
+        if self.mode == "off":
+            return filename
+
+        with _references_lock:
+            if filename not in linecache.cache:
+                linecache.cache[filename] = (
+                    # Lines are only produced when `linecache` is asked
+                    # for them
+                    (_lazy_loader(source),)
+                    if self.mode == "lazy"
+                    else (
+                        len(source),
+                        None,
+                        source.splitlines(keepends=True),
+                        filename,
+                    )
+                )
+            if filename in self._files:
+                self._files.move_to_end(filename)
+                return filename
+
+            _references[filename] += 1
+            self._files[filename] = None
+
+            if self.maxsize is not None and len(self._files) > self.maxsize:
+                oldest, _ = self._files.popitem(last=False)
+                _release(oldest)
+        return filename
+
+    def release(self, fn: Callable[..., Any]) -> None:
+        filename = typing.cast("types.FunctionType", fn).__code__.co_filename
+        with _references_lock:
+            if filename in self._files:
+                del self._files[filename]
+                _release(filename)
+
+
+def _release(filename: str) -> None:
+    _references[filename] -= 1
+    if not _references[filename]:
+        del _references[filename]
+        linecache.cache.pop(filename, None)
+
+
+def _release_all(files: collections.OrderedDict[str, None]) -> None:
+    with _references_lock:
+        for filename in files:
+            _release(filename)
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
+import asyncio
 import textwrap
+from collections.abc import Awaitable
+from typing import Any
 
 
 class Indent:
@@ -10,3 +13,14 @@ class Indent:
 
     def format(self, text: str) -> str:
         return textwrap.indent(text, self._char * self.indent)
+
+
+async def gather(*awaitables: Awaitable[Any]) -> list[Any]:
+    tasks = [asyncio.ensure_future(awaitable) for awaitable in awaitables]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
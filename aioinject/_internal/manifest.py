@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import importlib
+import inspect
+import json
+import os
+import sys
+import tempfile
+import typing
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+from aioinject.extensions.providers import Dependency
+
+
+__all__ = ["Manifest"]
+
+_FORMAT_VERSION = 2
+
+
+def _key(obj: object) -> str | None:
+    qualname = getattr(obj, "__qualname__", None)
+    module = getattr(obj, "__module__", None)
+    if (
+        not isinstance(qualname, str)
+        or not isinstance(module, str)
+        or "<" in qualname  # <locals>, <lambda>
+        or typing.get_origin(obj) is not None
+        # Return type of a method returning `Self` depends on the instance
+        or inspect.ismethod(obj)
+    ):
+        return None
+    return f"{module}:{qualname}"
+
+
+def _load_type(key: str) -> object:
+    module_name, qualname = key.split(":")
+    obj: object = importlib.import_module(module_name)
+    for part in qualname.split("."):
+        obj = getattr(obj, part)
+    return obj
+
+
+def _stat(path: str) -> list[int] | None:
+    try:
+        stat = Path(path).stat()
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _module_file(obj: object) -> str | None:
+    module = sys.modules.get(getattr(obj, "__module__", None) or "")
+    return getattr(module, "__file__", None)
+
+
+def _source_files(factory: object, related: Iterable[object]) -> list[str]:
+    """
+    Files of modules defining the factory and related types,
+    including their base classes.
+    """
+    files: list[str] = []
+    for obj in (factory, *related):
+        for cls in inspect.getmro(obj) if inspect.isclass(obj) else (obj,):
+            if (file := _module_file(cls)) is not None and file not in files:
+                files.append(file)
+    return files
+
+
+class Manifest:
+    """
+    Stores dependencies and return types of factories, so that they don't
+    have to be collected from annotations on the next start.
+    Entries are discarded once a file defining the factory, its base
+    classes, return type or dependencies changes.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._entries: dict[str, dict[str, Any]] = {}
+        self._stats: dict[str, list[int] | None] = {}
+        self._dirty = False
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            data = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return
+        if data.get("version") != [_FORMAT_VERSION, sys.version]:
+            return
+        self._entries = data["entries"]
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+
+        data = {
+            "version": [_FORMAT_VERSION, sys.version],
+            "entries": self._entries,
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent)
+        with os.fdopen(fd, "w") as file:
+            json.dump(data, file)
+        Path(tmp_path).replace(self.path)
+        self._dirty = False
+
+    def return_type(self, factory: object) -> object | None:
+        if (entry := self._entry(factory)) is None or (
+            return_type := entry.get("return_type")
+        ) is None:
+            return None
+        types = self._load_types([return_type])
+        return types[0] if types else None
+
+    def dependencies(
+        self, factory: object
+    ) -> tuple[Dependency[object], ...] | None:
+        if (entry := self._entry(factory)) is None or (
+            dependencies := entry.get("dependencies")
+        ) is None:
+            return None
+
+        types = self._load_types([type_ for _, type_ in dependencies])
+        if types is None:
+            return None
+        return tuple(
+            Dependency(name=name, type_=type_)  # type: ignore[arg-type]
+            for (name, _), type_ in zip(dependencies, types, strict=True)
+        )
+
+    def set_return_type(self, factory: object, return_type: object) -> None:
+        if (type_key := _key(return_type)) is None or not inspect.isclass(
+            return_type
+        ):
+            return
+        self._set(factory, "return_type", type_key, (return_type,))
+
+    def set_dependencies(
+        self,
+        factory: object,
+        dependencies: tuple[Dependency[object], ...],
+    ) -> None:
+        value = []
+        for dependency in dependencies:
+            type_key = _key(dependency.type_)
+            if type_key is None or not inspect.isclass(dependency.type_):
+                return
+            value.append([dependency.name, type_key])
+        self._set(
+            factory,
+            "dependencies",
+            value,
+            [dependency.type_ for dependency in dependencies],
+        )
+
+    def _set(
+        self,
+        factory: object,
+        field: str,
+        value: object,
+        related: Iterable[object],
+    ) -> None:
+        if (key := _key(factory)) is None or _module_file(factory) is None:
+            return
+
+        entry = self._entries.get(key)
+        if entry is None or not self._is_fresh(entry):
+            entry = self._entries[key] = {"files": {}}
+        for file in _source_files(factory, related):
+            if file not in entry["files"]:
+                entry["files"][file] = self._stat(file)
+                self._dirty = True
+        if entry.get(field) != value:
+            entry[field] = value
+            self._dirty = True
+
+    def _entry(self, factory: object) -> dict[str, Any] | None:
+        if (key := _key(factory)) is None or (
+            entry := self._entries.get(key)
+        ) is None:
+            return None
+        return entry if self._is_fresh(entry) else None
+
+    def _is_fresh(self, entry: dict[str, Any]) -> bool:
+        return all(
+            stat is not None and self._stat(file) == stat
+            for file, stat in entry["files"].items()
+        )
+
+    def _stat(self, file: str) -> list[int] | None:
+        if file not in self._stats:
+            self._stats[file] = _stat(file)
+        return self._stats[file]
+
+    def _load_types(self, keys: list[str]) -> list[object] | None:
+        try:
+            return [_load_type(key) for key in keys]
+        except (ImportError, AttributeError, ValueError):
+            return None
@@ -6,6 +6,7 @@ import typing
 from collections.abc import Callable, Iterator, Mapping, Sequence
 from types import FunctionType, MethodType
 from typing import (
+    TYPE_CHECKING,
     Any,
     Final,
     Protocol,
@@ -23,9 +24,15 @@ from aioinject._types import (
     _get_function_namespace,
     get_generic_origin,
 )
+from aioinject.dependencies import collect_parameters
 from aioinject.errors import CannotDetermineReturnTypeError
 
 
+if TYPE_CHECKING:
+    from aioinject._internal.manifest import Manifest
+    from aioinject.extensions.providers import Dependency
+
+
 class ReturnTypeSource(Protocol[T]):
     def accepts(self, factory: Any) -> TypeIs[T]: ...
 
@@ -177,14 +184,52 @@ def _function_return_type(
 
 class TypeResolver:
     def __init__(
-        self, return_type_sources: Sequence[ReturnTypeSource[Any]]
+        self,
+        return_type_sources: Sequence[ReturnTypeSource[Any]],
+        manifest: Manifest | None = None,
     ) -> None:
         self.sources: Final = return_type_sources
+        self.manifest: Final = manifest
+
+    def parameters(
+        self,
+        dependant: FactoryType[object],
+        type_context: TypeContext,
+    ) -> tuple[Dependency[object], ...]:
+        if (
+            self.manifest is not None
+            and (dependencies := self.manifest.dependencies(dependant))
+            is not None
+        ):
+            return dependencies
+
+        dependencies = tuple(
+            collect_parameters(dependant=dependant, type_context=type_context)
+        )
+        if self.manifest is not None:
+            self.manifest.set_dependencies(dependant, dependencies)
+        return dependencies
 
     def return_type(
         self,
         factory: FactoryType[T],
         type_context: TypeContext,
+    ) -> type[T]:
+        if (
+            self.manifest is not None
+            and (cached := self.manifest.return_type(factory)) is not None
+        ):
+            return typing.cast("type[T]", cached)
+
+        return_type = self._return_type(factory, type_context)
+        if self.manifest is not None:
+            self.manifest.set_return_type(factory, return_type)
+        return return_type
+
+    def _return_type(
+        self,
+        factory: FactoryType[T],
+        type_context: TypeContext,
     ) -> type[T]:
         for source in self.sources:
             if source.accepts(factory):
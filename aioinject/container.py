@@ -1,9 +1,15 @@
 from __future__ import annotations
 
 import collections
+import dataclasses
 import itertools
+import sys
+import threading
+import time
 import typing
-from collections.abc import Sequence
+from collections.abc import Hashable, Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from types import TracebackType
 from typing import Any, Final, Literal, TypeAlias
 
@@ -11,46 +17,100 @@ from typing_extensions import Self
 
 from aioinject._compilation import (
     CompilationParams,
+    CompilationResult,
     compile_fn,
 )
+from aioinject._compilation.compile import base_namespace
+from aioinject._compilation.naming import make_dependency_name
+from aioinject._compilation.persistent import PersistentCache
 from aioinject._compilation.resolve import (
+    AnyNode,
+    FromContextNode,
+    IterableNode,
+    NodeKey,
+    ProviderNode,
+    SubgraphNode,
     resolve_dependencies,
+    resolve_subgraph,
+    share_subgraphs,
     sort_nodes,
 )
+from aioinject._compilation.sources import SourceCache
+from aioinject._compilation.util import gather
 from aioinject._internal.type_sources import (
     ClassSource,
     FunctionSource,
     FunctoolsPartialSource,
     TypeResolver,
 )
-from aioinject._types import CompiledFn, SyncCompiledFn, T, get_generic_origin
-from aioinject.context import Context, ProviderRecord, SyncContext
+from aioinject._types import (
+    CompiledFn,
+    SyncCompiledFn,
+    T,
+    get_generic_origin,
+    is_generic_alias,
+    is_iterable_generic_collection,
+)
+from aioinject.context import (
+    EMPTY_SLOT,
+    Context,
+    ProviderCell,
+    ProviderRecord,
+    SyncContext,
+)
 from aioinject.errors import ProviderNotFoundError
 from aioinject.extensions import (
+    BlockingDetectorExtension,
+    BlockingFactoriesExtension,
+    CompilationCacheExtension,
+    ConcurrentResolutionExtension,
+    ConcurrentShutdownExtension,
+    EagerSingletonsExtension,
     Extension,
+    LazyRegistrationExtension,
     LifespanExtension,
     LifespanSyncExtension,
     OnInitExtension,
     OnResolveContextExtension,
     OnResolveExtension,
     OnResolveSyncExtension,
+    ProviderCellsExtension,
     ProviderExtension,
+    RegistrationManifestExtension,
+    ResolutionMetricsExtension,
+    SharedSubgraphsExtension,
+    SlotCacheExtension,
+    SourceRegistrationExtension,
     TypeSourcesExtension,
 )
 from aioinject.extensions.providers import ProviderInfo
+from aioinject.metrics import (
+    DEFAULT_BUCKETS,
+    ProviderMetrics,
+    ProviderMetricsSnapshot,
+)
 from aioinject.providers import Provider
 from aioinject.providers.context import ContextProviderExtension
 from aioinject.providers.object import ObjectProviderExtension
-from aioinject.providers.scoped import ScopedProviderExtension
+from aioinject.providers.scoped import (
+    Scoped,
+    ScopedProviderExtension,
+    Singleton,
+)
 from aioinject.scope import BaseScope, Scope, next_scope
+from aioinject.shutdown import ConcurrentExitStack, ShutdownReport
 
 
 __all__ = [
     "DEFAULT_EXTENSIONS",
     "Container",
+    "EagerInitEntry",
+    "EagerInitReport",
     "Extensions",
     "Registry",
     "SyncContainer",
+    "WarmupEntry",
+    "WarmupReport",
 ]
 
 DEFAULT_EXTENSIONS = (
@@ -107,9 +167,133 @@ class Extensions:
         self.source_extensions = [
             e for e in self._extensions if isinstance(e, TypeSourcesExtension)
         ]
+        self.concurrent_resolution = any(
+            isinstance(e, ConcurrentResolutionExtension)
+            for e in self._extensions
+        )
+        self.eager_singletons = next(
+            (
+                e
+                for e in self._extensions
+                if isinstance(e, EagerSingletonsExtension)
+            ),
+            None,
+        )
+        self.slot_cache = any(
+            isinstance(e, SlotCacheExtension) for e in self._extensions
+        )
+        self.provider_cells = any(
+            isinstance(e, ProviderCellsExtension) for e in self._extensions
+        )
+        self.lazy_registration = any(
+            isinstance(e, LazyRegistrationExtension) for e in self._extensions
+        )
+        self.compilation_cache = next(
+            (
+                e
+                for e in self._extensions
+                if isinstance(e, CompilationCacheExtension)
+            ),
+            None,
+        )
+        self.manifest = next(
+            (
+                e.manifest
+                for e in self._extensions
+                if isinstance(e, RegistrationManifestExtension)
+            ),
+            None,
+        )
+        self.shared_subgraphs = next(
+            (
+                e
+                for e in self._extensions
+                if isinstance(e, SharedSubgraphsExtension)
+            ),
+            None,
+        )
+        self.source_registration = next(
+            (
+                e
+                for e in self._extensions
+                if isinstance(e, SourceRegistrationExtension)
+            ),
+            None,
+        )
+        self.concurrent_shutdown = next(
+            (
+                e
+                for e in self._extensions
+                if isinstance(e, ConcurrentShutdownExtension)
+            ),
+            None,
+        )
+        self.blocking_factories = next(
+            (
+                e
+                for e in self._extensions
+                if isinstance(e, BlockingFactoriesExtension)
+            ),
+            None,
+        )
+        self.blocking_detector = next(
+            (
+                e
+                for e in self._extensions
+                if isinstance(e, BlockingDetectorExtension)
+            ),
+            None,
+        )
+        self.resolution_metrics = next(
+            (
+                e
+                for e in self._extensions
+                if isinstance(e, ResolutionMetricsExtension)
+            ),
+            None,
+        )
+
+
+RegistryCacheKey: TypeAlias = tuple[
+    type[object] | tuple[type[object], ...], bool
+]
+
 
+@dataclasses.dataclass(slots=True, kw_only=True)
+class WarmupEntry:
+    type_: type[object]
+    is_async: bool
+    duration: float
+    # Unknown for factories loaded by `CompilationCacheExtension`
+    node_count: int | None
+    source_size: int | None
 
-RegistryCacheKey: TypeAlias = tuple[type[object], bool]
+
+@dataclasses.dataclass(slots=True, kw_only=True)
+class WarmupReport:
+    entries: list[WarmupEntry]
+
+    @property
+    def duration(self) -> float:
+        return sum(entry.duration for entry in self.entries)
+
+
+@dataclasses.dataclass(slots=True, kw_only=True)
+class EagerInitEntry:
+    type_: type[object]
+    duration: float
+
+
+@dataclasses.dataclass(slots=True, kw_only=True)
+class EagerInitReport:
+    entries: list[EagerInitEntry]
+    duration: float
+
+
+def _has_free_type_vars(type_: object) -> bool:
+    return isinstance(type_, typing.TypeVar) or bool(
+        getattr(type_, "__parameters__", ())
+    )
 
 
 class Registry:
@@ -118,25 +302,219 @@ class Registry:
     ) -> None:
         self.scopes = scopes
         self.extensions = extensions
-        self.providers: dict[type[Any], list[ProviderRecord[Any]]] = (
+        self._providers: dict[type[Any], list[ProviderRecord[Any]]] = (
             collections.defaultdict(list)
         )
+        # Providers registered with `LazyRegistrationExtension`,
+        # keyed by their interface, extracted when it's first needed
+        self._pending: dict[object, list[Scoped[Any]]] = {}
         self.type_context: Final[dict[str, type[object]]] = {}
+        # Providers with a dependency on each type
+        self.provider_dependants: Final[
+            dict[object, list[ProviderRecord[Any]]]
+        ] = collections.defaultdict(list)
         self.compilation_cache: Final[
             dict[RegistryCacheKey, CompiledFn[Any]]
         ] = {}
+        self.cache_slots: Final[dict[BaseScope, dict[Any, int]]] = {}
+        # Factories can be compiled concurrently by sync containers
+        self._slots_lock = threading.Lock()
+        self.provider_cells: Final[dict[object, ProviderCell]] = {}
+        # Keyed by `id` of provider records, which are kept alive
+        # by their metrics
+        self.provider_metrics: Final[dict[int, ProviderMetrics]] = {}
+        # Resolved nodes are reused between compilations
+        self.node_cache: Final[dict[NodeKey, AnyNode]] = {}
+        self.shared_nodes: Final[set[AnyNode]] = set()
+        # Number of compiled factories each node is used by
+        self.node_uses: Final[collections.Counter[AnyNode]] = (
+            collections.Counter()
+        )
+        self.subgraph_cache: Final[
+            dict[tuple[AnyNode, bool], CompiledFn[Any]]
+        ] = {}
+        # Keys of compiled factories including each type,
+        # used to invalidate them
+        self.dependants: Final[dict[object, set[RegistryCacheKey]]] = (
+            collections.defaultdict(set)
+        )
+        self.subgraph_dependants: Final[
+            dict[object, set[tuple[AnyNode, bool]]]
+        ] = collections.defaultdict(set)
+        self._subgraph_types: dict[tuple[AnyNode, bool], set[object]] = {}
+        # Factories loaded from the persistent cache, types
+        # they include aren't known
+        self._unindexed: set[RegistryCacheKey] = set()
+        self.namespace: Final = base_namespace(self)
+        self.sources: Final = (
+            SourceCache(
+                mode=extensions.source_registration.mode,
+                maxsize=extensions.source_registration.maxsize,
+            )
+            if extensions.source_registration
+            else SourceCache()
+        )
+        self.persistent_cache = (
+            PersistentCache(Path(extensions.compilation_cache.directory))
+            if extensions.compilation_cache
+            else None
+        )
 
         self._type_resolver = TypeResolver(
             tuple(
                 itertools.chain.from_iterable(
                     ext.sources for ext in self.extensions.source_extensions
                 )
-            )
+            ),
+            manifest=self.extensions.manifest,
         )
 
-    def register(self, *providers: Provider[Any]) -> None:
-        for provider in providers:
-            self._register_one(provider)
+    @property
+    def providers(self) -> dict[type[Any], list[ProviderRecord[Any]]]:
+        """
+        Every registered provider. This extracts all pending providers of
+        `LazyRegistrationExtension`, internals only extract ones they need.
+        """
+        self._extract_all()
+        return self._providers
+
+    def interface_providers(
+        self, interface: object
+    ) -> list[ProviderRecord[Any]] | None:
+        self._extract(interface)
+        return self._providers.get(interface)  # type: ignore[call-overload]
+
+    def set_interface_providers(
+        self, interface: object, providers: list[ProviderRecord[Any]]
+    ) -> None:
+        self._extract(interface)
+        self._providers[interface] = providers  # type: ignore[index]
+
+    def registrations(self) -> Iterator[tuple[object, Provider[Any]]]:
+        """Registered providers with their interfaces, without extracting pending ones."""
+        for interface, records in self._providers.items():
+            for record in records:
+                yield interface, record.provider
+        for key, pending in self._pending.items():
+            for provider in pending:
+                yield key, provider
+
+    def register(self, *providers: Provider[Any]) -> set[object]:
+        interfaces = [self._register_one(provider) for provider in providers]
+        if self.persistent_cache is not None:
+            self.persistent_cache.reset()
+        return self.invalidate(*interfaces)
+
+    def unregister(self, *providers: Provider[Any]) -> set[object]:
+        """Remove registered providers, compiled factories which include their types are discarded."""
+        interfaces = [self._unregister_one(provider) for provider in providers]
+        if self.persistent_cache is not None:
+            self.persistent_cache.reset()
+        return self.invalidate(*interfaces)
+
+    def invalidate(self, *types: object) -> set[object]:
+        """
+        Discard compiled factories which include any of given types,
+        returns given types together with types depending on them.
+        """
+        keys = set(self._unindexed)
+        self._unindexed.clear()
+        subgraph_keys: set[tuple[AnyNode, bool]] = set()
+        for type_ in types:
+            keys.update(self.dependants.pop(type_, ()))
+            subgraph_keys.update(self.subgraph_dependants.pop(type_, ()))
+
+        for key in keys:
+            if key in self.compilation_cache:
+                self.evict(key)
+        for subgraph_key in subgraph_keys:
+            if fn := self.subgraph_cache.pop(subgraph_key, None):
+                self.sources.release(fn)
+                del self._subgraph_types[subgraph_key]
+
+        affected = self._affected_types(types)
+        self._evict_nodes(affected)
+        return affected
+
+    def _evict_nodes(self, affected: set[object]) -> None:
+        """Discard resolved nodes of affected types."""
+        for key in [
+            key for key in self.node_cache if _includes(key[0], affected)
+        ]:
+            del self.node_cache[key]
+        # Providers of iterables are resolved for each compilation,
+        # so their nodes aren't in `node_cache`
+        for node in [
+            node
+            for node in self.node_uses
+            if _includes(node.type_, affected)
+            or (
+                isinstance(node, ProviderNode)
+                and _includes(node.provider.info.interface, affected)
+            )
+        ]:
+            del self.node_uses[node]
+            self.shared_nodes.discard(node)
+
+    def _affected_types(self, types: Sequence[object]) -> set[object]:
+        affected: set[object] = set()
+        stack = list(types)
+        # Dependencies on generic aliases (e.g. `Sequence[T]`) are found
+        # by their origin and arguments
+        generic = [
+            (type_, records)
+            for type_, records in self.provider_dependants.items()
+            if typing.get_origin(type_) is not None
+        ]
+        while stack:
+            type_ = stack.pop()
+            if type_ in affected:
+                continue
+            affected.add(type_)
+            if origin := typing.get_origin(type_):
+                stack.append(origin)
+
+            for record in itertools.chain(
+                self.provider_dependants.get(type_, ()),
+                *(
+                    records
+                    for dependency_type, records in generic
+                    if _includes(dependency_type, {type_})
+                ),
+            ):
+                stack.extend((record.info.interface, record.info.type_))
+        return affected
+
+    def add_dependant(self, record: ProviderRecord[Any]) -> None:
+        for dependency in record.info.dependencies:
+            self.provider_dependants[dependency.type_].append(record)
+
+    def remove_dependant(self, record: ProviderRecord[Any]) -> None:
+        for dependency in record.info.dependencies:
+            self.provider_dependants[dependency.type_] = [
+                dependant
+                for dependant in self.provider_dependants[dependency.type_]
+                if dependant is not record
+            ]
+
+    def evict(self, key: RegistryCacheKey) -> None:
+        self.sources.release(self.compilation_cache.pop(key))
+
+    def cache_slot(self, scope: BaseScope, type_: Any) -> int:
+        with self._slots_lock:
+            slots = self.cache_slots.setdefault(scope, {})
+            return slots.setdefault(type_, len(slots))
+
+    def provider_cell(self, interface: object) -> ProviderCell:
+        return self.provider_cells.setdefault(interface, ProviderCell())
+
+    def metrics(self, record: ProviderRecord[Any]) -> ProviderMetrics:
+        if (metrics := self.provider_metrics.get(id(record))) is None:
+            extension = self.extensions.resolution_metrics
+            metrics = self.provider_metrics[id(record)] = ProviderMetrics(
+                record, extension.buckets if extension else DEFAULT_BUCKETS
+            )
+        return metrics
 
     def find_provider_extension(
         self, provider: Provider[Any]
@@ -148,42 +526,130 @@ class Registry:
         err_msg = f"ProviderExtension for provider {provider!r} not found."
         raise ValueError(err_msg)
 
-    def _register_one(self, provider: Provider[T]) -> None:
+    def _register_one(self, provider: Provider[T]) -> object:
         ext = self.find_provider_extension(provider)
-        if ext.supports_provider(provider):
-            info: ProviderInfo[T] = ext.extract(
-                provider,
-                type_context=self.type_context,
-                type_resolver=self._type_resolver,
+        if (
+            self.extensions.lazy_registration
+            and isinstance(ext, ScopedProviderExtension)
+            and isinstance(provider, Scoped)
+            and (key := provider.interface or self._class_factory(provider))
+        ):
+            self._register_lazy(key, provider)
+            return key
+        return self._add_provider(provider, ext)
+
+    def _unregister_one(self, provider: Provider[Any]) -> object:
+        if (key := self._unregister_pending(provider)) is not None:
+            return key
+
+        for interface, records in self._providers.items():
+            record = next((r for r in records if r.provider is provider), None)
+            if record is None:
+                continue
+            records.remove(record)
+            if not records:
+                del self._providers[interface]
+            self.remove_dependant(record)
+            self.provider_metrics.pop(id(record), None)
+            return interface
+
+        msg = f"Provider {provider!r} is not registered"
+        raise ProviderNotFoundError(msg)
+
+    def _unregister_pending(self, provider: Provider[Any]) -> object | None:
+        for key, pending in self._pending.items():
+            if any(existing is provider for existing in pending):
+                pending[:] = [p for p in pending if p is not provider]
+                if not pending:
+                    del self._pending[key]
+                return key
+        return None
+
+    def _add_provider(
+        self, provider: Provider[T], ext: ProviderExtension[Any]
+    ) -> type[T]:
+        info: ProviderInfo[T] = ext.extract(
+            provider,
+            type_context=self.type_context,
+            type_resolver=self._type_resolver,
+        )
+        # Keep providers of the same interface in registration order
+        self._extract(info.interface)
+        if any(
+            provider.implementation
+            == existing_provider.provider.implementation
+            for existing_provider in self._providers.get(info.interface, [])
+        ):
+            msg = (
+                f"Provider for type {info.interface} with same "
+                f"implementation already registered"
             )
-            if any(
-                provider.implementation
-                == existing_provider.provider.implementation
-                for existing_provider in self.providers.get(info.interface, [])
-            ):
-                msg = (
-                    f"Provider for type {info.interface} with same "
-                    f"implementation already registered"
-                )
-                raise ValueError(msg)
+            raise ValueError(msg)
 
-            self.providers[info.interface].append(
-                ProviderRecord(
-                    provider=provider,
-                    info=info,
-                    ext=ext,
-                )
+        record = ProviderRecord(provider=provider, info=info, ext=ext)
+        self._providers[info.interface].append(record)
+        self.add_dependant(record)
+        if class_name := info.type_.__name__:
+            self.type_context[class_name] = get_generic_origin(info.type_)
+        return info.interface
+
+    def _class_factory(self, provider: Scoped[Any]) -> type[object] | None:
+        # Return type of other factories is only known from their annotations
+        source = next(
+            (
+                source
+                for source in self._type_resolver.sources
+                if source.accepts(provider.implementation)
+            ),
+            None,
+        )
+        if isinstance(source, ClassSource):
+            return typing.cast("type[object]", provider.implementation)
+        return None
+
+    def _register_lazy(self, key: object, provider: Scoped[Any]) -> None:
+        pending = self._pending.setdefault(key, [])
+        registered = [
+            record.provider
+            for record in self._providers.get(key, [])  # type: ignore[call-overload]
+        ]
+        if any(
+            provider.implementation == existing.implementation
+            for existing in (*registered, *pending)
+        ):
+            msg = (
+                f"Provider for type {key} with same "
+                f"implementation already registered"
+            )
+            raise ValueError(msg)
+
+        pending.append(provider)
+        # Class names are known upfront, so that forward references
+        # to them can be resolved by other providers
+        if class_ := self._class_factory(provider):
+            self.type_context[class_.__name__] = get_generic_origin(class_)
+
+    def _extract(self, key: object) -> None:
+        for provider in self._pending.pop(key, ()):
+            self._add_provider(
+                provider, self.find_provider_extension(provider)
             )
-            if class_name := info.type_.__name__:
-                self.type_context[class_name] = get_generic_origin(info.type_)
+
+    def _extract_all(self) -> None:
+        while self._pending:
+            self._extract(next(iter(self._pending)))
 
     def get_providers(self, type_: type[T]) -> Sequence[ProviderRecord[T]]:
-        if providers := self.providers.get(type_):
+        if self._pending:
+            self._extract(type_)
+            self._extract(typing.get_origin(type_))
+
+        if providers := self._providers.get(type_):
             return providers
 
         # Default to non-generic alias provider if there's one
         if (origin := typing.get_origin(type_)) and (
-            providers := self.providers.get(origin)
+            providers := self._providers.get(origin)
         ):
             return providers
 
@@ -217,21 +683,281 @@ class Registry:
     ) -> CompiledFn[T] | SyncCompiledFn[T]:
         key = (type_, is_async)
         if key not in self.compilation_cache:
-            nodes = list(resolve_dependencies(root_type=type_, registry=self))
-            nodes.reverse()
-            result = tuple(sort_nodes(nodes))
+            self.compilation_cache[key] = self._compile_key(key)
+        return self.compilation_cache[key]
 
-            self.compilation_cache[key] = compile_fn(
+    @typing.overload
+    def compile_many(
+        self,
+        types: tuple[type[object], ...],
+        *,
+        is_async: Literal[True],
+    ) -> CompiledFn[tuple[Any, ...]]: ...
+
+    @typing.overload
+    def compile_many(
+        self,
+        types: tuple[type[object], ...],
+        *,
+        is_async: Literal[False],
+    ) -> SyncCompiledFn[tuple[Any, ...]]: ...
+
+    def compile_many(
+        self,
+        types: tuple[type[object], ...],
+        *,
+        is_async: bool,
+    ) -> CompiledFn[tuple[Any, ...]] | SyncCompiledFn[tuple[Any, ...]]:
+        key = (types, is_async)
+        if key not in self.compilation_cache:
+            self.compilation_cache[key] = self._compile_key(key)
+        return self.compilation_cache[key]
+
+    def warmup(self, *, is_async: bool) -> WarmupReport:
+        entries = []
+        for type_ in self._warmup_types():
+            key = (type_, is_async)
+            if key in self.compilation_cache:
+                continue
+
+            start = time.perf_counter()
+            node_count = source_size = None
+            if (fn := self._load(key)) is None:
+                result = self._compile_and_store(key)
+                fn = result.fn
+                node_count, source_size = len(result.nodes), len(result.source)
+            duration = time.perf_counter() - start
+
+            self.compilation_cache[key] = fn
+            entries.append(
+                WarmupEntry(
+                    type_=type_,
+                    is_async=is_async,
+                    duration=duration,
+                    node_count=node_count,
+                    source_size=source_size,
+                )
+            )
+        return WarmupReport(entries=entries)
+
+    def eager_types(self) -> list[type[object]]:
+        root_scope = next_scope(self.scopes, None)
+        for key, pending in list(self._pending.items()):
+            if any(
+                isinstance(provider, Singleton)
+                and (
+                    provider.eager
+                    or self.extensions.eager_singletons is not None
+                )
+                for provider in pending
+            ):
+                self._extract(key)
+
+        types = []
+        for interface in self._providers:
+            provider = self.get_provider(interface)
+            if (
+                isinstance(provider.provider, Singleton)
+                and (
+                    provider.provider.eager
+                    or self.extensions.eager_singletons is not None
+                )
+                and provider.info.scope == root_scope
+                and not _has_free_type_vars(interface)
+            ):
+                types.append(interface)
+        return types
+
+    def _compile_key(self, key: RegistryCacheKey) -> CompiledFn[Any]:
+        if (fn := self._load(key)) is not None:
+            return fn
+        return self._compile_and_store(key).fn
+
+    def _load(self, key: RegistryCacheKey) -> CompiledFn[Any] | None:
+        if self.persistent_cache is not None and (
+            fn := self.persistent_cache.load(self, key)
+        ):
+            self._unindexed.add(key)
+            return fn
+        return None
+
+    def _compile_and_store(self, key: RegistryCacheKey) -> CompilationResult:
+        root, is_async = key
+        result = (
+            self._compile_many(root, is_async=is_async)
+            if isinstance(root, tuple)
+            else self._compile(root, is_async=is_async)
+        )
+        self._index(key, result.nodes, is_async=is_async)
+        if self.persistent_cache is not None:
+            self.persistent_cache.store(self, key, result)
+        return result
+
+    def _index(
+        self,
+        key: RegistryCacheKey,
+        nodes: Sequence[AnyNode],
+        *,
+        is_async: bool,
+    ) -> None:
+        for type_ in self._dependency_types(nodes, is_async=is_async):
+            self.dependants[type_].add(key)
+
+    def _dependency_types(
+        self, nodes: Sequence[AnyNode], *, is_async: bool
+    ) -> set[object]:
+        types: set[object] = set()
+        for node in nodes:
+            match node:
+                case ProviderNode():
+                    types.update((node.type_, node.provider.info.interface))
+                case IterableNode():
+                    types.update((node.type_, node.inner_type))
+                case FromContextNode():
+                    types.add(node.type_)
+                case SubgraphNode():
+                    types.update(self._subgraph_types[node.node, is_async])
+                case _:  # pragma: no cover
+                    typing.assert_never(node)  # type: ignore[unreachable]
+        # Generic aliases are also invalidated by their origin
+        types.update(
+            [origin for type_ in types if (origin := typing.get_origin(type_))]
+        )
+        return types
+
+    def _compile(self, type_: type[T], *, is_async: bool) -> CompilationResult:
+        nodes = list(
+            resolve_dependencies(
+                root_type=type_, registry=self, shared=self.shared_nodes
+            )
+        )
+        nodes.reverse()
+        self.node_uses.update(nodes)
+        result = self._sort_nodes(nodes, roots=(nodes[-1],))
+
+        return compile_fn(
+            CompilationParams(
+                root=result[-1],
+                nodes=result,
+                scopes=self.scopes,
+            ),
+            registry=self,
+            extensions=self.extensions,
+            is_async=is_async,
+        )
+
+    def _compile_many(
+        self, types: tuple[type[object], ...], *, is_async: bool
+    ) -> CompilationResult:
+        roots = []
+        nodes: dict[AnyNode, None] = {}
+        for index, type_ in enumerate(types):
+            root_name = make_dependency_name(type_)
+            # Repeated types get their own root node, so transient
+            # dependencies aren't shared between them
+            if type_ in types[:index]:
+                root_name = f"{root_name}_{index}"
+
+            type_nodes = list(
+                resolve_dependencies(
+                    root_type=type_,
+                    registry=self,
+                    root_name=root_name,
+                    shared=self.shared_nodes,
+                )
+            )
+            roots.append(type_nodes[0])
+            nodes.update(dict.fromkeys(reversed(type_nodes)))
+        self.node_uses.update(nodes.keys())
+
+        return compile_fn(
+            CompilationParams(
+                root=tuple(roots),
+                nodes=self._sort_nodes(list(nodes), roots=roots),
+                scopes=self.scopes,
+            ),
+            registry=self,
+            extensions=self.extensions,
+            is_async=is_async,
+        )
+
+    def compile_subgraph(
+        self, node: ProviderNode, *, is_async: bool
+    ) -> CompiledFn[Any]:
+        key = (node, is_async)
+        if key not in self.subgraph_cache:
+            nodes = list(
+                resolve_subgraph(node, registry=self, shared=self.shared_nodes)
+            )
+            nodes.reverse()
+            result = compile_fn(
                 CompilationParams(
-                    root=result[-1],
-                    nodes=result,
+                    root=node,
+                    nodes=self._sort_nodes(nodes, roots=(node,)),
                     scopes=self.scopes,
                 ),
                 registry=self,
                 extensions=self.extensions,
                 is_async=is_async,
             )
-        return self.compilation_cache[key]
+            self.subgraph_cache[key] = result.fn
+            self._subgraph_types[key] = self._dependency_types(
+                result.nodes, is_async=is_async
+            )
+            for type_ in self._subgraph_types[key]:
+                self.subgraph_dependants[type_].add(key)
+        return self.subgraph_cache[key]
+
+    def _sort_nodes(
+        self, nodes: Sequence[AnyNode], roots: Sequence[AnyNode]
+    ) -> tuple[AnyNode, ...]:
+        result = tuple(sort_nodes(nodes))
+        extension = self.extensions.shared_subgraphs
+        # Resources are closed in order of dependencies known to a factory
+        if extension is None or self.extensions.concurrent_shutdown:
+            return result
+        return share_subgraphs(
+            result,
+            roots=roots,
+            shared=self.shared_nodes,
+            uses=self.node_uses,
+            threshold=extension.threshold,
+        )
+
+    def _warmup_types(self) -> Iterator[type[object]]:
+        types: dict[type[object], None] = {}
+        for interface, providers in list(self.providers.items()):
+            dependencies = [
+                dependency.type_
+                for provider in providers
+                for dependency in provider.info.dependencies
+            ]
+            # Unbound generics can only be compiled once their parameters
+            # are known, e.g. when `Box[int]` is resolved.
+            if not _has_free_type_vars(interface) or not any(
+                _has_free_type_vars(dependency) for dependency in dependencies
+            ):
+                types[interface] = None
+
+            for dependency in dependencies:
+                if _has_free_type_vars(dependency):
+                    continue
+                if is_iterable_generic_collection(
+                    dependency
+                ) or is_generic_alias(dependency):
+                    types[dependency] = None
+        return iter(types)
+
+
+def _includes(type_: object, types: set[object]) -> bool:
+    return (
+        type_ in types
+        or typing.get_origin(type_) in types
+        or any(
+            isinstance(arg, Hashable) and arg in types
+            for arg in typing.get_args(type_)
+        )
+    )
 
 
 def _run_on_init_extensions(container: Container | SyncContainer) -> None:
@@ -240,6 +966,8 @@ def _run_on_init_extensions(container: Container | SyncContainer) -> None:
 
 
 class _BaseContainer:
+    _root: Context | SyncContext | None
+
     def __init__(
         self,
         extensions: Sequence[Extension],
@@ -255,7 +983,30 @@ class _BaseContainer:
         )
 
     def register(self, *providers: Provider[Any]) -> None:
-        self.registry.register(*providers)
+        self._evict_instances(self.registry.register(*providers))
+
+    def unregister(self, *providers: Provider[Any]) -> None:
+        self._evict_instances(self.registry.unregister(*providers))
+
+    def _evict_instances(self, types: set[object]) -> None:
+        """Discard instances of given types cached in the root context."""
+        if self._root is None:
+            return
+        root = self._root
+        for type_ in [
+            type_ for type_ in root.cache if _includes(type_, types)
+        ]:
+            del root.cache[type_]
+        slots = self.registry.cache_slots.get(root.scope, {})
+        for type_, slot in slots.items():
+            if slot < len(root.slots) and _includes(type_, types):
+                root.slots[slot] = EMPTY_SLOT
+
+    def metrics_snapshot(self) -> list[ProviderMetricsSnapshot]:
+        return [
+            metrics.snapshot()
+            for metrics in self.registry.provider_metrics.values()
+        ]
 
 
 class Container(_BaseContainer):
@@ -271,6 +1022,8 @@ class Container(_BaseContainer):
             scopes=scopes,
         )
         self._root: Context | None = None
+        self.eager_init_report: EagerInitReport | None = None
+        self.shutdown_report: ShutdownReport | None = None
         _run_on_init_extensions(self)
 
     def context(
@@ -278,27 +1031,58 @@ class Container(_BaseContainer):
     ) -> Context:
         return self.root.context(context=context)
 
+    def warmup(self) -> WarmupReport:
+        return self.registry.warmup(is_async=True)
+
+    async def init_eager(self) -> EagerInitReport:
+        start = time.perf_counter()
+        entries = []
+        if types := self.registry.eager_types():
+            entries = await gather(*map(self._resolve_timed, types))
+        return EagerInitReport(
+            entries=entries, duration=time.perf_counter() - start
+        )
+
+    async def _resolve_timed(self, type_: type[object]) -> EagerInitEntry:
+        start = time.perf_counter()
+        await self.root.resolve(type_)
+        return EagerInitEntry(
+            type_=type_, duration=time.perf_counter() - start
+        )
+
     @property
     def root(self) -> Context:
         if not self._root:
+            shutdown = self.extensions.concurrent_shutdown
             self._root = Context(
                 scope=next_scope(self.scopes, None),
                 context={},
                 container=self,
+                resources=ConcurrentExitStack(
+                    timeout=shutdown.timeout, offload=shutdown.offload
+                )
+                if shutdown
+                else None,
             )
         return self._root
 
     async def __aenter__(self) -> Self:
-        for extension in self.extensions.lifespan:
-            if isinstance(extension, LifespanExtension):
-                await self.root.exit_stack.enter_async_context(
-                    extension.lifespan(self)
-                )
-            if isinstance(extension, LifespanSyncExtension):
-                self.root.exit_stack.enter_context(
-                    extension.lifespan_sync(self)
-                )
+        try:
+            for extension in self.extensions.lifespan:
+                if isinstance(extension, LifespanExtension):
+                    await self.root.exit_stack.enter_async_context(
+                        extension.lifespan(self)
+                    )
+                if isinstance(extension, LifespanSyncExtension):
+                    self.root.exit_stack.enter_context(
+                        extension.lifespan_sync(self)
+                    )
 
+            self.eager_init_report = await self.init_eager()
+        except BaseException:
+            # Close whatever was entered before the failure
+            await self.__aexit__(*sys.exc_info())
+            raise
         return self
 
     async def __aexit__(
@@ -308,8 +1092,12 @@ class Container(_BaseContainer):
         exc_tb: TracebackType | None,
     ) -> None:
         if self._root:
-            await self._root.__aexit__(exc_type, exc_val, exc_tb)
-            self._root = None
+            root, self._root = self._root, None
+            try:
+                await root.__aexit__(exc_type, exc_val, exc_tb)
+            finally:
+                if root.resources is not None:
+                    self.shutdown_report = root.resources.report
 
 
 class SyncContainer(_BaseContainer):
@@ -325,12 +1113,20 @@ class SyncContainer(_BaseContainer):
             scopes=scopes,
         )
         self._root: SyncContext | None = None
+        self.eager_init_report: EagerInitReport | None = None
         _run_on_init_extensions(self)
 
     def __enter__(self) -> Self:
-        for extension in self.extensions.lifespan_sync:
-            self.root.exit_stack.enter_context(extension.lifespan_sync(self))
+        try:
+            for extension in self.extensions.lifespan_sync:
+                self.root.exit_stack.enter_context(
+                    extension.lifespan_sync(self)
+                )
 
+            self.eager_init_report = self.init_eager()
+        except BaseException:
+            self.__exit__(*sys.exc_info())
+            raise
         return self
 
     def __exit__(
@@ -343,6 +1139,29 @@ class SyncContainer(_BaseContainer):
             self._root.__exit__(exc_type, exc_val, exc_tb)
             self._root = None
 
+    def warmup(self) -> WarmupReport:
+        return self.registry.warmup(is_async=False)
+
+    def init_eager(self) -> EagerInitReport:
+        start = time.perf_counter()
+        entries = []
+        if types := self.registry.eager_types():
+            extension = self.extensions.eager_singletons
+            with ThreadPoolExecutor(
+                max_workers=extension.max_workers if extension else None,
+            ) as executor:
+                entries = list(executor.map(self._resolve_timed, types))
+        return EagerInitReport(
+            entries=entries, duration=time.perf_counter() - start
+        )
+
+    def _resolve_timed(self, type_: type[object]) -> EagerInitEntry:
+        start = time.perf_counter()
+        self.root.resolve(type_)
+        return EagerInitEntry(
+            type_=type_, duration=time.perf_counter() - start
+        )
+
     @property
     def root(self) -> SyncContext:
         if not self._root:
@@ -2,12 +2,14 @@ from __future__ import annotations
 
 import asyncio
 import contextlib
+import contextvars
 import dataclasses
 import threading
+import typing
 from collections.abc import Callable
 from contextlib import AbstractAsyncContextManager, AbstractContextManager
 from types import TracebackType
-from typing import TYPE_CHECKING, Final, Generic
+from typing import TYPE_CHECKING, Any, Final, Generic
 
 from typing_extensions import Self
 
@@ -18,11 +20,26 @@ if TYPE_CHECKING:
     from aioinject import Container, Provider, SyncContainer
     from aioinject.extensions import ProviderExtension
     from aioinject.extensions.providers import ProviderInfo
+    from aioinject.shutdown import ConcurrentExitStack
 
 from aioinject._types import ExecutionContext, T
 
 
-__all__ = ["Context", "ProviderRecord", "SyncContext"]
+__all__ = [
+    "EMPTY_SLOT",
+    "FLIGHT_ABORTED",
+    "CellOverride",
+    "Context",
+    "InFlight",
+    "ProviderCell",
+    "ProviderRecord",
+    "SyncContext",
+]
+
+EMPTY_SLOT: Final = object()
+# Returned to resolvers waiting for a construction which was cancelled
+FLIGHT_ABORTED: Final = object()
+_NOT_AWAITED: Final = object()
 
 
 @dataclasses.dataclass(slots=True, kw_only=True)
@@ -32,8 +49,120 @@ class ProviderRecord(Generic[T]):
     ext: ProviderExtension[Provider[T]]
 
 
-class Context:
+class CellOverride:
+    """
+    Override held by provider cells, `record` is used instead of the
+    registered provider, or if it's `None` the registered provider is used
+    without the shared cache.
+
+    Instances created while it's active are kept in `instances`,
+    so that they're created once per override.
+    """
+
+    __slots__ = ("instances", "record")
+
     def __init__(
+        self,
+        record: ProviderRecord[Any] | None = None,
+        instances: dict[type[object], object] | None = None,
+    ) -> None:
+        self.record = record
+        self.instances = instances if instances is not None else {}
+
+
+class ProviderCell:
+    """
+    Holds an override compiled factories use instead of the registered
+    provider, context-local overrides are stored in a context variable.
+    """
+
+    __slots__ = ("_local", "_local_overrides", "_override", "active", "record")
+
+    def __init__(self) -> None:
+        self.record: ProviderRecord[Any] | None = None
+        self._override: CellOverride | None = None
+        self._local: contextvars.ContextVar[CellOverride | None] = (
+            contextvars.ContextVar("aioinject_provider_cell", default=None)
+        )
+        self._local_overrides = 0
+        # Checked by compiled factories before anything else
+        self.active = False
+
+    def get(self) -> CellOverride | None:
+        if (override := self._local.get()) is not None:
+            return override
+        return self._override
+
+    def set(self, record: ProviderRecord[Any] | None) -> None:
+        self.record = record
+        self._override = CellOverride(record) if record is not None else None
+        self._update()
+
+    def set_local(
+        self, override: CellOverride
+    ) -> contextvars.Token[CellOverride | None]:
+        self._local_overrides += 1
+        self._update()
+        return self._local.set(override)
+
+    def reset_local(
+        self, token: contextvars.Token[CellOverride | None]
+    ) -> None:
+        self._local.reset(token)
+        self._local_overrides -= 1
+        self._update()
+
+    def _update(self) -> None:
+        self.active = self.record is not None or self._local_overrides > 0
+
+
+class InFlight:
+    """
+    Construction of a cached instance, concurrent resolvers
+    of the same type wait for it instead of creating their own.
+    Only errors are shared with them, if construction is cancelled
+    they get `FLIGHT_ABORTED`.
+    """
+
+    __slots__ = ("_event", "error", "instance")
+
+    def __init__(self) -> None:
+        self.instance: object = None
+        self.error: BaseException | None = None
+        self._event = asyncio.Event()
+
+    async def wait(self) -> object:
+        await self._event.wait()
+        if self.error is not None:
+            raise self.error
+        return self.instance
+
+    def finish(self, instance: object, error: BaseException | None) -> None:
+        if error is not None and not isinstance(error, Exception):
+            # Cancellation of the resolver constructing the instance
+            # shouldn't cancel others, they construct it again instead
+            instance, error = FLIGHT_ABORTED, None
+        self.instance = instance
+        self.error = error
+        self._event.set()
+
+
+class Context:
+    __slots__ = (
+        "_exit_stack",
+        "_flights",
+        "_lock_factory",
+        "_parent_context",
+        "_scopes",
+        "_type_locks",
+        "cache",
+        "container",
+        "resources",
+        "scope",
+        "slots",
+    )
+
+    def __init__(  # noqa: PLR0913
         self,
         scope: BaseScope,
         context: ExecutionContext,
@@ -42,19 +171,45 @@ class Context:
         lock_factory: Callable[
             [], AbstractAsyncContextManager[object]
         ] = asyncio.Lock,
+        *,
+        resources: ConcurrentExitStack | None = None,
     ) -> None:
         self.scope: Final = scope
         self.container: Final = container
 
-        self._context = context.copy()
-        self._context[scope] = self
+        self._parent_context = context
+        self._scopes: ExecutionContext | None = None
 
         self.cache: dict[type[object], object] = (
             cache if cache is not None else {}
         )
         self.cache[type(self)] = self
-        self.exit_stack = contextlib.AsyncExitStack()
-        self.lock = lock_factory()
+        # Unlike the scope mapping, slots hold this context's own
+        # instances, so they can't be shared with the parent context
+        self.slots: list[object] = [EMPTY_SLOT] * len(
+            container.registry.cache_slots.get(scope, ())
+        )
+        self.resources = resources
+        self._exit_stack: contextlib.AsyncExitStack | None = None
+        self._lock_factory = lock_factory
+        self._type_locks: (
+            dict[type[object], AbstractAsyncContextManager[object]] | None
+        ) = None
+        self._flights: dict[type[object], InFlight | object] | None = None
+
+    @property
+    def exit_stack(self) -> contextlib.AsyncExitStack:
+        if self._exit_stack is None:
+            self._exit_stack = contextlib.AsyncExitStack()
+        return self._exit_stack
+
+    @property
+    def _context(self) -> ExecutionContext:
+        # Parent scopes are shared until something is resolved
+        # in this context
+        if self._scopes is None:
+            self._scopes = {**self._parent_context, self.scope: self}
+        return self._scopes
 
     async def __aenter__(self) -> Self:
         return self
@@ -65,7 +220,48 @@ class Context:
         exc_val: BaseException | None,
         exc_tb: TracebackType | None,
     ) -> None:
-        await self.exit_stack.__aexit__(exc_type, exc_val, exc_tb)
+        try:
+            if self.resources is not None:
+                await self.resources.aclose(exc_type, exc_val, exc_tb)
+        finally:
+            if self._exit_stack is not None:
+                await self._exit_stack.__aexit__(exc_type, exc_val, exc_tb)
+
+    def type_lock(
+        self, type_: type[object]
+    ) -> AbstractAsyncContextManager[object]:
+        if self._type_locks is None:
+            self._type_locks = {}
+        if (lock := self._type_locks.get(type_)) is None:
+            lock = self._type_locks.setdefault(type_, self._lock_factory())
+        return lock
+
+    def start_flight(self, type_: type[object]) -> InFlight | None:
+        """
+        Returns construction of `type_` which is already in progress,
+        otherwise marks it as started and returns `None`.
+        """
+        if self._flights is None:
+            self._flights = {}
+        elif (flight := self._flights.get(type_)) is not None:
+            if flight is _NOT_AWAITED:
+                flight = self._flights[type_] = InFlight()
+            return typing.cast("InFlight", flight)
+        # Nothing is allocated unless another resolver has to wait
+        self._flights[type_] = _NOT_AWAITED
+        return None
+
+    def finish_flight(
+        self,
+        type_: type[object],
+        instance: object = None,
+        error: BaseException | None = None,
+    ) -> None:
+        if (
+            self._flights is not None
+            and (flight := self._flights.pop(type_)) is not _NOT_AWAITED
+        ):
+            typing.cast("InFlight", flight).finish(instance, error)
 
     async def resolve(self, /, type_: type[T]) -> T:
         return await self.container.registry.compile(type_, is_async=True)(
@@ -73,6 +269,13 @@ class Context:
             self.scope,
         )
 
+    async def resolve_many(
+        self, /, types: tuple[type[object], ...]
+    ) -> tuple[Any, ...]:
+        return await self.container.registry.compile_many(
+            types, is_async=True
+        )(self._context, self.scope)
+
     def context(
         self,
         context: dict[type[object], object] | None = None,
@@ -93,6 +296,18 @@ class Context:
 
 
 class SyncContext:
+    __slots__ = (
+        "_lock_factory",
+        "_parent_context",
+        "_scopes",
+        "_type_locks",
+        "cache",
+        "container",
+        "exit_stack",
+        "scope",
+        "slots",
+    )
+
     def __init__(
         self,
         scope: BaseScope,
@@ -106,15 +321,31 @@ class SyncContext:
         self.scope: Final = scope
         self.container: Final = container
 
-        self._context = context.copy()
-        self._context[scope] = self
+        self._parent_context = context
+        self._scopes: ExecutionContext | None = None
 
         self.cache: dict[type[object], object] = (
             cache if cache is not None else {}
         )
         self.cache[type(self)] = self
+        # Unlike the scope mapping, slots hold this context's own
+        # instances, so they can't be shared with the parent context
+        self.slots: list[object] = [EMPTY_SLOT] * len(
+            container.registry.cache_slots.get(scope, ())
+        )
+        # Created eagerly, so that threads resolving from the same context
+        # can't install different exit stacks or lock dicts
         self.exit_stack = contextlib.ExitStack()
-        self.lock = lock_factory()
+        self._lock_factory = lock_factory
+        self._type_locks: dict[
+            type[object], AbstractContextManager[object]
+        ] = {}
+
+    @property
+    def _context(self) -> ExecutionContext:
+        if self._scopes is None:
+            self._scopes = {**self._parent_context, self.scope: self}
+        return self._scopes
 
     def __enter__(self) -> Self:
         return self
@@ -127,12 +358,24 @@ class SyncContext:
     ) -> None:
         self.exit_stack.__exit__(exc_type, exc_val, exc_tb)
 
+    def type_lock(self, type_: type[object]) -> AbstractContextManager[object]:
+        if (lock := self._type_locks.get(type_)) is None:
+            lock = self._type_locks.setdefault(type_, self._lock_factory())
+        return lock
+
     def resolve(self, /, type_: type[T]) -> T:
         return self.container.registry.compile(type_, is_async=False)(
             self._context,
             self.scope,
         )
 
+    def resolve_many(
+        self, /, types: tuple[type[object], ...]
+    ) -> tuple[Any, ...]:
+        return self.container.registry.compile_many(types, is_async=False)(
+            self._context, self.scope
+        )
+
     def context(
         self,
         context: dict[type[object], object] | None = None,
@@ -146,28 +146,54 @@ class ContextParameter:
 
 
 ContextGetter = Callable[[tuple[Any, ...], dict[str, Any]], T]
+AsyncInjector = Callable[[Context, dict[str, Any]], Awaitable[None]]
+SyncInjector = Callable[[SyncContext, dict[str, Any]], None]
 
 
-def _add_context(
-    context: Context | SyncContext,
+def _create_async_injector(
     context_parameters: Sequence[ContextParameter],
-    kwargs: dict[str, object],
-) -> None:
-    context.add_context(
-        {
-            parameter.type_: kwargs.pop(parameter.name)
-            if parameter.remove
-            else kwargs[parameter.name]
-            for parameter in context_parameters
-        }
-    )
+    dependencies: Sequence[Dependency[object]],
+) -> AsyncInjector:
+    parameters = tuple((p.type_, p.name, p.remove) for p in context_parameters)
+    names = tuple(dependency.name for dependency in dependencies)
+    types = tuple(dependency.type_ for dependency in dependencies)
+
+    async def inject(context: Context, kwargs: dict[str, Any]) -> None:
+        cache = context.cache
+        for type_, name, remove in parameters:
+            cache[type_] = kwargs.pop(name) if remove else kwargs[name]
+
+        if types:
+            kwargs.update(
+                zip(names, await context.resolve_many(types), strict=True)
+            )
+
+    return inject
+
+
+def _create_sync_injector(
+    context_parameters: Sequence[ContextParameter],
+    dependencies: Sequence[Dependency[object]],
+) -> SyncInjector:
+    parameters = tuple((p.type_, p.name, p.remove) for p in context_parameters)
+    names = tuple(dependency.name for dependency in dependencies)
+    types = tuple(dependency.type_ for dependency in dependencies)
+
+    def inject(context: SyncContext, kwargs: dict[str, Any]) -> None:
+        cache = context.cache
+        for type_, name, remove in parameters:
+            cache[type_] = kwargs.pop(name) if remove else kwargs[name]
+
+        if types:
+            kwargs.update(zip(names, context.resolve_many(types), strict=True))
+
+    return inject
 
 
 def _async_wrapper_factory(
     function: Callable[P, Awaitable[T]],
-    context_parameters: Sequence[ContextParameter],
     context_getter: ContextGetter[Context],
-    dependencies: Sequence[Dependency[object]],
+    inject: AsyncInjector,
     *,
     enter_context: bool,
 ) -> Callable[P, Awaitable[T]]:
@@ -176,12 +202,7 @@ def _async_wrapper_factory(
         async with (
             nullcontext(context) if not enter_context else context.context()
         ) as context:
-            _add_context(context, context_parameters, kwargs)
-
-            for dependency in dependencies:
-                kwargs[dependency.name] = await context.resolve(
-                    dependency.type_
-                )
+            await inject(context, kwargs)
             return await function(*args, **kwargs)
 
     return wrapper
@@ -189,9 +210,8 @@ def _async_wrapper_factory(
 
 def _async_generator_wrapper_factory(
     function: Callable[P, AsyncIterator[T]],
-    context_parameters: Sequence[ContextParameter],
     context_getter: ContextGetter[Context],
-    dependencies: Sequence[Dependency[object]],
+    inject: AsyncInjector,
     *,
     enter_context: bool,
 ) -> Callable[P, AsyncIterator[T]]:
@@ -203,12 +223,7 @@ def _async_generator_wrapper_factory(
         async with (
             nullcontext(context) if not enter_context else context.context()
         ) as context:
-            _add_context(context, context_parameters, kwargs)
-
-            for dependency in dependencies:
-                kwargs[dependency.name] = await context.resolve(
-                    dependency.type_
-                )
+            await inject(context, kwargs)
             async for result in function(*args, **kwargs):
                 yield result
 
@@ -217,9 +232,8 @@ def _async_generator_wrapper_factory(
 
 def _sync_wrapper_factory(
     function: Callable[P, Awaitable[T]],
-    context_parameters: Sequence[ContextParameter],
     context_getter: ContextGetter[SyncContext],
-    dependencies: Sequence[Dependency[object]],
+    inject: SyncInjector,
     *,
     enter_context: bool,
 ) -> Callable[P, object]:
@@ -228,10 +242,7 @@ def _sync_wrapper_factory(
         with (
             nullcontext(context) if not enter_context else context.context()
         ) as context:
-            _add_context(context, context_parameters, kwargs)
-
-            for dependency in dependencies:
-                kwargs[dependency.name] = context.resolve(dependency.type_)
+            inject(context, kwargs)
             return function(*args, **kwargs)
 
     return wrapper
@@ -239,9 +250,8 @@ def _sync_wrapper_factory(
 
 def _sync_generator_wrapper_factory(
     function: Callable[P, Iterator[T]],
-    context_parameters: Sequence[ContextParameter],
     context_getter: ContextGetter[SyncContext],
-    dependencies: Sequence[Dependency[object]],
+    inject: SyncInjector,
     *,
     enter_context: bool,
 ) -> Callable[P, Iterator[T]]:
@@ -250,11 +260,7 @@ def _sync_generator_wrapper_factory(
         with (
             nullcontext(context) if not enter_context else context.context()
         ) as context:
-            _add_context(context, context_parameters, kwargs)
-
-            for dependency in dependencies:
-                kwargs[dependency.name] = context.resolve(dependency.type_)
-
+            inject(context, kwargs)
             yield from function(*args, **kwargs)
 
     return wrapper
@@ -293,13 +299,15 @@ def base_inject(
         function
     ) or inspect.isasyncgenfunction(function)
 
+    create_injector = (
+        _create_async_injector if is_async else _create_sync_injector
+    )
     wrapper = _WRAPPERS[  # type: ignore[operator]
         WrapperCacheKey(is_async=is_async, is_generator=is_generator)
     ](
         function=function,
-        context_parameters=context_parameters,
         enter_context=enter_context,
-        dependencies=dependencies,
+        inject=create_injector(context_parameters, dependencies),
         context_getter=context_getter,
     )
     wrapper = functools.update_wrapper(wrapper=wrapper, wrapped=function)
@@ -1,24 +1,54 @@
 from aioinject.extensions._abc import (
+    BlockingDetectorExtension,
+    BlockingFactoriesExtension,
+    BlockingReport,
+    CompilationCacheExtension,
+    CompilationFingerprintExtension,
+    ConcurrentResolutionExtension,
+    ConcurrentShutdownExtension,
+    EagerSingletonsExtension,
     Extension,
+    LazyRegistrationExtension,
     LifespanExtension,
     LifespanSyncExtension,
     OnInitExtension,
     OnResolveContextExtension,
     OnResolveExtension,
     OnResolveSyncExtension,
+    ProviderCellsExtension,
     ProviderExtension,
+    RegistrationManifestExtension,
+    ResolutionMetricsExtension,
+    SharedSubgraphsExtension,
+    SlotCacheExtension,
+    SourceRegistrationExtension,
     TypeSourcesExtension,
 )
 
 
 __all__ = [
+    "BlockingDetectorExtension",
+    "BlockingFactoriesExtension",
+    "BlockingReport",
+    "CompilationCacheExtension",
+    "CompilationFingerprintExtension",
+    "ConcurrentResolutionExtension",
+    "ConcurrentShutdownExtension",
+    "EagerSingletonsExtension",
     "Extension",
+    "LazyRegistrationExtension",
     "LifespanExtension",
     "LifespanSyncExtension",
     "OnInitExtension",
     "OnResolveContextExtension",
     "OnResolveExtension",
     "OnResolveSyncExtension",
+    "ProviderCellsExtension",
     "ProviderExtension",
+    "RegistrationManifestExtension",
+    "ResolutionMetricsExtension",
+    "SharedSubgraphsExtension",
+    "SlotCacheExtension",
+    "SourceRegistrationExtension",
     "TypeSourcesExtension",
 ]
@@ -1,30 +1,50 @@
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import contextvars
+import dataclasses
+import functools
+import logging
+import os
+import random
+import time
+import types
 import typing
-from collections.abc import Mapping, Sequence
+from collections.abc import Callable, Iterator, Mapping, Sequence
 from contextlib import AbstractAsyncContextManager, AbstractContextManager
+from pathlib import Path
 from typing import (
     TYPE_CHECKING,
     Any,
+    Literal,
     Protocol,
     TypeVar,
     runtime_checkable,
 )
 
-from aioinject._internal.type_sources import (
-    ReturnTypeSource,
-    TypeResolver,
-)
+from aioinject._internal.manifest import Manifest
+from aioinject.metrics import DEFAULT_BUCKETS
 
 
 if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
     from aioinject import Container, Context, SyncContainer, SyncContext
+    from aioinject._compilation.sources import SourceRegistrationMode
+    from aioinject._internal.type_sources import (
+        ReturnTypeSource,
+        TypeResolver,
+    )
     from aioinject.context import ProviderRecord
     from aioinject.extensions.providers import ProviderInfo
+    from aioinject.scope import BaseScope
 from aioinject._types import T
 from aioinject.providers import Provider
 
 
+_logger = logging.getLogger(__name__)
+
 _TProvider_contra = TypeVar(
     "_TProvider_contra", bound=Provider[Any], contravariant=True
 )
@@ -54,6 +74,13 @@ class OnInitExtension(Protocol):
     ) -> None: ...
 
 
+@runtime_checkable
+class CompilationFingerprintExtension(Protocol):
+    # Settings code of compiled factories depends on, factories stored by
+    # `CompilationCacheExtension` are only reused while it doesn't change
+    def fingerprint(self) -> object: ...
+
+
 @typing.runtime_checkable
 class ProviderExtension(Protocol[_TProvider_contra]):
     def supports_provider(self, provider: _TProvider_contra) -> bool: ...
@@ -106,6 +133,205 @@ class TypeSourcesExtension:
         self.sources = return_type_sources
 
 
+class ConcurrentResolutionExtension:
+    """Construct independent async dependencies concurrently, requires asyncio."""
+
+
+class EagerSingletonsExtension:
+    """Create all singletons when container is entered, not just ones marked as `eager`."""
+
+    def __init__(self, *, max_workers: int | None = None) -> None:
+        self.max_workers = max_workers
+
+
+class ConcurrentShutdownExtension:
+    """
+    Close independent lifetime scoped context managers concurrently, requires asyncio.
+
+    Sync context managers are closed on the event loop thread, unless
+    `offload=True` is passed, then they're closed in threads.
+    """
+
+    def __init__(
+        self, *, timeout: float | None = None, offload: bool = False
+    ) -> None:
+        self.timeout = timeout
+        self.offload = offload
+
+
+class CompilationCacheExtension:
+    """Store compiled factories in a directory, to reuse them between processes."""
+
+    def __init__(self, directory: str | os.PathLike[str]) -> None:
+        self.directory = directory
+
+
+class RegistrationManifestExtension:
+    """Store dependencies and return types of factories in a file, to skip inspecting their annotations on the next start."""
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        self.manifest = Manifest(Path(path))
+
+    @contextlib.contextmanager
+    def lifespan_sync(
+        self,
+        container: Container | SyncContainer,  # noqa: ARG002
+    ) -> Iterator[None]:
+        self.manifest.save()
+        try:
+            yield
+        finally:
+            self.manifest.save()
+
+
+class SlotCacheExtension:
+    """Store cached instances in lists indexed by slots assigned at compile time, instead of dicts keyed by type."""
+
+
+class SharedSubgraphsExtension:
+    """Resolve dependencies with more than `threshold` nodes in their subgraph by separate factories shared between compiled ones."""
+
+    def __init__(self, *, threshold: int = 30) -> None:
+        self.threshold = threshold
+
+    def fingerprint(self) -> object:
+        return self.threshold
+
+
+class LazyRegistrationExtension:
+    """Defer extraction of providers with a known interface until their type is needed."""
+
+
+class ProviderCellsExtension:
+    """Make compiled factories read `TestContainer` overrides of providers from mutable cells, so that they aren't recompiled."""
+
+
+class SourceRegistrationExtension:
+    """Configure how sources of compiled factories are registered in `linecache`, keeping at most `maxsize` of them."""
+
+    def __init__(
+        self,
+        *,
+        mode: SourceRegistrationMode = "eager",
+        maxsize: int | None = None,
+    ) -> None:
+        self.mode = mode
+        self.maxsize = maxsize
+
+
+class BlockingFactoriesExtension:
+    """
+    Run sync factories of providers marked as `blocking` (or all of them) in `executor` when resolved by `Container`,
+    and flag ones which block the event loop for longer than `threshold` seconds.
+    """
+
+    def __init__(
+        self,
+        *,
+        executor: Executor | None = None,
+        offload: Literal["marked", "all"] = "marked",
+        threshold: float | None = None,
+    ) -> None:
+        self.executor = executor
+        self.offload = offload
+        self.threshold = threshold
+        # Longest time each flagged provider blocked the event loop for
+        self.flagged: dict[Provider[Any], float] = {}
+
+    def fingerprint(self) -> object:
+        # Threshold itself is only read when factories are called
+        return self.offload, self.threshold is not None
+
+    async def run(
+        self, fn: Callable[..., T], /, *args: Any, **kwargs: Any
+    ) -> T:
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(
+            self.executor, functools.partial(context.run, fn, *args, **kwargs)
+        )
+
+    def flag(self, provider: ProviderRecord[Any], elapsed: float) -> None:
+        if provider.provider not in self.flagged:
+            _logger.warning(
+                "Factory of %r blocked the event loop for %.3fs, consider marking it as blocking",
+                provider.provider,
+                elapsed,
+            )
+        self.flagged[provider.provider] = max(
+            elapsed, self.flagged.get(provider.provider, 0)
+        )
+
+
+@dataclasses.dataclass(slots=True, kw_only=True, frozen=True)
+class BlockingReport:
+    provider: ProviderRecord[Any]
+    scope: BaseScope
+    # Name of the compiled factory, as shown in tracebacks
+    function: str
+    elapsed: float
+
+
+class BlockingDetectorExtension:
+    """
+    Time sync factories called on the event loop by `Container`,
+    reporting ones that take longer than `budget` seconds to `callback` or `logger`.
+    Only `sample_rate` of calls are timed.
+    """
+
+    def __init__(
+        self,
+        *,
+        budget: float,
+        callback: Callable[[BlockingReport], None] | None = None,
+        logger: logging.Logger | None = None,
+        sample_rate: float = 1.0,
+    ) -> None:
+        self.budget = budget
+        self.callback = callback
+        self.logger = logger if logger is not None else _logger
+        self.sample_rate = sample_rate
+
+    def start(self) -> float | None:
+        if self.sample_rate < 1 and random.random() >= self.sample_rate:  # noqa: S311
+            return None
+        return time.perf_counter()
+
+    def stop(
+        self,
+        provider: ProviderRecord[Any],
+        started_at: float,
+        factory: Callable[..., Any],
+    ) -> None:
+        if (elapsed := time.perf_counter() - started_at) <= self.budget:
+            return
+        report = BlockingReport(
+            provider=provider,
+            scope=provider.info.scope,
+            function=typing.cast(
+                "types.FunctionType", factory
+            ).__code__.co_filename,
+            elapsed=elapsed,
+        )
+        if self.callback is not None:
+            self.callback(report)
+        else:
+            self.logger.warning(
+                "Factory of %r blocked the event loop for %.3fs in %s (scope %s)",
+                report.provider.provider,
+                report.elapsed,
+                report.function,
+                report.scope,
+            )
+
+
+class ResolutionMetricsExtension:
+    """Count cache hits, misses and constructions of each provider and their latency in compiled factories, see `metrics_snapshot`."""
+
+    def __init__(self, *, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.buckets = buckets
+
+
 Extension = (
     ProviderExtension[Any]
     | OnInitExtension
@@ -115,4 +341,17 @@ Extension = (
     | OnResolveSyncExtension
     | OnResolveContextExtension
     | TypeSourcesExtension
+    | ConcurrentResolutionExtension
+    | EagerSingletonsExtension
+    | ConcurrentShutdownExtension
+    | SlotCacheExtension
+    | CompilationCacheExtension
+    | RegistrationManifestExtension
+    | LazyRegistrationExtension
+    | SharedSubgraphsExtension
+    | SourceRegistrationExtension
+    | ProviderCellsExtension
+    | BlockingFactoriesExtension
+    | BlockingDetectorExtension
+    | ResolutionMetricsExtension
 )
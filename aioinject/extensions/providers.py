@@ -25,6 +25,9 @@ class CacheDirective(CompilationDirective):
 class ResolveDirective(CompilationDirective):
     is_async: bool
     is_context_manager: bool
+    direct_call: bool = False
+    # `None` follows `BlockingFactoriesExtension.offload`
+    blocking: bool | None = None
 
 
 @dataclasses.dataclass(slots=True, kw_only=True)
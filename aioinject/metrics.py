@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import bisect
+import dataclasses
+import itertools
+from collections.abc import Sequence
+from typing import TYPE_CHECKING, Any, Final
+
+
+if TYPE_CHECKING:
+    from aioinject.context import ProviderRecord
+    from aioinject.scope import BaseScope
+
+
+__all__ = [
+    "DEFAULT_BUCKETS",
+    "ProviderMetrics",
+    "ProviderMetricsSnapshot",
+]
+
+# Upper bounds of construction latency buckets, in seconds
+DEFAULT_BUCKETS: Final = (
+    0.00001,
+    0.0001,
+    0.001,
+    0.005,
+    0.01,
+    0.05,
+    0.1,
+    0.5,
+    1.0,
+)
+
+
+@dataclasses.dataclass(slots=True, kw_only=True, frozen=True)
+class ProviderMetricsSnapshot:
+    provider: ProviderRecord[Any]
+    scope: BaseScope
+    hits: int
+    misses: int
+    creations: int
+    # Total construction time, in seconds
+    duration: float
+    # Cumulative number of constructions taking at most each bound,
+    # the last bound is infinity
+    buckets: tuple[tuple[float, int], ...]
+
+
+class ProviderMetrics:
+    """
+    Counters of a single provider, updated by compiled factories.
+
+    `misses` also counts resolvers which waited for a concurrent
+    construction, so it can be greater than `creations`.
+    """
+
+    __slots__ = (
+        "_bounds",
+        "buckets",
+        "creations",
+        "duration",
+        "hits",
+        "misses",
+        "provider",
+    )
+
+    def __init__(
+        self, provider: ProviderRecord[Any], bounds: Sequence[float]
+    ) -> None:
+        self.provider = provider
+        self._bounds = tuple(bounds)
+        self.hits = 0
+        self.misses = 0
+        self.creations = 0
+        self.duration = 0.0
+        self.buckets = [0] * (len(self._bounds) + 1)
+
+    def observe(self, elapsed: float) -> None:
+        self.creations += 1
+        self.duration += elapsed
+        self.buckets[bisect.bisect_left(self._bounds, elapsed)] += 1
+
+    def snapshot(self) -> ProviderMetricsSnapshot:
+        return ProviderMetricsSnapshot(
+            provider=self.provider,
+            scope=self.provider.info.scope,
+            hits=self.hits,
+            misses=self.misses,
+            creations=self.creations,
+            duration=self.duration,
+            buckets=tuple(
+                zip(
+                    (*self._bounds, float("inf")),
+                    itertools.accumulate(self.buckets),
+                    strict=True,
+                )
+            ),
+        )
@@ -63,6 +63,8 @@ class ObjectProviderExtension(ProviderExtension[Object[Any]]):
             scope=self.default_scope,
             compilation_directives=(
                 CacheDirective(),
-                ResolveDirective(is_async=False, is_context_manager=False),
+                ResolveDirective(
+                    is_async=False, is_context_manager=False, blocking=False
+                ),
             ),
         )
@@ -7,7 +7,6 @@ from typing import Any
 
 from aioinject._internal.type_sources import TypeResolver
 from aioinject._types import FactoryResult, FactoryType, T
-from aioinject.dependencies import collect_parameters
 from aioinject.errors import CannotDetermineReturnTypeError
 from aioinject.extensions import ProviderExtension
 from aioinject.extensions.providers import (
@@ -28,10 +27,13 @@ class Scoped(Provider[T]):
         factory: FactoryType[T],
         interface: type[T] | None = None,
         scope: BaseScope | None = None,
+        *,
+        blocking: bool | None = None,
     ) -> None:
         self.implementation = factory
         self.interface = interface
         self.scope = scope
+        self.blocking = blocking
 
     def provide(self, kwargs: Mapping[str, Any]) -> FactoryResult[T]:
         return self.implementation(**kwargs)
@@ -55,7 +57,22 @@ class Scoped(Provider[T]):
 
 
 class Singleton(Scoped[T]):
-    pass
+    def __init__(
+        self,
+        factory: FactoryType[T],
+        interface: type[T] | None = None,
+        scope: BaseScope | None = None,
+        *,
+        eager: bool = False,
+        blocking: bool | None = None,
+    ) -> None:
+        super().__init__(
+            factory=factory,
+            interface=interface,
+            scope=scope,
+            blocking=blocking,
+        )
+        self.eager = eager
 
 
 class Transient(Scoped[T]):
@@ -90,11 +107,8 @@ class ScopedProviderExtension(ProviderExtension[Scoped[Any]]):
             )
         )
 
-        dependencies = tuple(
-            collect_parameters(
-                dependant=provider.implementation,
-                type_context=type_context,
-            )
+        dependencies = type_resolver.parameters(
+            provider.implementation, type_context=type_context
         )
 
         try:
@@ -117,6 +131,8 @@ class ScopedProviderExtension(ProviderExtension[Scoped[Any]]):
                 ResolveDirective(
                     is_async=provider.is_async,
                     is_context_manager=provider.is_context_manager,
+                    direct_call=type(provider).provide is Scoped.provide,
+                    blocking=provider.blocking,
                 ),
                 LockDirective(is_enabled=isinstance(provider, Singleton)),
             ),
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import asyncio
+import collections
+import dataclasses
+import sys
+import time
+from collections.abc import Awaitable, Callable, Sequence
+from contextlib import AbstractAsyncContextManager, AbstractContextManager
+from types import TracebackType
+from typing import Any
+
+from aioinject._types import T
+
+
+if sys.version_info < (3, 11):  # pragma: no cover
+    from exceptiongroup import BaseExceptionGroup
+
+
+__all__ = ["ConcurrentExitStack", "ShutdownEntry", "ShutdownReport"]
+
+_ExitFn = Callable[
+    [type[BaseException] | None, BaseException | None, TracebackType | None],
+    Awaitable[object],
+]
+
+
+@dataclasses.dataclass(slots=True, kw_only=True)
+class ShutdownEntry:
+    type_: type[object]
+    duration: float
+    timed_out: bool
+
+
+@dataclasses.dataclass(slots=True, kw_only=True)
+class ShutdownReport:
+    entries: list[ShutdownEntry]
+    duration: float
+
+    @property
+    def timed_out(self) -> list[ShutdownEntry]:
+        return [entry for entry in self.entries if entry.timed_out]
+
+
+@dataclasses.dataclass(slots=True, kw_only=True)
+class _Resource:
+    type_: type[object]
+    exit: _ExitFn
+    dependencies: tuple[type[object], ...]
+
+
+class ConcurrentExitStack:
+    """
+    Closes entered context managers concurrently, closing each of them only
+    after all context managers depending on it are closed.
+
+    Sync context managers are closed on the event loop thread, because
+    some resources (e.g. sqlite3 connections) must be closed on the thread
+    which opened them. With `offload=True` they're closed in threads
+    instead, concurrently and subject to the timeout.
+    If several context managers fail, their errors are raised together
+    in a `BaseExceptionGroup`.
+    """
+
+    def __init__(
+        self, timeout: float | None = None, *, offload: bool = False
+    ) -> None:
+        self.timeout = timeout
+        self.offload = offload
+        self.report: ShutdownReport | None = None
+        self._resources: list[_Resource] = []
+
+    async def enter_async_context(
+        self,
+        type_: type[object],
+        cm: AbstractAsyncContextManager[T],
+        dependencies: tuple[type[object], ...] = (),
+    ) -> T:
+        result = await cm.__aenter__()
+        self._resources.append(
+            _Resource(
+                type_=type_, exit=cm.__aexit__, dependencies=dependencies
+            )
+        )
+        return result
+
+    def enter_context(
+        self,
+        type_: type[object],
+        cm: AbstractContextManager[T],
+        dependencies: tuple[type[object], ...] = (),
+    ) -> T:
+        result = cm.__enter__()
+
+        async def exit_(
+            exc_type: type[BaseException] | None,
+            exc_val: BaseException | None,
+            exc_tb: TracebackType | None,
+        ) -> object:
+            if not self.offload:
+                return cm.__exit__(exc_type, exc_val, exc_tb)
+            # Closed in a thread, so that it doesn't block the event loop
+            # and the timeout applies to it, though a timed out thread
+            # keeps running in the background
+            return await asyncio.to_thread(
+                cm.__exit__, exc_type, exc_val, exc_tb
+            )
+
+        self._resources.append(
+            _Resource(type_=type_, exit=exit_, dependencies=dependencies)
+        )
+        return result
+
+    async def aclose(  # noqa: C901
+        self,
+        exc_type: type[BaseException] | None = None,
+        exc_val: BaseException | None = None,
+        exc_tb: TracebackType | None = None,
+    ) -> ShutdownReport:
+        start = time.perf_counter()
+        resources, self._resources = self._resources, []
+
+        closed = [asyncio.Event() for _ in resources]
+        dependants: dict[type[object], list[int]] = collections.defaultdict(
+            list
+        )
+        for index, resource in enumerate(resources):
+            for dependency in resource.dependencies:
+                dependants[dependency].append(index)
+
+        async def close(index: int, resource: _Resource) -> ShutdownEntry:
+            for dependant in dependants[resource.type_]:
+                await closed[dependant].wait()
+
+            start = time.perf_counter()
+            try:
+                await asyncio.wait_for(
+                    resource.exit(exc_type, exc_val, exc_tb),
+                    timeout=self.timeout,
+                )
+            except asyncio.TimeoutError:
+                timed_out = True
+            else:
+                timed_out = False
+            finally:
+                closed[index].set()
+            return ShutdownEntry(
+                type_=resource.type_,
+                duration=time.perf_counter() - start,
+                timed_out=timed_out,
+            )
+
+        results: Sequence[Any] = await asyncio.gather(
+            *(
+                close(index, resource)
+                for index, resource in enumerate(resources)
+            ),
+            return_exceptions=True,
+        )
+        self.report = ShutdownReport(
+            entries=[r for r in results if isinstance(r, ShutdownEntry)],
+            duration=time.perf_counter() - start,
+        )
+        errors = [r for r in results if isinstance(r, BaseException)]
+        if len(errors) == 1:
+            raise errors[0]
+        if errors:
+            msg = "Errors while closing resources"
+            raise BaseExceptionGroup(msg, errors)
+        return self.report
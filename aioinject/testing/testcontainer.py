@@ -1,13 +1,21 @@
 from __future__ import annotations
 
 from collections.abc import Iterator
+from contextvars import Token
 from types import TracebackType
 from typing import TYPE_CHECKING, Any
 
 from typing_extensions import Self
 
-from aioinject.context import ProviderRecord
+from aioinject.context import (
+    EMPTY_SLOT,
+    CellOverride,
+    ProviderCell,
+    ProviderRecord,
+)
 from aioinject.extensions.providers import ProviderInfo
+from aioinject.providers.object import Object
+from aioinject.scope import next_scope
 
 
 if TYPE_CHECKING:
@@ -19,24 +27,19 @@ def _dependant_providers(
     registry: Registry, root: ProviderRecord[object]
 ) -> Iterator[ProviderRecord[object]]:
     stack = [root]
-    seen = []
+    seen = {id(root)}
     yield root
     while stack:
         provider = stack.pop()
-        for provider_group in registry.providers.values():
-            for dependant_provider in provider_group:
-                if dependant_provider in seen:
+        for type_ in {provider.info.interface, provider.info.type_}:
+            for dependant_provider in registry.provider_dependants.get(
+                type_, ()
+            ):
+                if id(dependant_provider) in seen:
                     continue
-                dependant_types = [
-                    dep.type_ for dep in dependant_provider.info.dependencies
-                ]
-                if (
-                    provider.info.interface in dependant_types
-                    or provider.info.type_ in dependant_types
-                ):
-                    yield dependant_provider
-                    stack.append(dependant_provider)
-                    seen.append(dependant_provider)
+                yield dependant_provider
+                stack.append(dependant_provider)
+                seen.add(id(dependant_provider))
 
 
 class _Override:
@@ -48,6 +51,7 @@ class _Override:
         self.provider = provider
         self.prev: list[ProviderRecord[Any]] | None = None
         self.prev_cache: dict[type[object], object] | None = None
+        self.prev_slots: list[object] | None = None
 
         self.extension = self.registry.find_provider_extension(self.provider)
         self.info: ProviderInfo[Any] = self.extension.extract(
@@ -55,6 +59,20 @@ class _Override:
             self.registry.type_context,
             self.registry._type_resolver,  # noqa: SLF001
         )
+        self.record = ProviderRecord(
+            provider=self.provider,
+            ext=self.extension,
+            info=self.info,
+        )
+        self.prev_record: ProviderRecord[Any] | None = None
+        self.cell: ProviderCell | None = None
+        registered = self.registry.interface_providers(self.info.interface)
+        if (
+            self.registry.extensions.provider_cells
+            and isinstance(self.provider, Object)
+            and len(registered or ()) == 1
+        ):
+            self.cell = self.registry.provider_cell(self.info.interface)
 
     async def __aenter__(self) -> Self:
         self._enter()
@@ -82,39 +100,123 @@ class _Override:
 
     def _enter(self) -> None:
         self.prev_cache = self.container.root.cache.copy()
-        self.prev = self.registry.providers.get(self.info.interface)
-        self._clear_provider(self.prev)
+        self.prev_slots = self.container.root.slots.copy()
+        self.prev = self.registry.interface_providers(self.info.interface)
+        if self.cell is not None:
+            # Compiled factories read the override from a cell
+            self.prev_record = self.cell.record
+            self._clear_instances(self.prev)
+            self.cell.set(self.record)
+            return
 
-        self.registry.providers[self.info.interface] = [
-            ProviderRecord(
-                provider=self.provider,
-                ext=self.extension,
-                info=self.info,
-            )
-        ]
+        self._clear_provider(self.prev)
+        self.registry.set_interface_providers(
+            self.info.interface, [self.record]
+        )
+        self.registry.add_dependant(self.record)
 
     def _exit(self) -> None:
-        self._clear_provider(self.registry.providers[self.info.interface])
-        if self.prev is not None:
-            self.registry.providers[self.info.interface] = self.prev
-
+        if self.cell is not None:
+            self._clear_instances(self.prev)
+            self.cell.set(self.prev_record)
+        else:
+            self._clear_provider(
+                self.registry.interface_providers(self.info.interface)
+            )
+            self.registry.remove_dependant(self.record)
+            if self.prev is not None:
+                self.registry.set_interface_providers(
+                    self.info.interface, self.prev
+                )
+        self._restore_instances()
+
+    def _restore_instances(self) -> None:
         if self.prev_cache is not None:
             new_cache = self.container.root.cache
             self.container.root.cache = self.prev_cache
             self.container.root.cache.update(new_cache)
 
+        if self.prev_slots is not None:
+            slots = self.container.root.slots
+            for index, instance in enumerate(self.prev_slots):
+                if slots[index] is EMPTY_SLOT:
+                    slots[index] = instance
+
     def _clear_provider(
         self, providers: list[ProviderRecord[object]] | None
     ) -> None:
         if not providers:
             return  # pragma: no cover
 
-        for provider in providers:
+        if self.registry.persistent_cache is not None:
+            self.registry.persistent_cache.reset()
+        self.registry.invalidate(*self._clear_instances(providers))
+
+    def _clear_instances(
+        self, providers: list[ProviderRecord[object]] | None
+    ) -> set[type[object]]:
+        types = {
+            typ
+            for provider in providers or ()
+            for dependant in _dependant_providers(self.registry, provider)
+            for typ in (dependant.info.type_, dependant.info.interface)
+        }
+        context = self.container.root
+        root_slots = self.registry.cache_slots.get(context.scope, {})
+        for typ in types:
+            context.cache.pop(typ, None)
+            if (slot := root_slots.get(typ)) is not None and slot < len(
+                context.slots
+            ):
+                context.slots[slot] = EMPTY_SLOT
+        return types
+
+
+class _LocalOverride(_Override):
+    def __init__(
+        self, container: Container | SyncContainer, provider: Provider[object]
+    ) -> None:
+        super().__init__(container, provider)
+        if self.cell is None:
+            msg = (
+                "Context-local overrides require ProviderCellsExtension, "
+                "an Object provider and a single registered provider "
+                f"for type {self.info.interface}"
+            )
+            raise ValueError(msg)
+        self.tokens: list[tuple[ProviderCell, Token[Any]]] = []
+
+    def _enter(self) -> None:
+        assert self.cell is not None  # noqa: S101
+        root_scope = next_scope(self.registry.scopes, None)
+        # Instances created while the override is active are cached in it
+        instances: dict[type[object], object] = {}
+        uncached = CellOverride(instances=instances)
+        for provider in (
+            self.registry.interface_providers(self.info.interface) or ()
+        ):
             for dependant in _dependant_providers(self.registry, provider):
-                for typ in (dependant.info.type_, dependant.info.interface):
-                    self.registry.compilation_cache.pop((typ, True), None)
-                    self.registry.compilation_cache.pop((typ, False), None)
-                    self.container.root.cache.pop(typ, None)
+                # Instances cached in the root context are shared
+                # with other contexts, so dependants are created again
+                if (
+                    dependant is not provider
+                    and dependant.info.scope == root_scope
+                ):
+                    cell = self.registry.provider_cell(
+                        dependant.info.interface
+                    )
+                    self.tokens.append((cell, cell.set_local(uncached)))
+        self.tokens.append(
+            (
+                self.cell,
+                self.cell.set_local(CellOverride(self.record, instances)),
+            )
+        )
+
+    def _exit(self) -> None:
+        while self.tokens:
+            cell, token = self.tokens.pop()
+            cell.reset_local(token)
 
 
 class TestContainer:
@@ -123,5 +225,9 @@ class TestContainer:
     def __init__(self, container: Container | SyncContainer) -> None:
         self.container = container
 
-    def override(self, provider: Provider[Any]) -> _Override:
+    def override(
+        self, provider: Provider[Any], *, local: bool = False
+    ) -> _Override:
+        if local:
+            return _LocalOverride(self.container, provider)
         return _Override(self.container, provider)
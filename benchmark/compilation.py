@@ -0,0 +1,129 @@
+"""
+Measures how long it takes to compile factories.
+
+Every node of a graph depends on the previous one and on a node halfway
+down the graph, so graphs are both deep and have shared dependencies.
+Use cases share the same infrastructure subgraph.
+Run with `python -m benchmark.compilation`.
+"""
+
+import time
+import tracemalloc
+from collections.abc import Mapping, Sequence
+from typing import Any
+
+import aioinject
+from aioinject import Scoped
+from aioinject.extensions import Extension, SharedSubgraphsExtension
+from benchmark.lib.format import time_to_ms
+
+
+SIZES = (10, 100, 500, 1_000, 2_500, 5_000)
+ROUNDS = 3
+USE_CASES = 500
+INFRASTRUCTURE_SIZE = 40
+
+
+def create_class(
+    name: str, dependencies: Mapping[str, type[Any]]
+) -> type[Any]:
+    init_source = (
+        f"def __init__(self, {', '.join(dependencies)}) -> None: pass"
+        if dependencies
+        else "def __init__(self) -> None: pass"
+    )
+    namespace: dict[str, Any] = {}
+    exec(init_source, {}, namespace)  # noqa: S102
+    namespace["__init__"].__annotations__.update(dependencies)
+    return type(name, (), namespace)
+
+
+def create_graph(size: int) -> list[type[Any]]:
+    classes: list[type[Any]] = []
+    for index in range(size):
+        dependencies = {
+            f"dep_{dependency}": classes[dependency]
+            for dependency in {index - 1, index // 2}
+            if 0 <= dependency < index
+        }
+        classes.append(create_class(f"Node{index}", dependencies))
+    return classes
+
+
+def bench_compile(size: int) -> float:
+    classes = create_graph(size)
+    durations = []
+    for _ in range(ROUNDS):
+        container = aioinject.Container()
+        # Register in reverse, so that dependencies come after dependants
+        container.register(*(Scoped(cls) for cls in reversed(classes)))
+
+        start = time.perf_counter()
+        container.registry.compile(classes[-1], is_async=True)
+        durations.append(time.perf_counter() - start)
+    return min(durations)
+
+
+def create_use_cases() -> list[type[Any]]:
+    infrastructure = create_graph(INFRASTRUCTURE_SIZE)
+    classes = list(infrastructure)
+    for index in range(USE_CASES):
+        service = create_class(
+            f"Service{index}", {"infrastructure": infrastructure[-1]}
+        )
+        use_case = create_class(f"UseCase{index}", {"service": service})
+        classes.extend((service, use_case))
+    return classes
+
+
+def compile_use_cases(
+    classes: Sequence[type[Any]], extensions: Sequence[Extension]
+) -> float:
+    container = aioinject.Container(extensions=extensions)
+    container.register(*(Scoped(cls) for cls in classes))
+    use_cases = [cls for cls in classes if cls.__name__.startswith("UseCase")]
+
+    start = time.perf_counter()
+    for use_case in use_cases:
+        container.registry.compile(use_case, is_async=True)
+    return time.perf_counter() - start
+
+
+def bench_use_cases(
+    classes: Sequence[type[Any]], extensions: Sequence[Extension]
+) -> tuple[float, int]:
+    duration = compile_use_cases(classes, extensions)
+
+    # Tracing slows compilation down, so memory is measured separately
+    tracemalloc.start()
+    compile_use_cases(classes, extensions)
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return duration, memory
+
+
+def main() -> None:
+    print("| Nodes | Compile time |")  # noqa: T201
+    print("|-------|--------------|")  # noqa: T201
+    for size in SIZES:
+        print(f"| {size} | {time_to_ms(bench_compile(size))} |")  # noqa: T201
+
+    classes = create_use_cases()
+    print()  # noqa: T201
+    print(  # noqa: T201
+        f"{USE_CASES} use cases sharing {INFRASTRUCTURE_SIZE} nodes"
+    )
+    print("| Extensions | Compile time | Memory |")  # noqa: T201
+    print("|------------|--------------|--------|")  # noqa: T201
+    for name, extensions in (
+        ("-", ()),
+        ("SharedSubgraphsExtension", (SharedSubgraphsExtension(),)),
+    ):
+        duration, memory = bench_use_cases(classes, extensions)
+        print(  # noqa: T201
+            f"| {name} | {time_to_ms(duration)} | {memory / 1024:.0f}KiB |"
+        )
+
+
+if __name__ == "__main__":
+    main()
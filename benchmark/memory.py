@@ -0,0 +1,52 @@
+"""
+Measures memory held by compiled factories, per compiled root type.
+
+Run with `python -m benchmark.memory`.
+"""
+
+import gc
+import tracemalloc
+
+import aioinject
+from aioinject import Scoped
+from benchmark.compilation import create_class
+
+
+REGISTERED_TYPES = (100, 1_000, 5_000)
+ROOTS = 200
+
+
+def bench_memory(registered_types: int) -> float:
+    classes = [
+        create_class(f"Type{index}", {}) for index in range(registered_types)
+    ]
+    roots = [
+        create_class(
+            f"Root{index}",
+            {"a": classes[index % len(classes)], "b": classes[index // 2]},
+        )
+        for index in range(ROOTS)
+    ]
+    container = aioinject.Container()
+    container.register(*(Scoped(cls) for cls in (*classes, *roots)))
+
+    gc.collect()
+    tracemalloc.start()
+    for root in roots:
+        container.registry.compile(root, is_async=True)
+    gc.collect()
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return memory / ROOTS
+
+
+def main() -> None:
+    print("| Registered types | Bytes per compiled root |")  # noqa: T201
+    print("|------------------|-------------------------|")  # noqa: T201
+    for registered_types in REGISTERED_TYPES:
+        memory = bench_memory(registered_types)
+        print(f"| {registered_types} | {memory:.0f} |")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
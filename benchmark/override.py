@@ -0,0 +1,52 @@
+"""
+Measures how long it takes to override a provider with `TestContainer.override`
+and resolve a type depending on it.
+
+Run with `python -m benchmark.override`.
+"""
+
+import time
+from collections.abc import Sequence
+
+import aioinject
+from aioinject import Object, Singleton
+from aioinject.extensions import Extension, ProviderCellsExtension
+from aioinject.testing import TestContainer
+from benchmark.compilation import create_graph
+from benchmark.lib.format import time_to_ms
+
+
+SIZES = (100, 500, 2_000)
+OVERRIDES = 100
+
+
+def bench_override(size: int, extensions: Sequence[Extension]) -> float:
+    classes = create_graph(size)
+    container = aioinject.SyncContainer(extensions=extensions)
+    container.register(*(Singleton(cls) for cls in classes))
+    testcontainer = TestContainer(container)
+
+    container.root.resolve(classes[-1])
+
+    overridden = classes[size // 2]
+    instance = object.__new__(overridden)
+    start = time.perf_counter()
+    for _ in range(OVERRIDES):
+        with testcontainer.override(Object(instance, overridden)):
+            container.root.resolve(classes[-1])
+    return (time.perf_counter() - start) / OVERRIDES
+
+
+def main() -> None:
+    print("| Providers | Override | With ProviderCellsExtension |")  # noqa: T201
+    print("|-----------|----------|-----------------------------|")  # noqa: T201
+    for size in SIZES:
+        durations = [
+            time_to_ms(bench_override(size, extensions))
+            for extensions in ((), (ProviderCellsExtension(),))
+        ]
+        print(f"| {size} | {' | '.join(durations)} |")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+import contextlib
+import dataclasses
+import threading
+from collections.abc import AsyncIterator, Iterator
+
+import anyio
+import pytest
+
+from aioinject import Container, Scoped, Singleton, SyncContainer
+from aioinject.extensions import EagerSingletonsExtension
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+class _A:
+    pass
+
+
+class _B:
+    pass
+
+
+@dataclasses.dataclass
+class _C:
+    a: _A
+
+
+async def test_eager_singleton_created_on_enter() -> None:
+    created: list[type[object]] = []
+
+    def create_a() -> _A:
+        created.append(_A)
+        return _A()
+
+    def create_b() -> _B:
+        created.append(_B)
+        return _B()
+
+    container = Container()
+    container.register(
+        Singleton(create_a, eager=True),
+        Singleton(create_b),
+        Scoped(_C),
+    )
+
+    async with container:
+        assert created == [_A]
+        assert container.eager_init_report is not None
+        assert [
+            entry.type_ for entry in container.eager_init_report.entries
+        ] == [_A]
+
+        await container.root.resolve(_A)
+        assert created == [_A]
+
+
+async def test_eager_singletons_extension() -> None:
+    b_created = anyio.Event()
+
+    async def create_a() -> _A:
+        await b_created.wait()
+        return _A()
+
+    async def create_b() -> _B:
+        b_created.set()
+        return _B()
+
+    container = Container(extensions=[EagerSingletonsExtension()])
+    container.register(
+        Singleton(create_a),
+        Singleton(create_b),
+        Singleton(_C),
+    )
+
+    with anyio.fail_after(1):
+        async with container:
+            report = container.eager_init_report
+            assert report is not None
+            assert {entry.type_ for entry in report.entries} == {_A, _B, _C}
+            assert report.duration >= max(e.duration for e in report.entries)
+
+            c = await container.root.resolve(_C)
+            assert c.a is await container.root.resolve(_A)
+
+
+def test_sync_eager_singletons_use_threads() -> None:
+    b_created = threading.Event()
+    a_calls = 0
+
+    def create_a() -> _A:
+        nonlocal a_calls
+        a_calls += 1
+        assert b_created.wait(timeout=1)
+        return _A()
+
+    def create_b() -> _B:
+        b_created.set()
+        return _B()
+
+    container = SyncContainer(
+        extensions=[EagerSingletonsExtension(max_workers=3)]
+    )
+    container.register(
+        Singleton(create_a),
+        Singleton(create_b),
+        Singleton(_C),
+    )
+
+    with container:
+        report = container.eager_init_report
+        assert report is not None
+        assert {entry.type_ for entry in report.entries} == {_A, _B, _C}
+        assert a_calls == 1
+
+    with container:
+        assert container.eager_init_report is not None
+        assert a_calls == 2  # noqa: PLR2004
+
+
+def test_sync_eager_resources_are_closed() -> None:
+    count = 16
+    barrier = threading.Barrier(count)
+    closed: list[type[object]] = []
+
+    def create_provider(type_: type[object]) -> Singleton[object]:
+        def factory() -> Iterator[object]:
+            # Resources are entered by all threads at the same time
+            barrier.wait(timeout=1)
+            yield type_()
+            closed.append(type_)
+
+        factory.__annotations__["return"] = Iterator[type_]  # type: ignore[valid-type]
+        return Singleton(contextlib.contextmanager(factory))
+
+    types = [type(f"_Resource{index}", (), {}) for index in range(count)]
+    container = SyncContainer(
+        extensions=[EagerSingletonsExtension(max_workers=count)]
+    )
+    container.register(*(create_provider(type_) for type_ in types))
+
+    with container:
+        report = container.eager_init_report
+        assert report is not None
+        assert len(report.entries) == count
+        assert closed == []
+    assert sorted(closed, key=types.index) == types
+
+
+def test_no_eager_singletons() -> None:
+    container = SyncContainer()
+    container.register(Singleton(_A))
+
+    with container:
+        assert container.eager_init_report is not None
+        assert container.eager_init_report.entries == []
+
+
+class _EagerInitError(Exception):
+    pass
+
+
+class _Lifespan:
+    def __init__(self) -> None:
+        self.exited = False
+
+    @contextlib.contextmanager
+    def lifespan_sync(
+        self,
+        container: Container | SyncContainer,  # noqa: ARG002
+    ) -> Iterator[None]:
+        try:
+            yield
+        finally:
+            self.exited = True
+
+
+async def test_entered_resources_are_closed_when_eager_init_fails() -> None:
+    closed: list[type[object]] = []
+
+    @contextlib.asynccontextmanager
+    async def create_a() -> AsyncIterator[_A]:
+        try:
+            yield _A()
+        finally:
+            closed.append(_A)
+
+    async def create_b() -> _B:
+        await anyio.sleep(0.01)
+        raise _EagerInitError
+
+    lifespan = _Lifespan()
+    container = Container(extensions=[lifespan])
+    container.register(
+        Singleton(create_a, eager=True), Singleton(create_b, eager=True)
+    )
+
+    with pytest.raises(_EagerInitError):
+        await container.__aenter__()
+
+    assert closed == [_A]
+    assert lifespan.exited
+    assert container._root is None  # noqa: SLF001
+
+
+def test_sync_entered_resources_are_closed_when_eager_init_fails() -> None:
+    closed: list[type[object]] = []
+
+    @contextlib.contextmanager
+    def create_a() -> Iterator[_A]:
+        try:
+            yield _A()
+        finally:
+            closed.append(_A)
+
+    def create_b(a: _A) -> _B:  # noqa: ARG001
+        raise _EagerInitError
+
+    lifespan = _Lifespan()
+    container = SyncContainer(extensions=[lifespan])
+    container.register(
+        Singleton(create_a, eager=True), Singleton(create_b, eager=True)
+    )
+
+    with pytest.raises(_EagerInitError):
+        container.__enter__()
+
+    assert closed == [_A]
+    assert lifespan.exited
+    assert container._root is None  # noqa: SLF001
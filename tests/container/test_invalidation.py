@@ -0,0 +1,219 @@
+import dataclasses
+from pathlib import Path
+from typing import Generic, TypeVar
+
+import pytest
+
+from aioinject import (
+    Container,
+    Object,
+    Scoped,
+    Singleton,
+    SyncContainer,
+    Transient,
+)
+from aioinject.errors import ProviderNotFoundError
+from aioinject.extensions import (
+    CompilationCacheExtension,
+    Extension,
+    LazyRegistrationExtension,
+    SharedSubgraphsExtension,
+    SlotCacheExtension,
+)
+
+
+T = TypeVar("T")
+
+
+class _Interface:
+    pass
+
+
+class _A(_Interface):
+    pass
+
+
+class _OtherA(_Interface):
+    pass
+
+
+@dataclasses.dataclass
+class _Service:
+    a: _Interface
+
+
+@dataclasses.dataclass
+class _UseCase:
+    service: _Service
+
+
+class _Unrelated:
+    pass
+
+
+@dataclasses.dataclass
+class _Box(Generic[T]):
+    value: T
+
+
+@dataclasses.dataclass
+class _Number:
+    value: int
+
+
+def _create_container(*extensions: Extension) -> SyncContainer:
+    container = SyncContainer(extensions=extensions)
+    container.register(
+        Scoped(_A, interface=_Interface),
+        Scoped(_Service),
+        Transient(_UseCase),
+        Scoped(_Unrelated),
+    )
+    return container
+
+
+@pytest.mark.parametrize("extensions", [(), (LazyRegistrationExtension(),)])
+def test_only_dependants_are_invalidated(
+    extensions: tuple[Extension, ...],
+) -> None:
+    container = _create_container(*extensions)
+    registry = container.registry
+    for type_ in (_Interface, _UseCase, _Unrelated):
+        registry.compile(type_, is_async=False)
+    registry.compile_many((_Unrelated, _Service), is_async=False)
+
+    container.register(Scoped(_OtherA, interface=_Interface))
+    assert set(registry.compilation_cache) == {(_Unrelated, False)}
+    with container.context() as ctx:
+        assert isinstance(ctx.resolve(_UseCase).service.a, _OtherA)
+
+
+def test_only_dependant_nodes_are_evicted() -> None:
+    container = _create_container()
+    registry = container.registry
+    registry.compile(_UseCase, is_async=False)
+    registry.compile(list[_Unrelated], is_async=False)
+
+    container.register(Scoped(_OtherA, interface=_Interface))
+    assert {key[0] for key in registry.node_cache} == {list[_Unrelated]}
+    assert {node.type_ for node in registry.node_uses} == {
+        list[_Unrelated],
+        _Unrelated,
+    }
+
+
+@pytest.mark.parametrize("extensions", [(), (LazyRegistrationExtension(),)])
+def test_unregister(extensions: tuple[Extension, ...]) -> None:
+    container = _create_container(*extensions)
+    registry = container.registry
+    other_a = Scoped(_OtherA, interface=_Interface)
+    container.register(other_a)
+    with container.context() as ctx:
+        assert isinstance(ctx.resolve(_UseCase).service.a, _OtherA)
+        ctx.resolve(_Unrelated)
+
+    container.unregister(other_a)
+    assert set(registry.compilation_cache) == {(_Unrelated, False)}
+    with container.context() as ctx:
+        assert isinstance(ctx.resolve(_UseCase).service.a, _A)
+
+    unrelated = registry.get_provider(_Unrelated).provider
+    container.unregister(unrelated)
+    assert _Unrelated not in registry.providers
+    with pytest.raises(ProviderNotFoundError):
+        container.unregister(unrelated)
+
+
+def test_unregister_pending() -> None:
+    container = SyncContainer(extensions=[LazyRegistrationExtension()])
+    provider = Scoped(_A)
+    container.register(provider, Scoped(_OtherA))
+    container.unregister(provider)
+    with pytest.raises(ProviderNotFoundError):
+        container.registry.get_provider(_A)
+    assert container.registry.get_provider(_OtherA)
+
+
+def test_unrelated_registration_keeps_factories() -> None:
+    container = _create_container()
+    registry = container.registry
+    registry.compile(_UseCase, is_async=False)
+    container.register(Object(1))
+    assert (_UseCase, False) in registry.compilation_cache
+
+
+def test_iterable() -> None:
+    container = _create_container()
+    with container.context() as ctx:
+        assert len(ctx.resolve(list[_Interface])) == 1
+
+    container.register(Scoped(_OtherA, interface=_Interface))
+    with container.context() as ctx:
+        assert len(ctx.resolve(list[_Interface])) == 2  # noqa: PLR2004
+
+
+def test_generic_alias_is_invalidated_by_origin() -> None:
+    container = SyncContainer()
+    container.register(Transient(_Box), Object(1))
+    with container.context() as ctx:
+        assert ctx.resolve(_Box[int]).value == 1
+
+    container.register(Object(_Box(2), _Box[int]))
+    with container.context() as ctx:
+        assert ctx.resolve(_Box[int]).value == 2  # noqa: PLR2004
+
+
+@pytest.mark.parametrize("extensions", [(), (SlotCacheExtension(),)])
+def test_cached_instances_are_evicted(
+    extensions: tuple[Extension, ...],
+) -> None:
+    container = SyncContainer(extensions=extensions)
+    container.register(Object(5), Singleton(_Number), Singleton(_Unrelated))
+    with container:
+        root = container.root
+        assert root.resolve(_Number).value == 5  # noqa: PLR2004
+        unrelated = root.resolve(_Unrelated)
+
+        later = Object(6)
+        container.register(later)
+        assert root.resolve(int) == 6  # noqa: PLR2004
+        assert root.resolve(_Number).value == 6  # noqa: PLR2004
+        assert root.resolve(_Unrelated) is unrelated
+
+        container.unregister(later)
+        assert root.resolve(_Number).value == 5  # noqa: PLR2004
+        assert root.resolve(_Unrelated) is unrelated
+
+
+def test_shared_subgraphs() -> None:
+    container = _create_container(SharedSubgraphsExtension(threshold=1))
+    registry = container.registry
+    registry.compile(_Service, is_async=False)
+    registry.compile(_UseCase, is_async=False)
+    assert registry.subgraph_cache
+
+    container.register(Object(1))
+    assert registry.subgraph_cache
+
+    container.register(Scoped(_OtherA, interface=_Interface))
+    assert not registry.subgraph_cache
+    assert not registry.compilation_cache
+
+
+async def test_persistent_cache(tmp_path: Path) -> None:
+    for _ in range(2):
+        container = Container(extensions=[CompilationCacheExtension(tmp_path)])
+        container.register(Scoped(_Unrelated))
+        container.registry.compile(_Unrelated, is_async=True)
+
+    # Types included by loaded factories aren't known
+    provider = Object(1)
+    container.register(provider)
+    assert not container.registry.compilation_cache
+
+    persistent_cache = container.registry.persistent_cache
+    assert persistent_cache is not None
+    container.registry.compile(_Unrelated, is_async=True)
+    assert persistent_cache._snapshot is not None  # noqa: SLF001
+    container.unregister(provider)
+    assert persistent_cache._snapshot is None  # noqa: SLF001
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import dataclasses
+from pathlib import Path
+from typing import Any, Generic, NoReturn, TypeVar
+
+import pytest
+from typing_extensions import TypeIs
+
+from aioinject import Container, Object, Scoped, Singleton, Transient
+from aioinject.extensions import (
+    CompilationCacheExtension,
+    LazyRegistrationExtension,
+    TypeSourcesExtension,
+)
+from aioinject.testing import TestContainer
+
+
+T = TypeVar("T")
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+class _Interface:
+    pass
+
+
+class _A(_Interface):
+    pass
+
+
+class _OtherA(_Interface):
+    pass
+
+
+@dataclasses.dataclass
+class _B:
+    a: _Interface
+    later: _Later
+
+
+@dataclasses.dataclass
+class _Box(Generic[T]):
+    value: T
+
+
+class _Later:
+    pass
+
+
+def _create_a() -> _Interface:
+    return _OtherA()
+
+
+def _create_container() -> Container:
+    return Container(extensions=[LazyRegistrationExtension()])
+
+
+def _pending(container: Container) -> dict[object, list[Scoped[Any]]]:
+    return container.registry._pending  # noqa: SLF001
+
+
+async def test_providers_are_extracted_when_needed() -> None:
+    container = _create_container()
+    container.register(
+        Scoped(_A, interface=_Interface),
+        Scoped(_B),
+        Singleton(_Later),
+        Object(1),
+    )
+    assert set(_pending(container)) == {_Interface, _B, _Later}
+
+    async with container, container.context() as ctx:
+        b = await ctx.resolve(_B)
+        assert isinstance(b.a, _A)
+        assert isinstance(b.later, _Later)
+        assert await ctx.resolve(int) == 1
+    assert not _pending(container)
+
+
+async def test_function_factories_are_extracted_eagerly() -> None:
+    container = _create_container()
+    container.register(Scoped(_create_a))
+    assert not _pending(container)
+    assert _Interface in container.registry.providers
+
+
+async def test_registration_order_is_kept() -> None:
+    container = _create_container()
+    container.register(
+        Scoped(_A, interface=_Interface),
+        Scoped(_create_a),
+    )
+    assert not _pending(container)
+
+    async with container.context() as ctx:
+        assert isinstance(await ctx.resolve(_Interface), _OtherA)
+        instances = await ctx.resolve(list[_Interface])
+        assert [type(obj) for obj in instances] == [_A, _OtherA]
+
+
+@pytest.mark.parametrize("extract", [True, False])
+async def test_same_implementation(*, extract: bool) -> None:
+    container = _create_container()
+    container.register(Scoped(_A, interface=_Interface))
+    if extract:
+        container.registry.get_provider(_Interface)
+
+    with pytest.raises(ValueError, match="same implementation"):
+        container.register(Transient(_A, interface=_Interface))
+
+
+async def test_generic_origin_is_extracted() -> None:
+    container = _create_container()
+    container.register(Transient(_Box))
+
+    records = container.registry.get_providers(_Box[int])
+    assert [record.provider.implementation for record in records] == [_Box]
+
+
+@pytest.mark.parametrize("eager", [True, False])
+async def test_eager_singletons(*, eager: bool) -> None:
+    container = _create_container()
+    container.register(Singleton(_A, eager=eager), Scoped(_Later))
+
+    async with container:
+        assert (_A in _pending(container)) is not eager
+        assert _Later in _pending(container)
+
+
+async def test_custom_class_sources_are_extracted_eagerly() -> None:
+    class _Source:
+        def accepts(self, factory: Any) -> TypeIs[type[_A]]:
+            return factory is _A
+
+        def return_type(self, factory: object, type_context: Any) -> object:  # noqa: ARG002
+            return _Interface
+
+    container = Container(
+        extensions=[
+            LazyRegistrationExtension(),
+            TypeSourcesExtension(return_type_sources=[_Source()]),
+        ]
+    )
+    container.register(Scoped(_A), Scoped(_OtherA))
+    assert set(_pending(container)) == {_OtherA}
+    assert [
+        record.provider.implementation
+        for record in container.registry.get_providers(_Interface)
+    ] == [_A]
+
+
+def test_class_names_are_added_to_type_context() -> None:
+    container = _create_container()
+    container.register(Scoped(_Later))
+    assert _pending(container)
+    assert container.registry.type_context["_Later"] is _Later
+
+    assert _Later in container.registry.providers
+    assert not _pending(container)
+
+
+def _fail(*_: Any, **__: Any) -> NoReturn:
+    raise AssertionError
+
+
+async def test_compilation_cache_keeps_providers_pending(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    def create_container() -> Container:
+        container = Container(
+            extensions=[
+                LazyRegistrationExtension(),
+                CompilationCacheExtension(tmp_path),
+            ]
+        )
+        container.register(
+            Scoped(_A, interface=_Interface), Scoped(_OtherA), Scoped(_Later)
+        )
+        return container
+
+    container = create_container()
+    async with container.context() as ctx:
+        await ctx.resolve(_Later)
+    assert set(_pending(container)) == {_Interface, _OtherA}
+
+    container = create_container()
+    monkeypatch.setattr(container.registry, "_compile", _fail)
+    async with container.context() as ctx:
+        assert isinstance(await ctx.resolve(_Later), _Later)
+    assert set(_pending(container)) == {_Interface, _OtherA}
+
+
+async def test_overrides_keep_providers_pending() -> None:
+    container = _create_container()
+    container.register(Scoped(_A, interface=_Interface), Scoped(_Later))
+
+    override = Object(_OtherA(), interface=_Interface)
+    async with TestContainer(container).override(override):
+        async with container.context() as ctx:
+            assert isinstance(await ctx.resolve(_Interface), _OtherA)
+        assert set(_pending(container)) == {_Later}
+    assert set(_pending(container)) == {_Later}
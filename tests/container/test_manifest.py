@@ -0,0 +1,164 @@
+import dataclasses
+import importlib
+import json
+import sys
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any, NoReturn
+
+import pytest
+
+from aioinject import Object, Scoped, SyncContainer
+from aioinject._internal.type_sources import TypeResolver
+from aioinject.extensions import RegistrationManifestExtension
+
+
+class _A:
+    pass
+
+
+@dataclasses.dataclass
+class _B:
+    a: _A
+
+
+class _C:
+    def __init__(self, b: _B, numbers: Sequence[int]) -> None:
+        self.b = b
+        self.numbers = numbers
+
+
+def _create_b(a: _A) -> _B:
+    return _B(a=a)
+
+
+def _create_numbers() -> list[int]:
+    return [1]
+
+
+def _create_container(path: Path) -> SyncContainer:
+    container = SyncContainer(extensions=[RegistrationManifestExtension(path)])
+    container.register(
+        Scoped(_A),
+        Scoped(_create_b),
+        Scoped(_C),
+        Scoped(lambda: 1, interface=int),
+        Scoped(_create_numbers),
+    )
+    return container
+
+
+def _fail(*_: Any, **__: Any) -> NoReturn:
+    raise AssertionError
+
+
+def test_manifest_is_used(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    path = tmp_path / "manifest.json"
+    with _create_container(path):
+        pass
+    entries = json.loads(path.read_text())["entries"]
+    assert set(entries) == {
+        f"{__name__}:_A",
+        f"{__name__}:_create_b",
+        f"{__name__}:_C",
+        f"{__name__}:_create_numbers",
+    }
+
+    monkeypatch.setattr(TypeResolver, "_return_type", _fail)
+    monkeypatch.setattr(
+        "aioinject._internal.type_sources.collect_parameters", _fail
+    )
+    container = SyncContainer(extensions=[RegistrationManifestExtension(path)])
+    container.register(Scoped(_A), Scoped(_create_b))
+
+    with container, container.context() as ctx:
+        b = ctx.resolve(_B)
+        assert b.a is ctx.resolve(_A)
+
+
+def test_not_saved_without_changes(tmp_path: Path) -> None:
+    path = tmp_path / "manifest.json"
+    with _create_container(path):
+        pass
+    path.unlink()
+
+    container = SyncContainer(extensions=[RegistrationManifestExtension(path)])
+    container.register(Object(1))
+    with container:
+        pass
+    assert not path.exists()
+
+
+@pytest.mark.parametrize(
+    "invalidate",
+    [
+        lambda entry: entry["files"].update(dict.fromkeys(entry["files"])),
+        lambda entry: entry["files"].update({"missing.py": [0, 0]}),
+        lambda entry: entry.update(return_type="tests.missing:_A"),
+        lambda entry: entry.update(dependencies=[["a", "tests:_Missing"]]),
+    ],
+)
+def test_stale_entries_are_ignored(
+    tmp_path: Path,
+    invalidate: Any,
+) -> None:
+    path = tmp_path / "manifest.json"
+    with _create_container(path):
+        pass
+
+    data = json.loads(path.read_text())
+    invalidate(data["entries"][f"{__name__}:_create_b"])
+    path.write_text(json.dumps(data))
+
+    with _create_container(path) as container, container.context() as ctx:
+        assert isinstance(ctx.resolve(_B).a, _A)
+
+    entry = json.loads(path.read_text())["entries"][f"{__name__}:_create_b"]
+    assert entry["return_type"] == f"{__name__}:_B"
+    assert entry["dependencies"] == [["a", f"{__name__}:_A"]]
+
+
+@pytest.mark.parametrize("content", ["invalid", '{"version": [0, ""]}'])
+def test_invalid_manifest_is_ignored(tmp_path: Path, content: str) -> None:
+    path = tmp_path / "manifest.json"
+    path.write_text(content)
+
+    with _create_container(path) as container, container.context() as ctx:
+        assert isinstance(ctx.resolve(_C), _C)
+    assert json.loads(path.read_text())["entries"]
+
+
+def test_changes_of_base_classes_invalidate_entries(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.syspath_prepend(str(tmp_path))
+    for name in ("_manifest_base", "_manifest_impl"):
+        monkeypatch.delitem(sys.modules, name, raising=False)
+    base = tmp_path / "_manifest_base.py"
+    base.write_text(
+        "class Base:\n    def __init__(self, number: int) -> None:\n"
+        "        self.value = number\n"
+    )
+    (tmp_path / "_manifest_impl.py").write_text(
+        "from _manifest_base import Base\n\nclass Impl(Base):\n    pass\n"
+    )
+    impl = importlib.import_module("_manifest_impl")
+    path = tmp_path / "manifest.json"
+    container = SyncContainer(extensions=[RegistrationManifestExtension(path)])
+    container.register(Scoped(impl.Impl), Object(1))
+    with container, container.context() as ctx:
+        assert ctx.resolve(impl.Impl).value == 1
+
+    base.write_text(
+        "class Base:\n    def __init__(self, text: str) -> None:\n"
+        "        self.value = text\n"
+    )
+    importlib.reload(importlib.import_module("_manifest_base"))
+    impl = importlib.reload(impl)
+
+    container = SyncContainer(extensions=[RegistrationManifestExtension(path)])
+    container.register(Scoped(impl.Impl), Object("text"))
+    with container, container.context() as ctx:
+        assert ctx.resolve(impl.Impl).value == "text"
@@ -0,0 +1,301 @@
+import dataclasses
+import os
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any, NoReturn
+
+import anyio
+import pytest
+
+from aioinject import (
+    Container,
+    FromContext,
+    Object,
+    Scoped,
+    Singleton,
+    SyncContainer,
+)
+from aioinject.extensions import (
+    BlockingFactoriesExtension,
+    CompilationCacheExtension,
+    Extension,
+    SharedSubgraphsExtension,
+    SlotCacheExtension,
+)
+from aioinject.scope import Scope
+from aioinject.testing import TestContainer
+
+
+class _Request:
+    pass
+
+
+class _A:
+    pass
+
+
+@dataclasses.dataclass
+class _B:
+    a: _A
+    request: _Request
+    number: int
+    numbers: Sequence[int]
+
+
+def _create_container(directory: Path) -> Container:
+    container = Container(extensions=[CompilationCacheExtension(directory)])
+    container.register(
+        Singleton(_A),
+        Scoped(_B),
+        Object(1),
+        FromContext(_Request, scope=Scope.request),
+    )
+    return container
+
+
+def _fail(*_: Any, **__: Any) -> NoReturn:
+    raise AssertionError
+
+
+async def _files(directory: Path) -> list[anyio.Path]:
+    return [path async for path in anyio.Path(directory).iterdir()]
+
+
+async def test_compiled_factories_are_reused(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    async with _create_container(tmp_path).context(
+        {_Request: _Request()}
+    ) as ctx:
+        await ctx.resolve(_A)
+        await ctx.resolve(_B)
+        await ctx.resolve_many((_A, _B))
+    assert len(await _files(tmp_path)) == 3  # noqa: PLR2004
+
+    container = _create_container(tmp_path)
+    monkeypatch.setattr(container.registry, "_compile", _fail)
+    monkeypatch.setattr(container.registry, "_compile_many", _fail)
+
+    request = _Request()
+    async with container.context({_Request: request}) as ctx:
+        b = await ctx.resolve(_B)
+        assert b.a is await container.root.resolve(_A)
+        assert b.request is request
+        assert b.number == 1
+        assert b.numbers == [1]
+        assert await ctx.resolve_many((_A, _B)) == (b.a, b)
+
+
+async def test_warmup_uses_cache(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    report = _create_container(tmp_path).warmup()
+    assert all(entry.node_count is not None for entry in report.entries)
+    assert len(await _files(tmp_path)) == len(report.entries)
+
+    container = _create_container(tmp_path)
+    monkeypatch.setattr(container.registry, "_compile", _fail)
+    cached_report = container.warmup()
+    assert [entry.type_ for entry in cached_report.entries] == [
+        entry.type_ for entry in report.entries
+    ]
+    assert all(entry.node_count is None for entry in cached_report.entries)
+
+    async with container.context({_Request: _Request()}) as ctx:
+        b = await ctx.resolve(_B)
+        assert b.a is await container.root.resolve(_A)
+
+
+async def test_registry_changes_invalidate_cache(tmp_path: Path) -> None:
+    async with _create_container(tmp_path).context(
+        {_Request: _Request()}
+    ) as ctx:
+        await ctx.resolve(_B)
+
+    container = _create_container(tmp_path)
+    container.register(Object("str"))
+    async with container.context({_Request: _Request()}) as ctx:
+        await ctx.resolve(_B)
+    assert len(await _files(tmp_path)) == 2  # noqa: PLR2004
+
+
+async def test_invalid_files_are_ignored(tmp_path: Path) -> None:
+    container = _create_container(tmp_path)
+    await container.root.resolve(_A)
+    [file] = await _files(tmp_path)
+    await file.write_bytes(b"invalid")
+
+    container = _create_container(tmp_path)
+    assert isinstance(await container.root.resolve(_A), _A)
+
+
+async def test_stale_entries_are_ignored(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    container = _create_container(tmp_path)
+    await container.root.resolve(_A)
+    monkeypatch.setattr(
+        "aioinject._compilation.persistent._load_record",
+        lambda *args: {}[args],
+    )
+
+    container = _create_container(tmp_path)
+    assert isinstance(await container.root.resolve(_A), _A)
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="POSIX only")
+@pytest.mark.parametrize("writable", ["directory", "file"])
+async def test_files_writable_by_others_are_not_loaded(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, writable: str
+) -> None:
+    await _create_container(tmp_path).root.resolve(_A)
+    [file] = await _files(tmp_path)
+    path = anyio.Path(tmp_path) if writable == "directory" else file
+    await path.chmod(0o777)
+
+    container = _create_container(tmp_path)
+    monkeypatch.setattr(container.registry, "_compile", _fail)
+    with pytest.raises(AssertionError):
+        await container.root.resolve(_A)
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="POSIX only")
+async def test_not_stored_in_directory_writable_by_others(
+    tmp_path: Path,
+) -> None:
+    await anyio.Path(tmp_path).chmod(0o777)
+    await _create_container(tmp_path).root.resolve(_A)
+    assert await _files(tmp_path) == []
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="POSIX only")
+async def test_owned_by_other_user_is_ignored(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    await _create_container(tmp_path).root.resolve(_A)
+
+    container = _create_container(tmp_path)
+    monkeypatch.setattr(os, "getuid", lambda: os.geteuid() + 1)
+    monkeypatch.setattr(container.registry, "_compile", _fail)
+    with pytest.raises(AssertionError):
+        await container.root.resolve(_A)
+
+
+@pytest.mark.parametrize(
+    ("extension", "changed"),
+    [
+        (
+            BlockingFactoriesExtension(),
+            BlockingFactoriesExtension(offload="all"),
+        ),
+        (
+            BlockingFactoriesExtension(),
+            BlockingFactoriesExtension(threshold=0.1),
+        ),
+        (
+            SharedSubgraphsExtension(threshold=2),
+            SharedSubgraphsExtension(threshold=3),
+        ),
+    ],
+)
+async def test_extension_settings_invalidate_cache(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    extension: Extension,
+    changed: Extension,
+) -> None:
+    def create_container(extension: Extension) -> Container:
+        container = Container(
+            extensions=[CompilationCacheExtension(tmp_path), extension]
+        )
+        container.register(Singleton(_A))
+        return container
+
+    await create_container(extension).root.resolve(_A)
+
+    container = create_container(extension)
+    monkeypatch.setattr(container.registry, "_compile", _fail)
+    assert isinstance(await container.root.resolve(_A), _A)
+
+    container = create_container(changed)
+    monkeypatch.setattr(container.registry, "_compile", _fail)
+    with pytest.raises(AssertionError):
+        await container.root.resolve(_A)
+
+
+def _create_number(a: _A) -> int:  # noqa: ARG001
+    return 1
+
+
+async def test_changed_annotations_of_used_providers_invalidate_entries(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    def create_container() -> Container:
+        container = Container(extensions=[CompilationCacheExtension(tmp_path)])
+        container.register(Singleton(_A), Scoped(_create_number))
+        return container
+
+    async with create_container().context() as ctx:
+        await ctx.resolve(int)
+
+    monkeypatch.setitem(_create_number.__annotations__, "a", "_A | None")
+    container = create_container()
+    monkeypatch.setattr(container.registry, "_compile", _fail)
+    with pytest.raises(AssertionError):
+        async with container.context() as ctx:
+            await ctx.resolve(int)
+
+
+def _create_class() -> type[object]:
+    class _C:
+        pass
+
+    return _C
+
+
+def test_ambiguous_types_are_not_stored(tmp_path: Path) -> None:
+    scoped, scoped_duplicate = _create_class(), _create_class()
+    context, context_duplicate = _create_class(), _create_class()
+
+    @dataclasses.dataclass
+    class UsesScoped:
+        value: scoped  # type: ignore[valid-type]
+
+    @dataclasses.dataclass
+    class UsesContext:
+        value: context  # type: ignore[valid-type]
+
+    container = SyncContainer(extensions=[CompilationCacheExtension(tmp_path)])
+    container.register(
+        Scoped(scoped),
+        Scoped(scoped_duplicate),
+        FromContext(context, scope=Scope.request),
+        Scoped(context_duplicate),
+        Scoped(UsesScoped),
+        Scoped(UsesContext),
+    )
+
+    with container.context({context: context()}) as ctx:
+        ctx.resolve(scoped)
+        ctx.resolve(UsesScoped)
+        ctx.resolve(UsesContext)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_slot_cache_is_not_stored(tmp_path: Path) -> None:
+    container = SyncContainer(
+        extensions=[CompilationCacheExtension(tmp_path), SlotCacheExtension()]
+    )
+    container.register(Singleton(_A))
+    container.root.resolve(_A)
+    assert list(tmp_path.iterdir()) == []
+
+
+async def test_override(tmp_path: Path) -> None:
+    container = _create_container(tmp_path)
+    a = await container.root.resolve(_A)
+    override = _A()
+
+    async with TestContainer(container).override(Object(override, _A)):
+        assert await container.root.resolve(_A) is override
+    assert await container.root.resolve(_A) is a
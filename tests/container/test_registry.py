@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+import re
+from collections.abc import Mapping
+from typing import Any, NoReturn
+
 import pytest
 
-from aioinject import Container, Scoped
+from aioinject import Container, Object, Scoped, SyncContainer
 
 
 class A:
@@ -23,3 +27,86 @@ def test_cyclic_dependency() -> None:
         "Could not resolve dependencies for type <class 'tests.container.test_registry.B'>\n"
         "  unresolved dependencies: [<class 'tests.container.test_registry.A'>]"
     )
+
+
+def test_deep_graph() -> None:
+    classes: list[type[Any]] = []
+    for index in range(200):
+
+        def init(self: Any, **kwargs: Any) -> None:
+            self.__dict__.update(kwargs)
+
+        init.__annotations__ = (
+            {"previous": classes[-1], "half": classes[index // 2]}
+            if classes
+            else {}
+        )
+        classes.append(type(f"Node{index}", (), {"__init__": init}))
+
+    container = SyncContainer()
+    # Dependants are registered before their dependencies
+    container.register(*(Scoped(cls) for cls in reversed(classes)))
+
+    with container.context() as ctx:
+        node = ctx.resolve(classes[-1])
+    for cls in reversed(classes[:-1]):
+        node = node.previous
+        assert type(node) is cls
+
+
+class _Service:
+    def __init__(self, a: int) -> None:
+        self.a = a
+
+
+class _ProvideOverridden(Scoped[_Service]):
+    def provide(self, kwargs: Mapping[str, Any]) -> _Service:
+        return _Service(a=kwargs["a"] + 1)
+
+
+def _fail(*_: Any, **__: Any) -> NoReturn:
+    raise AssertionError
+
+
+async def test_builtin_providers_are_called_directly(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    container = Container()
+    container.register(Scoped(_Service), Object(1))
+
+    source = container.registry._compile(_Service, is_async=True).source  # noqa: SLF001
+    assert re.search(r"_Service_\d+_provider\.provide", source) is None
+    assert re.search(
+        r"_Service_\d+_implementation\(a=int_\d+_instance\)", source
+    )
+
+    monkeypatch.setattr(Scoped, "provide", _fail)
+    async with container.context() as ctx:
+        assert (await ctx.resolve(_Service)).a == 1
+
+
+async def test_custom_provide_is_used() -> None:
+    container = Container()
+    container.register(_ProvideOverridden(_Service), Object(1))
+
+    source = container.registry._compile(_Service, is_async=True).source  # noqa: SLF001
+    assert "_provider.provide({" in source
+
+    async with container.context() as ctx:
+        assert (await ctx.resolve(_Service)).a == 2  # noqa: PLR2004
+
+
+def test_factories_share_globals() -> None:
+    container = SyncContainer()
+    container.register(Scoped(_Service), Object(1))
+    registry = container.registry
+    namespace = dict(registry.namespace)
+
+    service_factory = registry.compile(_Service, is_async=False)
+    int_factory = registry.compile(int, is_async=False)
+    assert service_factory.__globals__ is registry.namespace
+    assert int_factory.__globals__ is registry.namespace
+    assert registry.namespace.keys() - namespace.keys() <= {"__builtins__"}
+
+    with container.context() as ctx:
+        assert ctx.resolve(_Service).a == 1
@@ -0,0 +1,143 @@
+import dataclasses
+from pathlib import Path
+
+from aioinject import Container, Scoped, Singleton, SyncContainer, Transient
+from aioinject.extensions import (
+    CompilationCacheExtension,
+    ConcurrentShutdownExtension,
+    Extension,
+    SharedSubgraphsExtension,
+)
+from aioinject.testing import TestContainer
+
+
+class _Session:
+    pass
+
+
+@dataclasses.dataclass
+class _Repository:
+    session: _Session
+
+
+class _Settings:
+    pass
+
+
+@dataclasses.dataclass
+class _Service:
+    repository: _Repository
+    session: _Session
+    settings: _Settings
+
+
+@dataclasses.dataclass
+class _UseCaseA:
+    service: _Service
+
+
+@dataclasses.dataclass
+class _UseCaseB:
+    service: _Service
+    repository: _Repository
+
+
+def _create_container(
+    *extensions: Extension, threshold: int = 2
+) -> SyncContainer:
+    container = SyncContainer(
+        extensions=[SharedSubgraphsExtension(threshold=threshold), *extensions]
+    )
+    container.register(
+        Singleton(_Session),
+        Singleton(_Settings),
+        Scoped(_Repository),
+        Scoped(_Service),
+        Transient(_UseCaseA),
+        Transient(_UseCaseB),
+    )
+    return container
+
+
+def _source(container: SyncContainer | Container, type_: type) -> str:
+    return container.registry._compile(type_, is_async=False).source  # noqa: SLF001
+
+
+def test_subgraph_used_by_multiple_factories_is_shared() -> None:
+    container = _create_container()
+    assert "_subgraph(" not in _source(container, _UseCaseA)
+
+    source = _source(container, _UseCaseB)
+    assert any(
+        line.strip().startswith("_Service_")
+        and line.endswith("_subgraph(scopes, current_scope)")
+        for line in source.splitlines()
+    )
+    assert len(container.registry.subgraph_cache) == 1
+
+    with container, container.context() as ctx:
+        use_case_b = ctx.resolve(_UseCaseB)
+        use_case_a = ctx.resolve(_UseCaseA)
+        assert use_case_a.service is use_case_b.service
+        assert use_case_b.repository is use_case_b.service.repository
+        assert use_case_b.service.session is container.root.resolve(_Session)
+
+
+async def test_async() -> None:
+    container = Container(extensions=[SharedSubgraphsExtension(threshold=2)])
+    container.register(
+        Singleton(_Session),
+        Singleton(_Settings),
+        Scoped(_Repository),
+        Scoped(_Service),
+        Transient(_UseCaseA),
+        Transient(_UseCaseB),
+    )
+    async with container.context() as ctx:
+        use_case_a = await ctx.resolve(_UseCaseA)
+        use_case_b = await ctx.resolve(_UseCaseB)
+        assert use_case_a.service is use_case_b.service
+
+    registry = container.registry
+    assert len(registry.subgraph_cache) == 1
+    assert "await " in registry._compile(_UseCaseB, is_async=True).source  # noqa: SLF001
+
+
+def test_small_subgraphs_are_inlined() -> None:
+    container = _create_container(threshold=4)
+    _source(container, _UseCaseA)
+    assert "_subgraph(" not in _source(container, _UseCaseB)
+
+
+def test_not_shared_with_concurrent_shutdown() -> None:
+    container = _create_container(ConcurrentShutdownExtension())
+    _source(container, _UseCaseA)
+    assert "_subgraph(" not in _source(container, _UseCaseB)
+
+
+def test_override() -> None:
+    container = _create_container()
+    with container.context() as ctx:
+        ctx.resolve(_UseCaseA)
+        ctx.resolve(_UseCaseB)
+    assert container.registry.shared_nodes
+
+    session = _Session()
+    with (
+        TestContainer(container).override(
+            Singleton(lambda: session, _Session)
+        ),
+        container.context() as ctx,
+    ):
+        assert not container.registry.shared_nodes
+        assert ctx.resolve(_UseCaseB).service.session is session
+
+
+def test_persistent_cache(tmp_path: Path) -> None:
+    container = _create_container(CompilationCacheExtension(tmp_path))
+    with container.context() as ctx:
+        ctx.resolve(_UseCaseA)
+        ctx.resolve(_UseCaseB)
+
+    # Factories calling shared ones aren't stored
+    assert len(list(tmp_path.iterdir())) == 1
@@ -0,0 +1,257 @@
+import contextlib
+import dataclasses
+import sys
+import threading
+import time
+from collections.abc import AsyncIterator, Iterator
+
+import anyio
+import pytest
+
+from aioinject import Container, Singleton
+from aioinject.extensions import ConcurrentShutdownExtension
+from aioinject.shutdown import ConcurrentExitStack
+
+
+if sys.version_info < (3, 11):  # pragma: no cover
+    from exceptiongroup import BaseExceptionGroup
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+class _TestError(Exception):
+    pass
+
+
+class _A:
+    pass
+
+
+class _B:
+    pass
+
+
+@dataclasses.dataclass
+class _Service:
+    a: _A
+
+
+@dataclasses.dataclass
+class _C:
+    a: _A
+    service: _Service
+    b: _B
+
+
+async def test_independent_resources_are_closed_concurrently() -> None:
+    b_closing = anyio.Event()
+    closed: list[type[object]] = []
+
+    @contextlib.asynccontextmanager
+    async def create_a() -> AsyncIterator[_A]:
+        yield _A()
+        await b_closing.wait()
+        closed.append(_A)
+
+    @contextlib.asynccontextmanager
+    async def create_b() -> AsyncIterator[_B]:
+        yield _B()
+        b_closing.set()
+        closed.append(_B)
+
+    container = Container(extensions=[ConcurrentShutdownExtension()])
+    container.register(Singleton(create_a), Singleton(create_b))
+
+    with anyio.fail_after(1):
+        async with container:
+            await container.root.resolve(_A)
+            await container.root.resolve(_B)
+
+    assert closed == [_B, _A]
+    assert container.shutdown_report is not None
+    assert {e.type_ for e in container.shutdown_report.entries} == {_A, _B}
+    assert container.shutdown_report.timed_out == []
+
+
+async def test_dependants_are_closed_first() -> None:
+    closed: list[type[object]] = []
+
+    @contextlib.asynccontextmanager
+    async def create_a() -> AsyncIterator[_A]:
+        yield _A()
+        closed.append(_A)
+
+    @contextlib.contextmanager
+    def create_b() -> Iterator[_B]:
+        yield _B()
+        closed.append(_B)
+
+    @contextlib.asynccontextmanager
+    async def create_c(a: _A, service: _Service, b: _B) -> AsyncIterator[_C]:
+        yield _C(a=a, service=service, b=b)
+        await anyio.sleep(0.01)
+        closed.append(_C)
+
+    container = Container(extensions=[ConcurrentShutdownExtension()])
+    container.register(
+        Singleton(create_a),
+        Singleton(create_b),
+        Singleton(_Service),
+        Singleton(create_c),
+    )
+
+    async with container:
+        await container.root.resolve(_C)
+
+    assert closed[0] is _C
+    assert set(closed) == {_A, _B, _C}
+
+
+async def test_slow_resources_time_out() -> None:
+    @contextlib.asynccontextmanager
+    async def create_a() -> AsyncIterator[_A]:
+        yield _A()
+        await anyio.sleep_forever()
+
+    container = Container(extensions=[ConcurrentShutdownExtension(timeout=0)])
+    container.register(Singleton(create_a), Singleton(_Service))
+
+    with anyio.fail_after(1):
+        async with container:
+            await container.root.resolve(_Service)
+
+    assert container.shutdown_report is not None
+    [entry] = container.shutdown_report.timed_out
+    assert entry.type_ is _A
+
+
+async def test_errors_are_raised_after_all_resources_are_closed() -> None:
+    b_closed = False
+
+    @contextlib.asynccontextmanager
+    async def create_a() -> AsyncIterator[_A]:
+        yield _A()
+        raise _TestError
+
+    @contextlib.asynccontextmanager
+    async def create_b() -> AsyncIterator[_B]:
+        nonlocal b_closed
+        yield _B()
+        b_closed = True
+
+    container = Container(extensions=[ConcurrentShutdownExtension()])
+    container.register(Singleton(create_a), Singleton(create_b))
+
+    async def run() -> None:
+        async with container:
+            await container.root.resolve(_A)
+            await container.root.resolve(_B)
+
+    with pytest.raises(_TestError):
+        await run()
+
+    assert b_closed
+    assert container.shutdown_report is not None
+    assert [e.type_ for e in container.shutdown_report.entries] == [_B]
+
+
+async def test_exit_stack_defaults() -> None:
+    stack = ConcurrentExitStack()
+    await stack.enter_async_context(
+        _A,
+        contextlib.nullcontext(_A()),
+    )
+    report = await stack.aclose()
+    assert [e.type_ for e in report.entries] == [_A]
+    assert stack.report is report
+
+
+async def test_sync_resources_are_closed_on_event_loop_thread() -> None:
+    threads: list[int] = []
+
+    @contextlib.contextmanager
+    def create_a() -> Iterator[_A]:
+        threads.append(threading.get_ident())
+        yield _A()
+        threads.append(threading.get_ident())
+
+    container = Container(extensions=[ConcurrentShutdownExtension()])
+    container.register(Singleton(create_a))
+
+    async with container:
+        await container.root.resolve(_A)
+
+    assert threads == [threading.get_ident()] * 2
+
+
+async def test_sync_resources_are_closed_in_threads() -> None:
+    both_closing = threading.Barrier(2)
+
+    @contextlib.contextmanager
+    def create_a() -> Iterator[_A]:
+        yield _A()
+        both_closing.wait(timeout=1)
+
+    @contextlib.contextmanager
+    def create_b() -> Iterator[_B]:
+        yield _B()
+        both_closing.wait(timeout=1)
+
+    container = Container(
+        extensions=[ConcurrentShutdownExtension(offload=True)]
+    )
+    container.register(Singleton(create_a), Singleton(create_b))
+
+    async with container:
+        await container.root.resolve(_A)
+        await container.root.resolve(_B)
+
+    assert container.shutdown_report is not None
+    assert not container.shutdown_report.timed_out
+
+
+async def test_slow_sync_resources_time_out() -> None:
+    @contextlib.contextmanager
+    def create_a() -> Iterator[_A]:
+        yield _A()
+        time.sleep(0.1)
+
+    container = Container(
+        extensions=[ConcurrentShutdownExtension(timeout=0.01, offload=True)]
+    )
+    container.register(Singleton(create_a))
+
+    async with container:
+        await container.root.resolve(_A)
+
+    assert container.shutdown_report is not None
+    [entry] = container.shutdown_report.timed_out
+    assert entry.type_ is _A
+
+
+async def test_all_errors_are_raised() -> None:
+    @contextlib.asynccontextmanager
+    async def create_a() -> AsyncIterator[_A]:
+        yield _A()
+        raise _TestError
+
+    @contextlib.contextmanager
+    def create_b() -> Iterator[_B]:
+        yield _B()
+        raise _TestError
+
+    container = Container(extensions=[ConcurrentShutdownExtension()])
+    container.register(Singleton(create_a), Singleton(create_b))
+
+    async def run() -> None:
+        async with container:
+            await container.root.resolve(_A)
+            await container.root.resolve(_B)
+
+    with pytest.raises(BaseExceptionGroup) as exc_info:
+        await run()
+    assert len(exc_info.value.exceptions) == 2  # noqa: PLR2004
+    assert all(isinstance(e, _TestError) for e in exc_info.value.exceptions)
@@ -0,0 +1,164 @@
+import dataclasses
+import gc
+import linecache
+import traceback
+import typing
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+
+from aioinject import Container, Object, Scoped, SyncContainer, Transient
+from aioinject.extensions import (
+    SharedSubgraphsExtension,
+    SourceRegistrationExtension,
+)
+from aioinject.testing import TestContainer
+
+
+class _A:
+    pass
+
+
+@dataclasses.dataclass
+class _B:
+    a: _A
+
+
+@dataclasses.dataclass
+class _C:
+    a: _A
+    b: _B
+
+
+class _FailingError(Exception):
+    pass
+
+
+class _Failing:
+    def __init__(self) -> None:
+        raise _FailingError
+
+
+@pytest.fixture(autouse=True)
+def _collect_garbage() -> None:
+    # Release sources registered by containers of previous tests
+    gc.collect()
+
+
+def _filename(fn: Any) -> str:
+    return fn.__code__.co_filename
+
+
+def _create_container(
+    mode: str = "eager", maxsize: int | None = None
+) -> SyncContainer:
+    container = SyncContainer(
+        extensions=[
+            SourceRegistrationExtension(mode=mode, maxsize=maxsize)  # type: ignore[arg-type]
+        ]
+    )
+    container.register(Scoped(_A), Scoped(_B), Scoped(_C), Transient(_Failing))
+    return container
+
+
+@pytest.mark.parametrize("mode", ["eager", "lazy"])
+def test_source_is_shown_in_traceback(mode: str) -> None:
+    container = _create_container(mode=mode)
+    filename = _filename(container.registry.compile(_Failing, is_async=False))
+    assert len(linecache.cache[filename]) == (1 if mode == "lazy" else 4)
+
+    with container.context() as ctx, pytest.raises(_FailingError) as exc_info:
+        ctx.resolve(_Failing)
+
+    formatted = "".join(traceback.format_exception(exc_info.value))
+    assert "_Failing_" in formatted
+    assert "_implementation()" in formatted
+    assert linecache.getlines(filename)
+
+
+def test_lazy_source_is_compressed() -> None:
+    container = _create_container(mode="lazy")
+    filename = _filename(container.registry.compile(_Failing, is_async=False))
+    loader = typing.cast("Callable[[], str]", linecache.cache[filename][0])
+    source = loader()
+    assert "_implementation()" in source
+    assert loader.__closure__
+    assert source not in [cell.cell_contents for cell in loader.__closure__]
+
+
+def test_off() -> None:
+    container = _create_container(mode="off")
+    fn = container.registry.compile(_A, is_async=False)
+    assert _filename(fn) not in linecache.cache
+
+
+def test_sync_and_async_sources_are_registered_separately() -> None:
+    container = Container()
+    container.register(Scoped(_A))
+    sync_filename = _filename(container.registry.compile(_A, is_async=False))
+    async_filename = _filename(container.registry.compile(_A, is_async=True))
+    assert sync_filename != async_filename
+    assert linecache.getlines(sync_filename) != linecache.getlines(
+        async_filename
+    )
+
+
+def test_maxsize() -> None:
+    container = _create_container(maxsize=2)
+    filenames = [
+        _filename(container.registry.compile(type_, is_async=False))
+        for type_ in (_A, _B, _C)
+    ]
+    assert filenames[0] not in linecache.cache
+    assert all(filename in linecache.cache for filename in filenames[1:])
+
+
+def test_released_when_evicted() -> None:
+    container = _create_container()
+    filename = _filename(container.registry.compile(_B, is_async=False))
+    a_filename = _filename(container.registry.compile(_A, is_async=False))
+
+    with TestContainer(container).override(Object(_A(), _A)):
+        assert filename not in linecache.cache
+        assert a_filename not in linecache.cache
+        with container.context() as ctx:
+            ctx.resolve(_B)
+
+
+def test_shared_between_registries() -> None:
+    containers = [_create_container(), _create_container()]
+    filenames = {
+        _filename(container.registry.compile(_A, is_async=False))
+        for container in containers
+    }
+    (filename,) = filenames
+
+    with TestContainer(containers[0]).override(Object(_A(), _A)):
+        assert filename in linecache.cache
+        with TestContainer(containers[1]).override(Object(_A(), _A)):
+            assert filename not in linecache.cache
+
+
+def test_subgraphs_are_released() -> None:
+    container = SyncContainer(
+        extensions=[SharedSubgraphsExtension(threshold=1)]
+    )
+    container.register(Scoped(_A), Scoped(_B), Transient(_C))
+    registry = container.registry
+    registry.compile(_B, is_async=False)
+    registry.compile(_C, is_async=False)
+    (subgraph,) = registry.subgraph_cache.values()
+    filename = _filename(subgraph)
+    assert filename in linecache.cache
+
+    container.register(Object(_A(), _A))
+    assert filename not in linecache.cache
+
+
+def test_released_when_collected() -> None:
+    container = _create_container()
+    filename = _filename(container.registry.compile(_A, is_async=False))
+    del container
+    gc.collect()
+    assert filename not in linecache.cache
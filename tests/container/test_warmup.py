@@ -0,0 +1,95 @@
+import dataclasses
+from collections.abc import Sequence
+from typing import Generic, TypeVar
+
+from aioinject import Container, Object, Scoped, SyncContainer
+
+
+T = TypeVar("T")
+
+
+class _A:
+    pass
+
+
+@dataclasses.dataclass
+class _B:
+    a: _A
+
+
+class _Box(Generic[T]):
+    def __init__(self, value: T) -> None:
+        self.value = value
+
+
+@dataclasses.dataclass
+class _UsesBoxes:
+    box: _Box[int]
+    numbers: Sequence[int]
+
+
+async def test_warmup_compiles_registered_types() -> None:
+    container = Container()
+    container.register(Scoped(_A), Scoped(_B))
+
+    report = container.warmup()
+
+    assert {entry.type_ for entry in report.entries} == {_A, _B}
+    assert all(entry.is_async for entry in report.entries)
+    assert (_A, True) in container.registry.compilation_cache
+    assert (_B, True) in container.registry.compilation_cache
+
+    entry = next(entry for entry in report.entries if entry.type_ is _B)
+    assert entry.node_count == 2  # noqa: PLR2004
+    assert entry.source_size is not None
+    assert entry.source_size > 0
+    assert report.duration >= entry.duration
+
+    async with container.context() as ctx:
+        b = await ctx.resolve(_B)
+        assert isinstance(b.a, _A)
+
+
+def test_warmup_sync() -> None:
+    container = SyncContainer()
+    container.register(Scoped(_A))
+
+    report = container.warmup()
+
+    assert [(entry.type_, entry.is_async) for entry in report.entries] == [
+        (_A, False)
+    ]
+    assert (_A, False) in container.registry.compilation_cache
+
+
+def test_warmup_skips_already_compiled() -> None:
+    container = SyncContainer()
+    container.register(Scoped(_A), Scoped(_B))
+    container.registry.compile(_A, is_async=False)
+
+    report = container.warmup()
+    assert [entry.type_ for entry in report.entries] == [_B]
+    assert container.warmup().entries == []
+
+
+def test_warmup_dependency_generics_and_iterables() -> None:
+    container = SyncContainer()
+    container.register(
+        Scoped(_Box),
+        Scoped(_UsesBoxes),
+        Object(42),
+    )
+
+    report = container.warmup()
+
+    # Unbound `_Box` can't be compiled on its own, but `_Box[int]` can
+    assert {entry.type_ for entry in report.entries} == {
+        _UsesBoxes,
+        _Box[int],
+        Sequence[int],
+        int,
+    }
+    with container.context() as ctx:
+        instance = ctx.resolve(_UsesBoxes)
+        assert instance.box.value == 42  # noqa: PLR2004
+        assert instance.numbers == [42]
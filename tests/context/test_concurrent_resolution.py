@@ -0,0 +1,131 @@
+import contextlib
+import dataclasses
+from collections.abc import AsyncIterator
+
+import anyio
+import pytest
+
+from aioinject import Container, Scoped, SyncContainer
+from aioinject.extensions import ConcurrentResolutionExtension
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+class _TestError(Exception):
+    pass
+
+
+class _A:
+    pass
+
+
+class _B:
+    pass
+
+
+class _C:
+    pass
+
+
+@dataclasses.dataclass
+class _UseCase:
+    a: _A
+    b: _B
+
+
+async def test_independent_dependencies_are_resolved_concurrently() -> None:
+    b_created = anyio.Event()
+
+    async def create_a() -> _A:
+        await b_created.wait()
+        return _A()
+
+    async def create_b() -> _B:
+        b_created.set()
+        return _B()
+
+    container = Container(extensions=[ConcurrentResolutionExtension()])
+    container.register(Scoped(create_a), Scoped(create_b), Scoped(_UseCase))
+
+    with anyio.fail_after(1):
+        async with container.context() as ctx:
+            use_case = await ctx.resolve(_UseCase)
+            assert use_case.a is await ctx.resolve(_A)
+            assert use_case.b is await ctx.resolve(_B)
+
+
+async def test_failure_cancels_and_closes_siblings() -> None:
+    b_entered = anyio.Event()
+    b_closed = False
+    c_cancelled = False
+
+    async def create_a() -> _A:
+        await b_entered.wait()
+        raise _TestError
+
+    @contextlib.asynccontextmanager
+    async def create_b() -> AsyncIterator[_B]:
+        nonlocal b_closed
+        b_entered.set()
+        try:
+            yield _B()
+        finally:
+            b_closed = True
+
+    async def create_c() -> _C:
+        nonlocal c_cancelled
+        try:
+            await anyio.sleep_forever()
+        except anyio.get_cancelled_exc_class():
+            c_cancelled = True
+            raise
+        raise AssertionError  # pragma: no cover
+
+    @dataclasses.dataclass
+    class UseCase:
+        a: _A
+        b: _B
+        c: _C
+
+    container = Container(extensions=[ConcurrentResolutionExtension()])
+    container.register(
+        Scoped(create_a),
+        Scoped(create_b),
+        Scoped(create_c),
+        Scoped(UseCase),
+    )
+
+    with anyio.fail_after(1), pytest.raises(_TestError):
+        async with container.context() as ctx:
+            await ctx.resolve(UseCase)
+
+    assert c_cancelled
+    assert b_closed
+
+
+async def test_repeated_types_share_instance() -> None:
+    async def create_a() -> _A:
+        return _A()
+
+    async def create_b() -> _B:
+        return _B()
+
+    container = Container(extensions=[ConcurrentResolutionExtension()])
+    container.register(Scoped(create_a), Scoped(create_b))
+
+    async with container.context() as ctx:
+        first, second, _ = await ctx.resolve_many((_A, _A, _B))
+        assert first is second
+
+
+def test_sync_container_is_not_affected() -> None:
+    container = SyncContainer(extensions=[ConcurrentResolutionExtension()])
+    container.register(Scoped(_A), Scoped(_B), Scoped(_UseCase))
+
+    source = container.registry._compile(_UseCase, is_async=False).source  # noqa: SLF001
+    assert "gather" not in source
+    with container.context() as ctx:
+        assert isinstance(ctx.resolve(_UseCase), _UseCase)
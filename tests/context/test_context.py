@@ -1,5 +1,7 @@
 import contextlib
+import threading
 from collections.abc import AsyncIterator, Generator, Iterator
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
 import anyio
@@ -14,6 +16,7 @@ from aioinject import (
     Scoped,
     Singleton,
     SyncContainer,
+    Transient,
 )
 from aioinject.errors import ScopeNotFoundError
 from aioinject.providers.context import FromContext
@@ -180,6 +183,18 @@ async def test_context_provider_sync() -> None:
         assert repo.session is session
 
 
+async def test_context_add_context() -> None:
+    container = Container()
+    container.register(FromContext(_Session, scope=Scope.request))
+    container.register(Scoped(_Repository))
+    session = _Session()
+
+    async with container.context() as ctx:
+        ctx.add_context({_Session: session})
+        repo = await ctx.resolve(_Repository)
+        assert repo.session is session
+
+
 async def test_latest_registered_interface_is_provided() -> None:
     container = SyncContainer()
     container.register(Object(42), Object(0))
@@ -234,3 +249,56 @@ async def test_invalid_scope() -> None:
         str(err_info.value)
         == "Requested scope Scope.request not found, current scope is Scope.lifetime"
     )
+
+
+async def test_context_is_created_lazily(container: Container) -> None:
+    async with container.context() as ctx:
+        assert not hasattr(ctx, "__dict__")
+        assert ctx._exit_stack is None  # noqa: SLF001
+        assert ctx._scopes is None  # noqa: SLF001
+
+        await ctx.resolve(_Session)
+        assert ctx._exit_stack is None  # noqa: SLF001
+
+
+def test_sync_context_is_created_lazily() -> None:
+    container = SyncContainer()
+    container.register(Scoped(_Session))
+
+    with container.context() as ctx:
+        assert ctx._scopes is None  # noqa: SLF001
+        ctx.resolve(_Session)
+        assert ctx._scopes is not None  # noqa: SLF001
+
+
+class _Gate:
+    pass
+
+
+def test_sync_resources_entered_from_threads_are_closed() -> None:
+    count = 16
+    barrier = threading.Barrier(count)
+    closed: list[type[object]] = []
+
+    def create_gate() -> _Gate:
+        # Resources are entered right after all threads pass the gate
+        barrier.wait(timeout=1)
+        return _Gate()
+
+    def create_provider(type_: type[object]) -> Scoped[object]:
+        def factory(gate: _Gate) -> Iterator[object]:  # noqa: ARG001
+            yield type_()
+            closed.append(type_)
+
+        factory.__annotations__["return"] = Iterator[type_]  # type: ignore[valid-type]
+        return Scoped(contextlib.contextmanager(factory))
+
+    types = [type(f"_Resource{index}", (), {}) for index in range(count)]
+    container = SyncContainer()
+    container.register(
+        Transient(create_gate), *(create_provider(type_) for type_ in types)
+    )
+
+    with container.context() as ctx, ThreadPoolExecutor(count) as executor:
+        list(executor.map(ctx.resolve, types))
+    assert sorted(closed, key=types.index) == types
@@ -0,0 +1,91 @@
+import dataclasses
+
+from aioinject import (
+    Container,
+    Object,
+    Scoped,
+    SyncContainer,
+    Transient,
+)
+from aioinject.testing import TestContainer
+
+
+class _Session:
+    pass
+
+
+@dataclasses.dataclass
+class _RepositoryA:
+    session: _Session
+
+
+@dataclasses.dataclass
+class _RepositoryB:
+    session: _Session
+
+
+class _Transient:
+    pass
+
+
+async def test_resolve_many() -> None:
+    container = Container()
+    container.register(
+        Scoped(_Session),
+        Scoped(_RepositoryA),
+        Scoped(_RepositoryB),
+    )
+
+    async with container.context() as ctx:
+        a, b, session = await ctx.resolve_many(
+            (_RepositoryA, _RepositoryB, _Session)
+        )
+        assert isinstance(a, _RepositoryA)
+        assert isinstance(b, _RepositoryB)
+        assert a.session is b.session is session
+        assert await ctx.resolve(_Session) is session
+
+    assert (
+        (_RepositoryA, _RepositoryB, _Session),
+        True,
+    ) in container.registry.compilation_cache
+
+
+def test_resolve_many_sync() -> None:
+    container = SyncContainer()
+    container.register(Scoped(_Session), Scoped(_RepositoryA))
+
+    with container.context() as ctx:
+        session, repository = ctx.resolve_many((_Session, _RepositoryA))
+        assert repository.session is session
+        assert ctx.resolve_many(()) == ()
+
+
+def test_resolve_many_repeated_transient() -> None:
+    container = SyncContainer()
+    container.register(Transient(_Transient), Scoped(_Session))
+
+    with container.context() as ctx:
+        first, session_a, second, session_b = ctx.resolve_many(
+            (_Transient, _Session, _Transient, _Session)
+        )
+        assert first is not second
+        assert session_a is session_b
+
+
+async def test_override_invalidates_resolve_many() -> None:
+    container = Container()
+    container.register(Scoped(_Session), Scoped(_RepositoryA), Object(1))
+    testcontainer = TestContainer(container)
+
+    async with container.context() as ctx:
+        await ctx.resolve_many((_RepositoryA, int))
+
+    session = _Session()
+    async with (
+        testcontainer.override(Object(session)),
+        container.context() as ctx,
+    ):
+        repository, number = await ctx.resolve_many((_RepositoryA, int))
+        assert repository.session is session
+        assert number == 1
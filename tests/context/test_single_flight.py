@@ -0,0 +1,149 @@
+import contextlib
+from collections.abc import AsyncIterator
+
+import anyio
+import pytest
+
+from aioinject import Container, Scoped, Transient
+from aioinject.extensions import Extension, SlotCacheExtension
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+class _TestError(Exception):
+    pass
+
+
+class _Session:
+    pass
+
+
+async def _resolve_concurrently(
+    container: Container, count: int = 5
+) -> list[object]:
+    results: list[object] = []
+    async with container.context() as ctx:
+
+        async def resolve() -> None:
+            results.append(await ctx.resolve(_Session))
+
+        async with anyio.create_task_group() as tg:
+            for _ in range(count):
+                tg.start_soon(resolve)
+    return results
+
+
+async def test_concurrent_resolvers_share_construction() -> None:
+    entered = 0
+    exited = 0
+
+    @contextlib.asynccontextmanager
+    async def create_session() -> AsyncIterator[_Session]:
+        nonlocal entered, exited
+        entered += 1
+        await anyio.sleep(0.01)
+        yield _Session()
+        exited += 1
+
+    container = Container()
+    container.register(Scoped(create_session))
+
+    results = await _resolve_concurrently(container)
+    assert len({id(result) for result in results}) == 1
+    assert (entered, exited) == (1, 1)
+
+    await _resolve_concurrently(container)
+    assert (entered, exited) == (2, 2)
+
+
+async def test_error_is_shared() -> None:
+    calls = 0
+
+    async def create_session() -> _Session:
+        nonlocal calls
+        calls += 1
+        await anyio.sleep(0.01)
+        raise _TestError
+
+    container = Container()
+    container.register(Scoped(create_session))
+
+    errors: list[Exception] = []
+    async with container.context() as ctx:
+
+        async def resolve() -> None:
+            try:
+                await ctx.resolve(_Session)
+            except _TestError as e:
+                errors.append(e)
+
+        async with anyio.create_task_group() as tg:
+            for _ in range(2):
+                tg.start_soon(resolve)
+
+        assert len(errors) == 2  # noqa: PLR2004
+        assert calls == 1
+
+        # Failed construction is not remembered
+        with pytest.raises(_TestError):
+            await ctx.resolve(_Session)
+        assert calls == 2  # noqa: PLR2004
+
+
+@pytest.mark.parametrize("extensions", [(), (SlotCacheExtension(),)])
+async def test_cancellation_is_not_shared(
+    extensions: tuple[Extension, ...],
+) -> None:
+    calls = 0
+    started = anyio.Event()
+
+    async def create_session() -> _Session:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            started.set()
+            await anyio.sleep_forever()
+        return _Session()
+
+    container = Container(extensions=extensions)
+    container.register(Scoped(create_session))
+
+    results: list[_Session] = []
+    async with container.context() as ctx:
+
+        async def resolve() -> None:
+            results.append(await ctx.resolve(_Session))
+
+        async with (
+            anyio.create_task_group() as tg,
+            anyio.create_task_group() as owner_tg,
+        ):
+            owner_tg.start_soon(resolve)
+            await started.wait()
+            # Both wait for the construction started by the owner
+            for _ in range(2):
+                tg.start_soon(resolve)
+            await anyio.wait_all_tasks_blocked()
+            owner_tg.cancel_scope.cancel()
+
+        # The first waiter constructs it again, the second one
+        # gets the instance it created
+        assert calls == 2  # noqa: PLR2004
+        assert len(results) == 2  # noqa: PLR2004
+        assert results[0] is results[1]
+        assert await ctx.resolve(_Session) is results[0]
+
+
+async def test_transient_is_not_shared() -> None:
+    async def create_session() -> _Session:
+        await anyio.sleep(0.01)
+        return _Session()
+
+    container = Container()
+    container.register(Transient(create_session))
+
+    results = await _resolve_concurrently(container, count=2)
+    assert results[0] is not results[1]
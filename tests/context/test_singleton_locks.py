@@ -0,0 +1,116 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import anyio
+import pytest
+
+from aioinject import Container, Singleton, SyncContainer
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+class _A:
+    pass
+
+
+class _B:
+    pass
+
+
+async def test_unrelated_singletons_do_not_block_each_other() -> None:
+    b_created = anyio.Event()
+
+    async def create_a() -> _A:
+        await b_created.wait()
+        return _A()
+
+    async def create_b() -> _B:
+        b_created.set()
+        return _B()
+
+    container = Container()
+    container.register(Singleton(create_a), Singleton(create_b))
+
+    with anyio.fail_after(1):
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(container.root.resolve, _A)
+            tg.start_soon(container.root.resolve, _B)
+
+
+async def test_concurrent_resolution_creates_singleton_once() -> None:
+    calls = 0
+
+    async def create_a() -> _A:
+        nonlocal calls
+        calls += 1
+        await anyio.sleep(0.01)
+        return _A()
+
+    container = Container()
+    container.register(Singleton(create_a))
+
+    results: list[_A] = []
+
+    async def resolve() -> None:
+        results.append(await container.root.resolve(_A))
+
+    async with anyio.create_task_group() as tg:
+        for _ in range(5):
+            tg.start_soon(resolve)
+
+    assert calls == 1
+    assert len({id(result) for result in results}) == 1
+
+
+def test_sync_unrelated_singletons_do_not_block_each_other() -> None:
+    b_created = threading.Event()
+
+    def create_a() -> _A:
+        assert b_created.wait(timeout=1)
+        return _A()
+
+    def create_b() -> _B:
+        b_created.set()
+        return _B()
+
+    container = SyncContainer()
+    container.register(Singleton(create_a), Singleton(create_b))
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        a = executor.submit(container.root.resolve, _A)
+        b = executor.submit(container.root.resolve, _B)
+        assert isinstance(a.result(timeout=2), _A)
+        assert isinstance(b.result(timeout=2), _B)
+
+
+def test_sync_concurrent_resolution_creates_singleton_once() -> None:
+    calls = 0
+    threads = 8
+    barrier = threading.Barrier(threads)
+
+    def create_a() -> _A:
+        nonlocal calls
+        calls += 1
+        time.sleep(0.01)
+        return _A()
+
+    container = SyncContainer()
+    container.register(Singleton(create_a))
+    root = container.root
+
+    def resolve() -> _A:
+        barrier.wait(timeout=1)
+        return root.resolve(_A)
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        results = [
+            future.result(timeout=2)
+            for future in [executor.submit(resolve) for _ in range(threads)]
+        ]
+
+    assert calls == 1
+    assert len({id(result) for result in results}) == 1
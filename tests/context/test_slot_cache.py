@@ -0,0 +1,136 @@
+import contextlib
+import dataclasses
+from collections.abc import Iterator
+from typing import Generic, TypeVar
+
+import pytest
+
+from aioinject import (
+    Container,
+    FromContext,
+    Scoped,
+    Singleton,
+    SyncContainer,
+    Transient,
+)
+from aioinject.errors import ScopeNotFoundError
+from aioinject.extensions import EagerSingletonsExtension, SlotCacheExtension
+from aioinject.scope import Scope
+from aioinject.testing import TestContainer
+
+
+T = TypeVar("T")
+
+
+class _Request:
+    pass
+
+
+class _A:
+    pass
+
+
+@dataclasses.dataclass
+class _B:
+    a: _A
+    request: _Request
+
+
+@dataclasses.dataclass
+class _Box(Generic[T]):
+    value: T
+
+
+def _create_container() -> Container:
+    container = Container(extensions=[SlotCacheExtension()])
+    container.register(
+        Singleton(_A),
+        Scoped(_B),
+        Transient(_Box[_A]),
+        FromContext(_Request, scope=Scope.request),
+    )
+    return container
+
+
+async def test_instances_are_cached_in_slots() -> None:
+    container = _create_container()
+    request = _Request()
+
+    async with container.context({_Request: request}) as ctx:
+        b = await ctx.resolve(_B)
+        assert b.request is request
+        assert b is await ctx.resolve(_B)
+        assert b.a is await container.root.resolve(_A)
+        assert (await ctx.resolve(_Box[_A])).value is b.a
+        assert _B not in ctx.cache
+        assert b in ctx.slots
+
+    async with container.context({_Request: request}) as ctx:
+        assert len(ctx.slots) == 1
+        assert await ctx.resolve(_B) is not b
+
+    source = container.registry._compile(_B, is_async=True).source  # noqa: SLF001
+    assert "_cache.get(" not in source
+
+
+async def test_scope_not_found() -> None:
+    container = _create_container()
+    with pytest.raises(ScopeNotFoundError):
+        await container.root.resolve(_B)
+
+
+async def test_slots_grow_for_existing_contexts() -> None:
+    container = _create_container()
+
+    async with container.context({_Request: _Request()}) as ctx:
+        assert ctx.slots == []
+        b = await ctx.resolve(_B)
+        assert b is await ctx.resolve(_B)
+
+
+def test_sync_context_managers() -> None:
+    closed = False
+
+    @contextlib.contextmanager
+    def create_a() -> Iterator[_A]:
+        nonlocal closed
+        yield _A()
+        closed = True
+
+    container = SyncContainer(extensions=[SlotCacheExtension()])
+    container.register(Scoped(create_a))
+
+    with container, container.context() as ctx:
+        assert ctx.resolve(_A) is ctx.resolve(_A)
+    assert closed
+
+
+def test_slots_assigned_concurrently_are_unique() -> None:
+    count = 32
+    types = [type(f"_Type{index}", (), {}) for index in range(count)]
+    container = SyncContainer(
+        extensions=[
+            SlotCacheExtension(),
+            EagerSingletonsExtension(max_workers=count),
+        ]
+    )
+    container.register(*(Singleton(type_) for type_ in types))
+
+    with container:
+        slots = container.registry.cache_slots[Scope.lifetime]
+        assert sorted(slots[type_] for type_ in types) == list(range(count))
+        for type_ in types:
+            assert isinstance(container.root.resolve(type_), type_)
+
+
+async def test_override() -> None:
+    container = _create_container()
+    a = await container.root.resolve(_A)
+    override = _A()
+
+    async with TestContainer(container).override(
+        Singleton(lambda: override, _A)
+    ):
+        assert await container.root.resolve(_A) is override
+
+    assert await container.root.resolve(_A) is a
@@ -0,0 +1,103 @@
+import logging
+import time
+
+import pytest
+
+from aioinject import Container, Scope, Scoped, Singleton, SyncContainer
+from aioinject.extensions import (
+    BlockingDetectorExtension,
+    BlockingFactoriesExtension,
+    BlockingReport,
+    Extension,
+)
+
+
+class _Slow:
+    def __init__(self) -> None:
+        time.sleep(0.02)
+
+
+class _Fast:
+    pass
+
+
+async def _create_slow() -> _Slow:
+    return _Slow()
+
+
+def _create_container(*extensions: Extension) -> Container:
+    container = Container(extensions=extensions)
+    container.register(Singleton(_Slow), Scoped(_Fast))
+    return container
+
+
+async def test_reported_to_callback() -> None:
+    reports: list[BlockingReport] = []
+    container = _create_container(
+        BlockingDetectorExtension(budget=0.01, callback=reports.append)
+    )
+    async with container, container.context() as ctx:
+        await ctx.resolve(_Slow)
+        await ctx.resolve(_Fast)
+
+    (report,) = reports
+    assert report.provider.info.type_ is _Slow
+    assert report.scope is Scope.lifetime
+    factory = container.registry.compile(_Slow, is_async=True)
+    assert report.function == factory.__code__.co_filename
+    assert report.elapsed >= 0.02  # noqa: PLR2004
+
+
+async def test_reported_to_logger(caplog: pytest.LogCaptureFixture) -> None:
+    logger = logging.getLogger("test_blocking_detector")
+    container = _create_container(
+        BlockingDetectorExtension(budget=0.01, logger=logger)
+    )
+    with caplog.at_level(logging.WARNING, logger=logger.name):
+        async with container, container.context() as ctx:
+            await ctx.resolve(_Slow)
+
+    (record,) = caplog.records
+    assert record.name == logger.name
+    assert "blocked the event loop" in record.getMessage()
+
+
+async def test_sampling() -> None:
+    reports: list[BlockingReport] = []
+    container = _create_container(
+        BlockingDetectorExtension(
+            budget=0.01, callback=reports.append, sample_rate=0
+        )
+    )
+    async with container, container.context() as ctx:
+        await ctx.resolve(_Slow)
+    assert not reports
+
+
+@pytest.mark.parametrize("anyio_backend", ["asyncio"])
+async def test_not_measured_off_the_loop() -> None:
+    reports: list[BlockingReport] = []
+    container = Container(
+        extensions=[
+            BlockingDetectorExtension(budget=0.01, callback=reports.append),
+            BlockingFactoriesExtension(),
+        ]
+    )
+    container.register(Scoped(_create_slow), Scoped(_Fast, blocking=True))
+    async with container, container.context() as ctx:
+        await ctx.resolve(_Slow)
+        await ctx.resolve(_Fast)
+    assert not reports
+
+
+def test_sync_container() -> None:
+    reports: list[BlockingReport] = []
+    container = SyncContainer(
+        extensions=[
+            BlockingDetectorExtension(budget=0, callback=reports.append)
+        ]
+    )
+    container.register(Singleton(_Slow))
+    with container, container.context() as ctx:
+        ctx.resolve(_Slow)
+    assert not reports
@@ -0,0 +1,197 @@
+import contextlib
+import logging
+import threading
+import time
+from collections.abc import Iterator, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import anyio
+import pytest
+
+from aioinject import (
+    Container,
+    Object,
+    Scoped,
+    Singleton,
+    SyncContainer,
+    Transient,
+)
+from aioinject.extensions import (
+    BlockingFactoriesExtension,
+    ConcurrentShutdownExtension,
+)
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+class _Client:
+    def __init__(self) -> None:
+        self.thread = threading.get_ident()
+
+
+class _Settings:
+    def __init__(self) -> None:
+        self.thread = threading.get_ident()
+
+
+async def _create_async_client() -> _Client:
+    return _Client()
+
+
+class _Provider(Scoped[_Client]):
+    def provide(self, kwargs: Mapping[str, Any]) -> _Client:
+        return super().provide(kwargs)  # type: ignore[return-value]
+
+
+@pytest.mark.parametrize(
+    "provider",
+    [
+        Scoped(_Client, blocking=True),
+        Singleton(_Client, blocking=True),
+        Transient(_Client, blocking=True),
+        _Provider(_Client, blocking=True),
+    ],
+)
+async def test_marked_factories_are_offloaded(
+    provider: Scoped[_Client],
+) -> None:
+    container = Container(extensions=[BlockingFactoriesExtension()])
+    container.register(provider, Scoped(_Settings))
+
+    async with container, container.context() as ctx:
+        client = await ctx.resolve(_Client)
+        assert client.thread != threading.get_ident()
+        settings = await ctx.resolve(_Settings)
+        assert settings.thread == threading.get_ident()
+
+
+async def test_offload_all() -> None:
+    with ThreadPoolExecutor(thread_name_prefix="blocking") as executor:
+        container = Container(
+            extensions=[
+                BlockingFactoriesExtension(executor=executor, offload="all")
+            ]
+        )
+        container.register(
+            Scoped(_Settings),
+            Scoped(_Client, blocking=False),
+            Object(1),
+        )
+        names: list[str] = []
+
+        def create_str(settings: _Settings, number: int) -> str:  # noqa: ARG001
+            names.append(threading.current_thread().name)
+            return str(number)
+
+        container.register(Scoped(create_str))
+        async with container.context() as ctx:
+            assert await ctx.resolve(str) == "1"
+            assert (
+                await ctx.resolve(_Settings)
+            ).thread != threading.get_ident()
+            assert (await ctx.resolve(_Client)).thread == threading.get_ident()
+
+    assert names[0].startswith("blocking")
+
+
+async def test_async_factories_are_not_offloaded() -> None:
+    container = Container(
+        extensions=[BlockingFactoriesExtension(offload="all")]
+    )
+    container.register(Scoped(_create_async_client))
+    async with container.context() as ctx:
+        assert (await ctx.resolve(_Client)).thread == threading.get_ident()
+
+
+@pytest.mark.parametrize(
+    ("extensions", "provider_type", "exit_offloaded"),
+    [
+        ((), Scoped, False),
+        ((ConcurrentShutdownExtension(),), Singleton, False),
+        ((ConcurrentShutdownExtension(offload=True),), Singleton, True),
+    ],
+)
+async def test_context_managers(
+    extensions: tuple[ConcurrentShutdownExtension, ...],
+    provider_type: type[Scoped[Any]],
+    exit_offloaded: bool,
+) -> None:
+    threads: list[int] = []
+
+    @contextlib.contextmanager
+    def create_client() -> Iterator[_Client]:
+        threads.append(threading.get_ident())
+        yield _Client()
+        threads.append(threading.get_ident())
+
+    container = Container(
+        extensions=[BlockingFactoriesExtension(), *extensions]
+    )
+    container.register(provider_type(create_client, blocking=True))
+    async with container, container.context() as ctx:
+        await ctx.resolve(_Client)
+
+    # Only entering the context manager is offloaded
+    assert threads[0] != threading.get_ident()
+    assert (threads[1] != threading.get_ident()) is exit_offloaded
+
+
+async def test_concurrent_resolvers_share_construction() -> None:
+    calls = 0
+
+    def create_client() -> _Client:
+        nonlocal calls
+        calls += 1
+        time.sleep(0.01)
+        return _Client()
+
+    container = Container(extensions=[BlockingFactoriesExtension()])
+    container.register(Scoped(create_client, blocking=True))
+    results: list[_Client] = []
+
+    async with container.context() as ctx:
+
+        async def resolve() -> None:
+            results.append(await ctx.resolve(_Client))
+
+        async with anyio.create_task_group() as tg:
+            for _ in range(3):
+                tg.start_soon(resolve)
+
+    assert calls == 1
+    assert len({id(result) for result in results}) == 1
+
+
+async def test_threshold(caplog: pytest.LogCaptureFixture) -> None:
+    def create_client() -> _Client:
+        time.sleep(0.02)
+        return _Client()
+
+    extension = BlockingFactoriesExtension(threshold=0.01)
+    container = Container(extensions=[extension])
+    client_provider = Transient(create_client)
+    container.register(client_provider, Scoped(_Settings))
+
+    with caplog.at_level(logging.WARNING):
+        async with container.context() as ctx:
+            for _ in range(2):
+                await ctx.resolve(_Client)
+            await ctx.resolve(_Settings)
+
+    assert list(extension.flagged) == [client_provider]
+    assert extension.flagged[client_provider] >= 0.02  # noqa: PLR2004
+    assert len(caplog.records) == 1
+    assert "blocked the event loop" in caplog.records[0].getMessage()
+
+
+def test_sync_container_is_not_affected() -> None:
+    container = SyncContainer(
+        extensions=[BlockingFactoriesExtension(offload="all", threshold=0)]
+    )
+    container.register(Scoped(_Client, blocking=True))
+    with container.context() as ctx:
+        assert ctx.resolve(_Client).thread == threading.get_ident()
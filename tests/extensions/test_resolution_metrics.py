@@ -0,0 +1,98 @@
+import dataclasses
+import time
+
+from aioinject import (
+    Container,
+    Scope,
+    Scoped,
+    Singleton,
+    SyncContainer,
+    Transient,
+)
+from aioinject.extensions import ResolutionMetricsExtension
+from aioinject.metrics import ProviderMetricsSnapshot
+
+
+class _Client:
+    pass
+
+
+@dataclasses.dataclass
+class _Session:
+    client: _Client
+
+
+@dataclasses.dataclass
+class _UseCase:
+    session: _Session
+
+
+def _snapshots(
+    container: Container | SyncContainer,
+) -> dict[type[object], ProviderMetricsSnapshot]:
+    return {
+        snapshot.provider.info.type_: snapshot
+        for snapshot in container.metrics_snapshot()
+    }
+
+
+async def test_metrics() -> None:
+    container = Container(extensions=[ResolutionMetricsExtension()])
+    container.register(
+        Singleton(_Client), Scoped(_Session), Transient(_UseCase)
+    )
+    async with container:
+        for _ in range(2):
+            async with container.context() as ctx:
+                await ctx.resolve(_UseCase)
+                await ctx.resolve(_UseCase)
+
+    snapshots = _snapshots(container)
+    client, session, use_case = (
+        snapshots[_Client],
+        snapshots[_Session],
+        snapshots[_UseCase],
+    )
+    assert (client.scope, client.hits, client.misses, client.creations) == (
+        Scope.lifetime,
+        3,
+        1,
+        1,
+    )
+    assert (session.scope, session.hits, session.misses) == (
+        Scope.request,
+        2,
+        2,
+    )
+    assert session.creations == 2  # noqa: PLR2004
+    assert (use_case.hits, use_case.misses, use_case.creations) == (0, 0, 4)
+    assert use_case.duration > 0
+    assert use_case.buckets[-1] == (float("inf"), 4)
+
+
+def test_buckets() -> None:
+    def create_client() -> _Client:
+        time.sleep(0.01)
+        return _Client()
+
+    container = SyncContainer(
+        extensions=[ResolutionMetricsExtension(buckets=(0.001, 1))]
+    )
+    container.register(Transient(create_client))
+    with container.context() as ctx:
+        ctx.resolve(_Client)
+
+    (snapshot,) = container.metrics_snapshot()
+    assert snapshot.duration >= 0.01  # noqa: PLR2004
+    assert list(snapshot.buckets) == [(0.001, 0), (1, 1), (float("inf"), 1)]
+
+
+def test_disabled() -> None:
+    container = SyncContainer()
+    container.register(Scoped(_Client))
+    with container.context() as ctx:
+        ctx.resolve(_Client)
+
+    assert not container.metrics_snapshot()
+    source = container.registry._compile(_Client, is_async=False).source  # noqa: SLF001
+    assert "_metrics" not in source
@@ -0,0 +1,247 @@
+import contextlib
+import dataclasses
+import typing
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+import anyio.lowlevel
+import pytest
+
+from aioinject import (
+    Container,
+    Context,
+    Object,
+    Provider,
+    Scoped,
+    Singleton,
+    SyncContainer,
+    SyncContext,
+)
+from aioinject._types import T
+from aioinject.context import ProviderRecord
+from aioinject.extensions import (
+    CompilationCacheExtension,
+    Extension,
+    OnResolveExtension,
+    OnResolveSyncExtension,
+    ProviderCellsExtension,
+)
+from aioinject.testing import TestContainer
+
+
+class _Client:
+    pass
+
+
+@dataclasses.dataclass
+class _Service:
+    client: _Client
+
+
+@dataclasses.dataclass
+class _UseCase:
+    service: _Service
+
+
+def _create_container(*extensions: Extension) -> SyncContainer:
+    container = SyncContainer(
+        extensions=[ProviderCellsExtension(), *extensions]
+    )
+    container.register(
+        Singleton(_Client), Singleton(_Service), Scoped(_UseCase)
+    )
+    return container
+
+
+def test_override_does_not_recompile() -> None:
+    container = _create_container()
+    registry = container.registry
+    with container.context() as ctx:
+        use_case = ctx.resolve(_UseCase)
+    factory = registry.compile(_UseCase, is_async=False)
+    assert "_cell.get()" in registry._compile(_UseCase, is_async=False).source  # noqa: SLF001
+
+    client = _Client()
+    with (
+        TestContainer(container).override(Object(client, _Client)),
+        container.context() as ctx,
+    ):
+        assert ctx.resolve(_UseCase).service.client is client
+        assert registry.compile(_UseCase, is_async=False) is factory
+
+    with container.context() as ctx:
+        assert ctx.resolve(_UseCase).service is use_case.service
+    assert registry.provider_cells[_Client].record is None
+
+
+def test_nested_overrides() -> None:
+    container = _create_container()
+    testcontainer = TestContainer(container)
+    first, second = _Client(), _Client()
+    with testcontainer.override(Object(first, _Client)):
+        with testcontainer.override(Object(second, _Client)):
+            assert container.root.resolve(_Service).client is second
+        assert container.root.resolve(_Service).client is first
+    assert container.root.resolve(_Client) not in (first, second)
+
+
+def test_other_providers_are_recompiled() -> None:
+    container = _create_container()
+    registry = container.registry
+    factory = registry.compile(_UseCase, is_async=False)
+
+    class _OtherClient(_Client):
+        pass
+
+    with TestContainer(container).override(
+        Singleton(_OtherClient, interface=_Client)
+    ):
+        assert registry.compile(_UseCase, is_async=False) is not factory
+        client = container.root.resolve(_Service).client
+        assert isinstance(client, _OtherClient)
+        assert registry.provider_cells[_Client].record is None
+
+
+async def test_persistent_cache(tmp_path: Path) -> None:
+    for _ in range(2):
+        container = Container(
+            extensions=[
+                ProviderCellsExtension(),
+                CompilationCacheExtension(tmp_path),
+            ]
+        )
+        container.register(Singleton(_Client), Singleton(_Service))
+        factory = container.registry.compile(_Service, is_async=True)
+
+    client = _Client()
+    async with TestContainer(container).override(Object(client, _Client)):
+        assert (await container.root.resolve(_Service)).client is client
+    assert container.registry.compile(_Service, is_async=True) is factory
+
+
+async def test_local_overrides_are_isolated() -> None:
+    container = Container(extensions=[ProviderCellsExtension()])
+    container.register(
+        Singleton(_Client), Singleton(_Service), Scoped(_UseCase)
+    )
+    testcontainer = TestContainer(container)
+    service = await container.root.resolve(_Service)
+    overridden: dict[int, _UseCase] = {}
+
+    async def run(index: int) -> None:
+        client = _Client()
+        async with testcontainer.override(Object(client, _Client), local=True):
+            await anyio.lowlevel.checkpoint()
+            async with container.context() as ctx:
+                overridden[index] = await ctx.resolve(_UseCase)
+            assert overridden[index].service.client is client
+
+    async with anyio.create_task_group() as tg:
+        for index in range(2):
+            tg.start_soon(run, index)
+
+    assert overridden[0].service.client is not overridden[1].service.client
+    assert await container.root.resolve(_Service) is service
+    assert container.registry.provider_cells[_Client].active is False
+
+
+@typing.final
+class _OnResolve(OnResolveExtension):
+    def __init__(self) -> None:
+        self.resolved: list[tuple[Context, object]] = []
+
+    async def on_resolve(
+        self,
+        context: Context,
+        provider: ProviderRecord[T],  # noqa: ARG002
+        instance: T,
+    ) -> None:
+        self.resolved.append((context, instance))
+
+
+async def test_local_override_creates_dependants_once() -> None:
+    entered = 0
+    exited = 0
+
+    @contextlib.asynccontextmanager
+    async def create_service(client: _Client) -> AsyncIterator[_Service]:
+        nonlocal entered, exited
+        entered += 1
+        yield _Service(client=client)
+        exited += 1
+
+    extension = _OnResolve()
+    container = Container(extensions=[ProviderCellsExtension(), extension])
+    container.register(Singleton(_Client), Singleton(create_service))
+    client = _Client()
+
+    async with (
+        container,
+        TestContainer(container).override(Object(client, _Client), local=True),
+    ):
+        async with container.context() as first_ctx:
+            first = await first_ctx.resolve(_Service)
+            assert await first_ctx.resolve(_Service) is first
+            assert first.client is client
+            assert (entered, exited) == (1, 0)
+        # Closed together with the context it was created in
+        assert exited == 1
+
+        async with container.context() as ctx:
+            assert await ctx.resolve(_Service) is first
+        assert (entered, exited) == (1, 1)
+        assert [instance for _, instance in extension.resolved] == [
+            client,
+            first,
+        ]
+        assert extension.resolved[1][0] is first_ctx
+
+        service = await container.root.resolve(_Service)
+        assert service is first
+    assert (entered, exited) == (1, 1)
+
+
+@typing.final
+class _OnResolveSync(OnResolveSyncExtension):
+    def __init__(self) -> None:
+        self.resolved: list[object] = []
+
+    def on_resolve_sync(
+        self,
+        context: SyncContext,  # noqa: ARG002
+        provider: ProviderRecord[T],  # noqa: ARG002
+        instance: T,
+    ) -> None:
+        self.resolved.append(instance)
+
+
+def test_sync_local_override_creates_dependants_once() -> None:
+    extension = _OnResolveSync()
+    container = _create_container(extension)
+    client = _Client()
+
+    with TestContainer(container).override(
+        Object(client, _Client), local=True
+    ):
+        with container.context() as ctx:
+            service = ctx.resolve(_Service)
+        with container.context() as ctx:
+            assert ctx.resolve(_Service) is service
+    assert service.client is client
+    assert extension.resolved == [client, service]
+
+
+@pytest.mark.parametrize(
+    ("extensions", "provider"),
+    [
+        ((), Object(_Client(), _Client)),
+        ((ProviderCellsExtension(),), Singleton(_Client)),
+    ],
+)
+def test_local_override_requirements(
+    extensions: tuple[Extension, ...], provider: Provider[_Client]
+) -> None:
+    container = SyncContainer(extensions=extensions)
+    container.register(Singleton(_Client))
+    with pytest.raises(ValueError, match="Context-local overrides require"):
+        TestContainer(container).override(provider, local=True)
@@ -153,3 +153,34 @@ async def test_should_remove_dependant_objects() -> None:
     c = await container.root.resolve(C)
     assert c is not c_mocked
     assert c.b.a is not a_mock
+
+
+async def test_should_remove_objects_depending_on_override() -> None:
+    class A:
+        pass
+
+    class B:
+        pass
+
+    @dataclasses.dataclass
+    class BImpl(B):
+        a: A
+
+    @dataclasses.dataclass
+    class C:
+        b: B
+
+    container = Container()
+    container.register(Singleton(A), Singleton(B), Singleton(C))
+    testcontainer = TestContainer(container)
+
+    async with testcontainer.override(Singleton(BImpl, interface=B)):
+        c = await container.root.resolve(C)
+        a_mock = A()
+        async with testcontainer.override(Object(a_mock)):
+            c_mocked = await container.root.resolve(C)
+            assert c_mocked is not c
+            assert c_mocked.b.a is a_mock  # type: ignore[attr-defined]
+
+    assert container.registry.provider_dependants[A] == []
+    assert not isinstance((await container.root.resolve(C)).b, BImpl)